@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Benchmark of `pseudo.compile` latency when process has large heap. Forced full garbage
+collection after compilation traverses every live object, so its cost grows with the heap
+and not with the size of compiled program.
+
+Usage::
+
+    $ python benchmarks/compile_gc.py [objects]
+"""
+
+import sys
+import time
+
+import pseudo
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+SOURCE = """a := 1
+dopóki a < 10 wykonuj
+    T[a] := a * 2
+    a := a + 1
+pisz "koniec"
+"""
+
+
+def measure(collect: bool, repeat: int = 20) -> float:
+    """Returns average compile time in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pseudo.compile(SOURCE, collect=collect)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    heap = [{"i": i} for i in range(objects)]  # Simulate host application state
+
+    print(f"heap: {len(heap)} objects")
+    print(f"compile with gc.collect():    {measure(True):8.3f} ms")
+    print(f"compile without gc.collect(): {measure(False):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Benchmark of recursive function calls. It runs `fib(n)` with every engine and reports
+time, which is dominated by cost of calls and `zwróć`.
+
+Usage::
+
+    $ python benchmarks/recursion.py [n]
+"""
+
+import sys
+import time
+
+import pseudo
+from pseudo.runtime import RunTime
+from pseudo.closure import compile_closure
+from pseudo.vm import compile_bytecode, VirtualMachine
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+SOURCE = """funkcja fib(n)
+    jeżeli n < 2 to
+        zwróć n
+    zwróć fib(n - 1) + fib(n - 2)
+
+wynik := fib({n})
+"""
+
+
+def run_tree(instructions):
+    RunTime().run(instructions)
+
+
+def run_closure(instructions):
+    RunTime().run(compile_closure(instructions))
+
+
+def run_vm(instructions):
+    VirtualMachine().run(compile_bytecode(instructions, resolve=True))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    instructions = pseudo.compile(SOURCE.format(n=n))
+
+    print(f"fib({n})")
+    for name, run in [("tree", run_tree), ("closure", run_closure), ("vm", run_vm)]:
+        start = time.perf_counter()
+        run(instructions)
+        print(f"{name:8} {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
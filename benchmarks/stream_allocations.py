@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of `pseudo.stream.Stream` cursor. It walks generated source char by char
+the way lexer does (`eol`, `peek`, `next`) and reports number of `EOL` objects created and
+time per source character, then does the same for full `pseudo.compile`.
+
+Usage::
+
+    $ python benchmarks/stream_allocations.py [lines]
+"""
+
+import sys
+import time
+
+import pseudo
+from pseudo.stream import Stream, EndOfFile
+from pseudo.type.base import EOL
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+SOURCE = """a := 1
+dopóki a < 10 wykonuj
+    # komentarz
+    T[a] := a * 2
+    a := a + 1
+pisz "koniec"
+"""
+
+
+class counter:
+    """Counts `EOL` instances created inside `with` block."""
+
+    def __enter__(self):
+        self.count = 0
+        self.init = EOL.__init__
+
+        def init(eol):
+            self.count += 1
+            self.init(eol)
+
+        EOL.__init__ = init
+        return self
+
+    def __exit__(self, *args):
+        EOL.__init__ = self.init
+
+
+def walk(text_input: str):
+    """Walk over input the way lexer does."""
+    s = Stream(text_input)
+    while True:
+        while not s.eol():
+            s.peek()
+            s.next()
+        s.peek()
+        try:
+            s.next_line()
+        except EndOfFile:
+            return
+
+
+def measure(name: str, function, size: int):
+    with counter() as c:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+    print(
+        f"{name:<8} {c.count / size:.4f} EOL/char  {elapsed / size * 1e9:8.1f} ns/char"
+    )
+
+
+def main(lines: int = 10000):
+    text_input = SOURCE * (lines // SOURCE.count("\n"))
+    size = len(text_input)
+    print(f"{size} chars")
+    measure("stream", lambda: walk(text_input), size)
+    measure("compile", lambda: pseudo.compile(text_input), size)
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -1,11 +1,9 @@
 #!/usr/bin/env python
 
-from pseudo import cli
-
-__doc__ = cli.__doc__
+from pseudo.__main__ import __doc__, main
 
 
 __author__ = "Patryk Niedźwiedziński"
 
 if __name__ == "__main__":
-    cli.pdc()
+    main()
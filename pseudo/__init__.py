@@ -28,26 +28,48 @@ __version__ = "0.11.0"
 
 import gc
 
-from pseudo.lexer import Lexer
-from pseudo.stream import EndOfFile
-from pseudo.utils import append
 
+def compile(text_input: str, range_symbol: str = "...", collect: bool = False) -> list:
+    """
+    Compile from string to list of operations.
 
-def compile(text_input: str, range_symbol: str = "...") -> list:
-    """Compile from string to list of operations."""
+    Args:
+        - text_input: str, Pseudocode.
+        - range_symbol: str, Range symbol in for loop.
+        - collect: bool, If true full garbage collection is forced after compilation. It
+            is proportional to the whole heap of the process, so it is off by default.
+    """
+
+    instructions = list(compile_iter(text_input, range_symbol))
+    if collect:
+        gc.collect()
+    return instructions
+
+
+def compile_iter(text_input, range_symbol: str = "..."):
+    """
+    Compile from string or file object and yield top level operations as they are parsed.
+    Lines of already parsed statements are released, so memory used by lexer is bounded by
+    the largest statement instead of the whole file.
+
+    Args:
+        - text_input: str or file, Pseudocode.
+        - range_symbol: str, Range symbol in for loop.
+    """
+    from pseudo.lexer import Lexer  # Imported on first use, so `import pseudo` is cheap
+    from pseudo.stream import EndOfFile
 
     lexer = Lexer(text_input)
     lexer.range_symbol = range_symbol
 
     x = None
-    instructions = []
-
     while True:
+        lexer.i.release()
         try:
-            x = lexer.read_next(prev=x)
+            x = lexer.read_statement(prev=x)
         except EndOfFile:
-            break
-        instructions = append(instructions, x)
-    del lexer
-    gc.collect()
-    return instructions
+            return
+        if isinstance(x, list):
+            yield from x
+        else:
+            yield x
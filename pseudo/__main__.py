@@ -0,0 +1,51 @@
+"""
+This module contains entry point of `pdc`. The most common call, `pdc file.pdc` without
+any options, is run directly, so it does not pay for importing click and modules of other
+commands. Everything else is passed to `pseudo.cli`.
+
+Usage::
+    $ pdc test.pdc
+    $ python -m pseudo test.pdc
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import os
+import sys
+
+
+COMMANDS = ("run", "batch", "serve", "submit", "bench")  # Commands of `pseudo.cli.pdc`
+
+
+def run_file(file: str):
+    """Run pseudocode file with default options of `pdc run`."""
+    from pseudo.cache import CompileCache
+    from pseudo.optimizer import optimize
+    from pseudo.runtime import RunTime
+
+    with open(file, encoding="utf-8", newline="") as fp:
+        text_input = fp.read()
+    RunTime().run(optimize(CompileCache().compile(text_input)))
+
+
+def main(args: list = None):
+    """
+    Run `pdc` with given command line arguments.
+
+    Args:
+        - args: list, Arguments without program name (default: `sys.argv[1:]`).
+    """
+    if args is None:
+        args = sys.argv[1:]
+    if len(args) == 1 and args[0] not in COMMANDS and args[0][:1] != "-":
+        if os.path.isfile(args[0]):
+            run_file(args[0])
+            return
+
+    from pseudo.cli import pdc
+
+    pdc(args)
+
+
+if __name__ == "__main__":
+    main()
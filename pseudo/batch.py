@@ -0,0 +1,441 @@
+"""
+This module contains batch runner used to grade many submissions at once. Every
+submission is compiled once and run with each of given stdin inputs in a pool of worker
+processes, so interpreter startup is paid once per worker instead of once per run.
+
+Single submission with many inputs can also be run by `run_forked`, which forks a child
+per input from the process which already compiled the program.
+
+Usage::
+    >>> results = run_batch(["a.pdc", "b.pdc"], [("1.txt", "5\\n")], timeout=2)
+    >>> write_report(results, sys.stdout, "json")
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import csv
+import gc
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import namedtuple
+from contextlib import redirect_stdout
+
+from pseudo import compile
+from pseudo.exceptions import LimitExceeded
+from pseudo.runtime import RunTime
+from pseudo.optimizer import optimize
+
+
+_Child = namedtuple("_Child", ["index", "pid", "start", "chunks"])
+Result = namedtuple("Result", ["file", "input", "status", "exit_code", "stdout", "time"])
+Result.__doc__ = """
+Result of single run. `status` is one of `ok`, `error` (non zero exit code), `timeout`,
+`step-limit`, `crash` (bug in interpreter) or `compile-error`. `time` is wall time of run
+in seconds.
+"""
+
+FIELDS = list(Result._fields)
+TIMER_SLACK = 0.5  # Seconds after deadline of interpreter when the run is interrupted by signal
+
+
+class Timeout(BaseException):
+    """
+    Raised in worker when run exceeds its time limit. It does not inherit from `Exception`
+    so it is not caught by runtime as interpreter crash.
+    """
+
+    pass
+
+
+class Crash(BaseException):
+    """Raised when interpreter crashes during batch run."""
+
+    pass
+
+
+class BatchRunTime(RunTime):
+    """Runtime which reports crashes to batch runner instead of writing crash log."""
+
+    def crash(self):
+        raise Crash(traceback.format_exc())
+
+
+def _alarm(signum, frame):
+    raise Timeout
+
+
+def read_inputs(paths: list) -> list:
+    """
+    Returns list of `(name, text)` pairs read from given files. Directories are expanded
+    to files they contain.
+
+    Args:
+        - paths: list, Paths to input files or directories.
+    """
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, f)
+                for f in os.listdir(path)
+                if os.path.isfile(os.path.join(path, f))
+            )
+        else:
+            files = [path]
+        for f in files:
+            with open(f, encoding="utf-8") as fp:
+                inputs.append((f, fp.read()))
+    return inputs
+
+
+def find_submissions(paths: list) -> list:
+    """Returns list of `.pdc` files in given paths. Directories are expanded."""
+    submissions = []
+    for path in paths:
+        if os.path.isdir(path):
+            submissions.extend(
+                os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".pdc")
+            )
+        else:
+            submissions.append(path)
+    return submissions
+
+
+def execute(instructions: list, engine: str = "tree", r: RunTime = None):
+    """
+    Run compiled instructions with given engine.
+
+    Args:
+        - instructions: list, Output of `pseudo.compile`.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - r: RunTime, Runtime used to run instructions.
+    """
+    if r is None:
+        r = RunTime()
+    if engine == "vm":
+        from pseudo.vm import compile_bytecode, VirtualMachine
+
+        VirtualMachine(r).run(compile_bytecode(instructions, resolve=True))
+        return
+    if engine == "closure":
+        from pseudo.closure import compile_closure
+
+        instructions = compile_closure(instructions)
+    r.run(instructions)
+
+
+def compile_source(text_input: str, range_symbol: str = "...", cache=None) -> tuple:
+    """
+    Compile and optimise source. Returns `(instructions, output)`, where instructions are
+    None if source does not compile and output contains compiler error message.
+
+    Args:
+        - text_input: str, Pseudocode.
+        - range_symbol: str, Range symbol in for loop.
+        - cache: pseudo.cache.CompileCache, Cache of compiled programs, it is not used if
+            None.
+    """
+    stdout = io.StringIO()
+    try:
+        with redirect_stdout(stdout):
+            if cache is not None:
+                return optimize(cache.compile(text_input, range_symbol)), ""
+            return optimize(compile(text_input, range_symbol)), ""
+    except SystemExit:
+        return None, stdout.getvalue()
+
+
+def run_one(
+    instructions: list,
+    text_input: str,
+    engine: str,
+    timeout: float,
+    max_steps: int = None,
+) -> tuple:
+    """
+    Run instructions with given stdin and returns `(status, exit_code, stdout, time)`.
+    Input is read without prompts, so stdout contains only output of the program. Time
+    limit is checked by interpreter, signal interrupts the run only if it does not stop
+    (i.e. single operation takes too long).
+    """
+    stdout = io.StringIO()
+    status, exit_code = "ok", 0
+    start = time.perf_counter()
+    try:
+        if timeout and hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, timeout + TIMER_SLACK)
+        r = BatchRunTime(input_source=text_input, timeout=timeout, max_steps=max_steps)
+        with redirect_stdout(stdout):
+            execute(instructions, engine, r)
+    except SystemExit as exc:
+        code = exc.code
+        exit_code = code if isinstance(code, int) else int(code is not None)
+        if exit_code != 0:
+            status = "error"
+    except Timeout:
+        status, exit_code = "timeout", None
+    except LimitExceeded as exc:
+        status = "timeout" if exc.limit == "time" else "step-limit"
+        exit_code = None
+    except Crash as exc:
+        status, exit_code = "crash", None
+        stdout.write(str(exc))
+    finally:
+        if timeout and hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return status, exit_code, stdout.getvalue(), time.perf_counter() - start
+
+
+def grade(
+    file: str,
+    inputs: list,
+    timeout: float = None,
+    range_symbol: str = "...",
+    engine: str = "tree",
+    max_steps: int = None,
+) -> list:
+    """
+    Compile submission once and run it with each input. It is executed in worker process.
+
+    Args:
+        - file: str, Path to submission.
+        - inputs: list, List of `(name, text)` pairs used as stdin.
+        - timeout: float, Time limit of single run in seconds.
+        - range_symbol: str, Range symbol in for loop.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - max_steps: int, Maximal number of loop iterations and calls of single run.
+    """
+    if timeout and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _alarm)
+
+    with open(file, encoding="utf-8") as fp:
+        text_input = fp.read()
+
+    start = time.perf_counter()
+    instructions, output = compile_source(text_input, range_symbol)
+    if instructions is None:
+        elapsed = time.perf_counter() - start
+        return [
+            Result(file, name, "compile-error", 1, output, elapsed) for name, _ in inputs
+        ]
+
+    return [
+        Result(file, name, *run_one(instructions, text, engine, timeout, max_steps))
+        for name, text in inputs
+    ]
+
+
+def run_batch(
+    submissions: list,
+    inputs: list = None,
+    timeout: float = None,
+    workers: int = None,
+    range_symbol: str = "...",
+    engine: str = "tree",
+    max_steps: int = None,
+) -> list:
+    """
+    Run every submission with every input in process pool and returns list of results.
+
+    Args:
+        - submissions: list, Paths to pseudocode files.
+        - inputs: list, List of `(name, text)` pairs used as stdin. By default every
+            submission is run once with empty stdin.
+        - timeout: float, Time limit of single run in seconds.
+        - workers: int, Number of worker processes (default: number of cpus).
+        - range_symbol: str, Range symbol in for loop.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - max_steps: int, Maximal number of loop iterations and calls of single run.
+
+    Without `signal.setitimer` (Windows) a submission which exceeds time limit of all its
+    inputs is killed together with other workers of the pool, and submissions which were
+    not finished are run again in a new pool.
+    """
+    from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+    if not inputs:
+        inputs = [("", "")]
+
+    # Without SIGALRM time limit can only be checked from parent process
+    limit = None
+    if timeout and not hasattr(signal, "setitimer"):
+        limit = timeout * len(inputs)
+
+    results = []
+    remaining = list(submissions)
+    while remaining:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [
+            pool.submit(grade, file, inputs, timeout, range_symbol, engine, max_steps)
+            for file in remaining
+        ]
+        try:
+            for i, (file, future) in enumerate(zip(remaining, futures)):
+                try:
+                    results.extend(future.result(timeout=limit))
+                except TimeoutError:
+                    results.extend(
+                        Result(file, name, "timeout", None, "", timeout)
+                        for name, _ in inputs
+                    )
+                    # Worker is still running, so the pool would never shut down. Its
+                    # processes are killed and the rest is run in a new pool.
+                    _terminate(pool)
+                    remaining = remaining[i + 1 :]
+                    break
+            else:
+                remaining = []
+        finally:
+            pool.shutdown()
+    return results
+
+
+def _terminate(pool):
+    """Kill worker processes of `ProcessPoolExecutor`."""
+    processes = getattr(pool, "_processes", None) or {}
+    for process in list(processes.values()):
+        process.terminate()
+
+
+def _fork_run(
+    instructions: list, text_input: str, engine: str, timeout: float, max_steps: int
+) -> tuple:
+    """
+    Fork child process which runs instructions with `run_one` and writes its result as
+    json to pipe. Returns `(pid, fd)` where fd is reading end of the pipe.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid:
+        os.close(write_fd)
+        return pid, read_fd
+
+    os.close(read_fd)
+    try:
+        try:
+            if timeout and hasattr(signal, "setitimer"):
+                signal.signal(signal.SIGALRM, _alarm)
+            result = run_one(instructions, text_input, engine, timeout, max_steps)
+        except BaseException:
+            result = ("crash", None, traceback.format_exc(), 0.0)
+        with os.fdopen(write_fd, "wb") as fp:
+            fp.write(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+    finally:
+        os._exit(0)  # Child must not run cleanup of the parent, i.e. flush its buffers
+
+
+def run_forked(
+    instructions: list,
+    inputs: list,
+    file: str = "",
+    timeout: float = None,
+    engine: str = "tree",
+    max_steps: int = None,
+    workers: int = None,
+) -> list:
+    """
+    Run compiled program with every input in a child process forked from this one, so
+    children share compiled instructions copy-on-write instead of compiling them again.
+    Returns list of results in order of inputs. Available only where `os.fork` is.
+
+    Args:
+        - instructions: list, Output of `pseudo.compile`.
+        - inputs: list, List of `(name, text)` pairs used as stdin.
+        - file: str, Name of submission in results.
+        - timeout: float, Time limit of single run in seconds.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - max_steps: int, Maximal number of loop iterations and calls of single run.
+        - workers: int, Number of children running at once (default: number of cpus).
+    """
+    import selectors
+
+    if not inputs:
+        inputs = [("", "")]
+    workers = workers or os.cpu_count() or 1
+    # Child is killed if neither interpreter nor signal stopped it
+    limit = timeout + 2 * TIMER_SLACK if timeout else None
+
+    results = [None] * len(inputs)
+    pending = list(enumerate(inputs))[::-1]
+    running = {}  # Children by file descriptor of their pipe
+    selector = selectors.DefaultSelector()
+
+    def finish(fd: int, killed: bool = False):
+        child = running.pop(fd)
+        selector.unregister(fd)
+        os.close(fd)
+        _, status = os.waitpid(child.pid, 0)
+        name = inputs[child.index][0]
+        if killed:
+            results[child.index] = Result(file, name, "timeout", None, "", limit)
+        elif child.chunks:
+            result = json.loads(b"".join(child.chunks).decode("utf-8"))
+            results[child.index] = Result(file, name, *result)
+        else:
+            elapsed = time.perf_counter() - child.start
+            message = f"Child process exited with status {status}"
+            results[child.index] = Result(file, name, "crash", None, message, elapsed)
+
+    sys.stdout.flush()  # Buffered output would be inherited by children
+    sys.stderr.flush()
+    # Collector of children does not touch compiled program. Objects frozen by the caller
+    # stay frozen.
+    unfreeze = hasattr(gc, "freeze") and gc.get_freeze_count() == 0
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                index, (_, text) = pending.pop()
+                pid, fd = _fork_run(instructions, text, engine, timeout, max_steps)
+                running[fd] = _Child(index, pid, time.perf_counter(), [])
+                selector.register(fd, selectors.EVENT_READ)
+
+            wait = None
+            if limit:
+                deadline = min(child.start for child in running.values()) + limit
+                wait = max(deadline - time.perf_counter(), 0)
+            for key, _ in selector.select(wait):
+                data = os.read(key.fd, 65536)
+                if data:
+                    running[key.fd].chunks.append(data)
+                else:
+                    finish(key.fd)
+
+            if limit:
+                now = time.perf_counter()
+                for fd, child in list(running.items()):
+                    if now - child.start > limit:
+                        os.kill(child.pid, signal.SIGKILL)
+                        finish(fd, killed=True)
+    finally:
+        for fd, child in list(running.items()):  # Interrupted, i.e. with Ctrl+C
+            os.kill(child.pid, signal.SIGKILL)
+            finish(fd, killed=True)
+        selector.close()
+        if unfreeze:
+            gc.unfreeze()
+    return results
+
+
+def write_report(results: list, fp, format: str = "json"):
+    """
+    Write results to file object as `json` or `csv`.
+
+    Args:
+        - results: list, List of `Result` objects.
+        - fp: file, Output file object.
+        - format: str, `json` or `csv`.
+    """
+    if format == "csv":
+        writer = csv.writer(fp)
+        writer.writerow(FIELDS)
+        writer.writerows(results)
+    else:
+        json.dump([r._asdict() for r in results], fp, ensure_ascii=False, indent=2)
+        fp.write("\n")
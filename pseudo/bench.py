@@ -0,0 +1,250 @@
+"""
+This module contains benchmark runner used by `pdc bench`. Every program is compiled,
+lowered for the engine (`pseudo.closure.compile_closure` or `pseudo.vm.compile_bytecode`)
+and run separately, so regressions of lexer, engine compiler and runtime are reported
+independently. Results can be saved as json and compared with results of previous version
+measured with the same engine and python.
+
+Usage::
+    >>> results = run_benchmarks(load_programs(["benchmarks/programs"]))
+    >>> print(format_results(results))
+    >>> if not baseline_differences(results, baseline):
+    ...     regressions = compare(results, baseline, threshold=0.1)
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+from pseudo import __version__, compile
+from pseudo.profiler import ProfilingRunTime
+from pseudo.runtime import RunTime
+
+
+GENERATED_LINES = 10000  # Number of lines of generated program
+METRICS = ("compile", "lower", "run")
+MIN_DELTA = 0.002  # Seconds, smaller slowdowns are treated as noise
+BASELINE_FIELDS = ("engine", "python")  # Results are comparable only if they are equal
+
+
+class Discard:
+    """Sink of program output, which ignores it."""
+
+    def write(self, text: str):
+        pass
+
+
+def generated_source(lines: int = GENERATED_LINES, seed: int = 0) -> str:
+    """
+    Returns pseudocode with given number of lines, made of assignments, conditions and
+    loops. It is used to measure lexer on large sources.
+    """
+    rand = random.Random(seed)
+    source = []
+    while len(source) < lines:
+        a, b = rand.choice("abcxyz"), rand.choice("abcxyz")
+        kind = rand.random()
+        if kind < 0.6:
+            source.append(f"{a} := {b} + {rand.randint(1, 100)} * ({a} mod 7)")
+        elif kind < 0.8:
+            source.append(f"jeżeli {a} > {b} to")
+            source.append(f"    {a} := {a} - {b}")
+            source.append("wpp")
+            source.append(f"    {b} := {b} div 2")
+        else:
+            source.append(f"dla i:=1,...,{rand.randint(1, 3)} wykonuj")
+            source.append(f"    {a} := {a} + i")
+    header = [f"{name} := 0" for name in "abcxyz"]
+    return "\n".join(header + source[: lines - len(header)]) + "\n"
+
+
+def load_programs(paths: list, generated_lines: int = GENERATED_LINES) -> list:
+    """
+    Returns list of `(name, source)` pairs of `.pdc` files in given paths. Directories are
+    expanded. Generated program is appended unless `generated_lines` is 0.
+
+    Args:
+        - paths: list, Paths to pseudocode files or directories.
+        - generated_lines: int, Size of generated program.
+    """
+    programs = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".pdc")]
+        else:
+            files = [path]
+        for f in files:
+            with open(f, encoding="utf-8") as fp:
+                programs.append((os.path.splitext(os.path.basename(f))[0], fp.read()))
+    if generated_lines:
+        programs.append((f"generated_{generated_lines}", generated_source(generated_lines)))
+    return programs
+
+
+def _best(function, repeat: int) -> float:
+    """Returns the shortest time of `repeat` calls of function."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _peak_memory(function) -> int:
+    """Returns peak memory in bytes allocated during call of function."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _lower(instructions: list, engine: str):
+    """Returns function, which runs instructions lowered for engine in given runtime."""
+    if engine == "vm":
+        from pseudo.vm import compile_bytecode, VirtualMachine
+
+        code = compile_bytecode(instructions, resolve=True)
+        return lambda r: VirtualMachine(r).run(code)
+    if engine == "closure":
+        from pseudo.closure import compile_closure
+
+        instructions = compile_closure(instructions)
+    return lambda r: r.run(instructions)
+
+
+def measure(source: str, engine: str = "tree", repeat: int = 3) -> dict:
+    """
+    Returns statistics of single program. Times are the best of `repeat` runs: `compile`
+    is lexing and parsing, `lower` is compilation for engine (0 for tree engine) and `run`
+    is execution only. Number of evaluated instructions `ops` is always counted with the
+    tree engine, so it is the same unit of work for every engine. It and peak memory are
+    measured in separate runs, so they do not slow down timed ones.
+
+    Args:
+        - source: str, Pseudocode.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - repeat: int, Number of timed runs.
+    """
+    instructions = compile(source)
+    lines = source.count("\n") + 1
+
+    counter = ProfilingRunTime(sink=Discard())
+    counter.run(compile(source))
+    ops = sum(stats[0] for stats in counter.profile.lines.values())
+
+    program = _lower(instructions, engine)
+
+    def run():
+        program(RunTime(sink=Discard()))
+
+    compile_time = _best(lambda: compile(source), repeat)
+    lower_time = 0.0
+    if engine != "tree":
+        lower_time = _best(lambda: _lower(instructions, engine), repeat)
+    run_time = _best(run, repeat)
+    return {
+        "lines": lines,
+        "ops": ops,
+        "compile": compile_time,
+        "lower": lower_time,
+        "run": run_time,
+        "compile_lines_per_sec": lines / compile_time if compile_time else 0.0,
+        "run_ops_per_sec": ops / run_time if run_time else 0.0,
+        "compile_peak_memory": _peak_memory(lambda: compile(source)),
+        "run_peak_memory": _peak_memory(run),
+    }
+
+
+def run_benchmarks(programs: list, engine: str = "tree", repeat: int = 3) -> dict:
+    """
+    Measure every program and returns results, which can be saved as json.
+
+    Args:
+        - programs: list, List of `(name, source)` pairs.
+        - engine: str, One of `tree`, `closure` or `vm`.
+        - repeat: int, Number of timed runs of every program.
+    """
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "engine": engine,
+        "benchmarks": {
+            name: measure(source, engine, repeat) for name, source in programs
+        },
+    }
+
+
+def baseline_differences(results: dict, baseline: dict) -> list:
+    """
+    Returns list of `(field, old, new)` tuples for settings (see `BASELINE_FIELDS`) which
+    differ between results and baseline. Times are not comparable if engine differs and
+    may differ only because of interpreter if python differs.
+    """
+    return [
+        (field, baseline.get(field), results.get(field))
+        for field in BASELINE_FIELDS
+        if baseline.get(field) != results.get(field)
+    ]
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = 0.1, min_delta: float = MIN_DELTA
+) -> list:
+    """
+    Returns list of `(name, metric, old, new)` tuples for times which are slower than in
+    baseline by more than `threshold` (fraction of baseline time) and by more than
+    `min_delta` seconds, so noise of very short times is not reported. Programs and
+    metrics missing in baseline are skipped.
+
+    Args:
+        - results: dict, Output of `run_benchmarks`.
+        - baseline: dict, Previous output of `run_benchmarks`.
+        - threshold: float, Allowed slowdown.
+        - min_delta: float, Allowed slowdown in seconds.
+    """
+    regressions = []
+    old_benchmarks = baseline.get("benchmarks", {})
+    for name, new in results["benchmarks"].items():
+        old = old_benchmarks.get(name)
+        if old is None:
+            continue
+        for metric in METRICS:
+            if metric not in old or metric not in new:
+                continue
+            slowdown = new[metric] - old[metric]
+            if new[metric] > old[metric] * (1 + threshold) and slowdown > min_delta:
+                regressions.append((name, metric, old[metric], new[metric]))
+    return regressions
+
+
+def format_results(results: dict, baseline: dict = None) -> str:
+    """Returns table of results. If baseline is given, change of times is shown."""
+    header = (
+        f"{'benchmark':<20} {'compile [s]':>12} {'lines/s':>10} {'lower [s]':>10} "
+        f"{'run [s]':>10} {'ops/s':>10} {'peak [KiB]':>11}"
+    )
+    table = [header]
+    old_benchmarks = (baseline or {}).get("benchmarks", {})
+    for name, new in results["benchmarks"].items():
+        row = (
+            f"{name:<20} {new['compile']:>12.4f} {new['compile_lines_per_sec']:>10.0f} "
+            f"{new['lower']:>10.4f} {new['run']:>10.4f} {new['run_ops_per_sec']:>10.0f} "
+            f"{max(new['compile_peak_memory'], new['run_peak_memory']) / 1024:>11.0f}"
+        )
+        old = old_benchmarks.get(name)
+        if old is not None:
+            changes = [
+                f"{metric} {(new[metric] / old[metric] - 1) * 100:+.1f}%"
+                for metric in METRICS
+                if old.get(metric)
+            ]
+            row += "  " + ", ".join(changes)
+        table.append(row)
+    return "\n".join(table)
@@ -0,0 +1,133 @@
+"""
+This module contains on-disk cache of compiled programs. Output of `pseudo.compile` is
+pickled to cache directory (by default per-user directory, see `default_directory`) under
+the hash of source, range symbol, interpreter version and format of AST. When size of the
+directory exceeds the limit, least recently used entries are removed.
+
+Entries are unpickled, so cache directory has to be trusted. It is never taken from the
+directory of the source and entries owned by other users are ignored.
+
+Usage::
+    >>> cache = CompileCache()
+    >>> instructions = cache.compile("pisz 4")
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import hashlib
+import os
+import pickle
+import sys
+
+from pseudo import __version__, compile
+
+
+CACHE_FORMAT = 3  # Has to be increased whenever pickled AST classes change
+MAX_SIZE = 64 * 1024 * 1024  # bytes
+
+
+def default_directory() -> str:
+    """
+    Returns per-user cache directory: `$XDG_CACHE_HOME/pseudo`, `%LOCALAPPDATA%/pseudo` on
+    Windows or `~/.cache/pseudo`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pseudo")
+
+
+class CompileCache:
+    """
+    On-disk cache of compiled programs.
+
+    Attributes:
+        - directory: str, Path to cache directory.
+        - max_size: int, Maximal size of cache directory in bytes.
+    """
+
+    def __init__(self, directory: str = None, max_size: int = MAX_SIZE):
+        self.directory = directory if directory is not None else default_directory()
+        self.max_size = max_size
+
+    @staticmethod
+    def key(text_input: str, range_symbol: str = "...") -> str:
+        """Returns cache key of given source."""
+        h = hashlib.sha256()
+        for part in (
+            __version__,
+            str(CACHE_FORMAT),
+            f"{sys.version_info[0]}.{sys.version_info[1]}",
+            range_symbol,
+            text_input,
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        """Returns path of cache entry."""
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key: str) -> list:
+        """Returns cached instructions or None if there is no valid entry."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as fp:
+                if hasattr(os, "getuid") and os.fstat(fp.fileno()).st_uid != os.getuid():
+                    return None  # Entry of other user could be crafted to run code
+                instructions = pickle.load(fp)
+        except Exception:  # Missing or broken entry
+            return None
+        try:
+            os.utime(path)  # Mark entry as recently used
+        except OSError:
+            pass
+        return instructions
+
+    def put(self, key: str, instructions: list):
+        """Save instructions in cache and evict old entries if needed."""
+        tmp = f"{self.path(key)}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as fp:
+                pickle.dump(instructions, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path(key))
+        except (OSError, pickle.PicklingError, RecursionError):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until cache fits in `max_size`."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".pickle"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        size = sum(e[1] for e in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+
+    def compile(self, text_input: str, range_symbol: str = "...") -> list:
+        """Returns instructions from cache or compiles and caches them."""
+        key = self.key(text_input, range_symbol)
+        instructions = self.get(key)
+        if instructions is None:
+            instructions = compile(text_input, range_symbol)
+            self.put(key, instructions)
+        return instructions
@@ -1,27 +1,155 @@
 #!/usr/bin/env python
 
 
+import os
 import sys
+import json
 import click
 import codecs
 
-from pseudo import __version__, __doc__, compile
-from pseudo.runtime import RunTime
+from pseudo import __version__
+from pseudo.runtime import OUTPUT_BUFFER_SIZE
+
+# Modules needed by single command are imported in it, so start-up of `pdc` does not pay
+# for batch runner, profiler and other engines.
 
 
 __author__ = "Patryk Niedźwiedziński"
 
 
-@click.command()
+BENCHMARKS_DIR = os.path.join("benchmarks", "programs")
+
+
+class DefaultGroup(click.Group):
+    """Group of commands, which runs `run` command if no other command is given."""
+
+    def parse_args(self, ctx, args):
+        if not args or args[0] not in self.commands and args[0] != "--help":
+            args = ["run"] + args
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup)
+def pdc():
+    """Pseudocode interpreter. By default runs FILE, i.e. `pdc file.pdc`."""
+
+
+@pdc.command()
 @click.option("--version", "-v", help="Display version", is_flag=True)
 @click.option(
     "--range-symbol",
     default="...",
     help="Set range symbol in for loop (default: '...')",
 )
-@click.argument("file", type=click.Path(exists=True), required=False)
-def pdc(file, version, range_symbol):
-    """Run pseudocode file."""
+@click.option(
+    "--engine",
+    type=click.Choice(["tree", "closure", "vm"]),
+    default="tree",
+    help="Set engine used to run instructions (default: 'tree')",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Set directory of compile cache (default: per-user cache, i.e. '~/.cache/pseudo')",
+)
+@click.option("--no-cache", help="Do not use compile cache", is_flag=True)
+@click.option(
+    "--gc-threshold",
+    type=(int, int, int),
+    help="Set garbage collector thresholds used while running program",
+)
+@click.option(
+    "--gc-freeze",
+    help="Move objects created before run to permanent generation",
+    is_flag=True,
+)
+@click.option(
+    "--memoize",
+    help="Cache results of pure functions (tree and closure engines)",
+    is_flag=True,
+)
+@click.option("--no-optimize", help="Do not fold constant expressions", is_flag=True)
+@click.option(
+    "--buffer-size",
+    type=click.IntRange(min=0),
+    default=OUTPUT_BUFFER_SIZE,
+    help=f"Set number of characters buffered before output is written, 0 disables buffering (default: {OUTPUT_BUFFER_SIZE})",
+)
+@click.option(
+    "--input",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Read input of `czytaj` from file without prompts",
+)
+@click.option(
+    "--stream",
+    help="Run statements while file is parsed (tree engine, implied by FILE '-')",
+    is_flag=True,
+)
+@click.option(
+    "--max-steps",
+    type=click.IntRange(min=0),
+    help="Stop program after given number of loop iterations and function calls",
+)
+@click.option("--timeout", type=float, help="Stop program after given number of seconds")
+@click.option(
+    "--profile",
+    help="Print the hottest lines of program to stderr (tree engine)",
+    is_flag=True,
+)
+@click.option(
+    "--profile-output",
+    type=click.File("w", encoding="utf-8"),
+    help="Write statistics of all lines to file (implies --profile)",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(["json", "callgrind"]),
+    default="json",
+    help="Format of --profile-output (default: 'json')",
+)
+@click.option(
+    "--fork-per-input",
+    type=click.Path(exists=True),
+    help="Run program with every file in given directory as stdin, each in process forked "
+    "after compilation, and print json report",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Number of processes run at once with --fork-per-input (default: number of cpus)",
+)
+@click.argument("file", type=click.Path(exists=True, allow_dash=True), required=False)
+def run(
+    file,
+    version,
+    range_symbol,
+    engine,
+    cache_dir,
+    no_cache,
+    gc_threshold,
+    gc_freeze,
+    memoize,
+    no_optimize,
+    buffer_size,
+    input_file,
+    stream,
+    max_steps,
+    timeout,
+    profile,
+    profile_output,
+    profile_format,
+    fork_per_input,
+    jobs,
+):
+    """Run pseudocode file. Use '-' as FILE to read it from stdin."""
+    from pseudo import compile, compile_iter
+    from pseudo.batch import execute
+    from pseudo.cache import CompileCache
+    from pseudo.exceptions import LimitExceeded
+    from pseudo.optimizer import optimize, optimize_iter
+    from pseudo.runtime import RunTime, GCPolicy, InputBuffer
 
     if version:
         print(__version__)
@@ -31,9 +159,331 @@ def pdc(file, version, range_symbol):
         click.echo('⚠️  Error: Missing argument "FILE".')
         sys.exit(1)
 
-    with codecs.open(file, encoding="utf-8") as fp:
-        text_input = fp.read()
+    profile = profile or profile_output is not None
+    if profile and engine != "tree":
+        raise click.UsageError("--profile works only with tree engine")
+    if memoize and engine == "vm":
+        raise click.UsageError("--memoize works only with tree and closure engines")
+    if fork_per_input is not None:
+        if not hasattr(os, "fork"):
+            raise click.UsageError("--fork-per-input is not supported on this platform")
+        conflicts = [
+            option
+            for option, used in [
+                ("FILE '-'", file == "-"),
+                ("--stream", stream),
+                ("--input", input_file),
+                ("--profile", profile),
+                ("--memoize", memoize),
+                ("--gc-threshold", gc_threshold),
+                ("--gc-freeze", gc_freeze),
+            ]
+            if used
+        ]
+        if conflicts:
+            raise click.UsageError(f"--fork-per-input cannot be used with {', '.join(conflicts)}")
+
+    source = text_input = None
+    if file == "-" or stream:
+        source = sys.stdin if file == "-" else codecs.open(file, encoding="utf-8")
+        instructions = compile_iter(source, range_symbol)
+        if not no_optimize:
+            instructions = optimize_iter(instructions)
+        if engine != "tree":  # Other engines compile the whole program before run
+            instructions = list(instructions)
+    else:
+        with codecs.open(file, encoding="utf-8") as fp:
+            text_input = fp.read()
+
+        if no_cache:
+            instructions = compile(text_input, range_symbol)
+        else:
+            instructions = CompileCache(cache_dir).compile(text_input, range_symbol)
+        if not no_optimize:
+            instructions = optimize(instructions)
+
+    if fork_per_input is not None:
+        from pseudo.batch import read_inputs, run_forked, write_report
+
+        inputs = read_inputs([fork_per_input])
+        results = run_forked(instructions, inputs, file, timeout, engine, max_steps, jobs)
+        write_report(results, sys.stdout, "json")
+        return
+
+    gc_policy = None
+    if gc_threshold or gc_freeze:
+        gc_policy = GCPolicy(threshold=gc_threshold, freeze=gc_freeze)
+    if profile:
+        from pseudo.profiler import ProfilingRunTime as RunTime
+    r = RunTime(
+        gc_policy=gc_policy,
+        memoize=memoize,
+        buffer_size=buffer_size,
+        input_source=InputBuffer.open(input_file) if input_file else None,
+        max_steps=max_steps,
+        timeout=timeout,
+    )
+    try:
+        execute(instructions, engine, r)
+    except LimitExceeded as err:
+        click.echo(f"\n⚠️  Error: {err}")
+        sys.exit(1)
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if memoize:
+            stats = r.memo.stats()
+            click.echo(
+                f"\nmemoize: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%} hit rate)",
+                err=True,
+            )
+        if profile:
+            click.echo("\n" + r.profile.report(), err=True)
+        if profile_output is not None:
+            if profile_format == "callgrind":
+                name = "<stdin>" if file == "-" else file
+                r.profile.write_callgrind(profile_output, name)
+            else:
+                r.profile.write_json(profile_output)
+
+
+@pdc.command()
+@click.option(
+    "--input",
+    "-i",
+    "inputs",
+    multiple=True,
+    type=click.Path(exists=True),
+    help="File or directory of files used as stdin, every file is a separate run",
+)
+@click.option("--timeout", type=float, help="Time limit of single run in seconds")
+@click.option(
+    "--max-steps",
+    type=click.IntRange(min=0),
+    help="Limit of loop iterations and function calls of single run",
+)
+@click.option("--jobs", "-j", type=int, help="Number of worker processes")
+@click.option(
+    "--report",
+    type=click.File("w", encoding="utf-8"),
+    default="-",
+    help="Report file (default: stdout)",
+)
+@click.option(
+    "--format",
+    "report_format",
+    type=click.Choice(["json", "csv"]),
+    default="json",
+    help="Format of report (default: 'json')",
+)
+@click.option(
+    "--range-symbol",
+    default="...",
+    help="Set range symbol in for loop (default: '...')",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["tree", "closure", "vm"]),
+    default="tree",
+    help="Set engine used to run instructions (default: 'tree')",
+)
+@click.argument("submissions", nargs=-1, required=True, type=click.Path(exists=True))
+def batch(
+    submissions, inputs, timeout, max_steps, jobs, report, report_format, range_symbol, engine
+):
+    """Run every submission (file or directory of .pdc files) with every input."""
+    from pseudo.batch import find_submissions, read_inputs, run_batch, write_report
+
+    results = run_batch(
+        find_submissions(submissions),
+        read_inputs(inputs),
+        timeout=timeout,
+        workers=jobs,
+        range_symbol=range_symbol,
+        engine=engine,
+        max_steps=max_steps,
+    )
+    write_report(results, report, report_format)
+
+
+@pdc.command()
+@click.option(
+    "--fork/--no-fork",
+    default=True,
+    help="Handle every connection in separate process, so clients do not wait for each "
+    "other (default: --fork)",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Keep compiled programs also in given directory",
+)
+@click.argument("socket_path", metavar="SOCKET", type=click.Path())
+def serve(socket_path, fork, cache_dir):
+    """Run grading server listening on Unix SOCKET (see `pdc submit`)."""
+    from pseudo.cache import CompileCache
+    from pseudo.server import serve as run_server
+
+    click.echo(f"Listening on {socket_path}", err=True)
+    run_server(socket_path, fork, CompileCache(cache_dir) if cache_dir else None)
+
+
+@pdc.command()
+@click.option(
+    "--input",
+    "-i",
+    "inputs",
+    multiple=True,
+    type=click.Path(exists=True),
+    help="File or directory of files used as stdin, every file is a separate run",
+)
+@click.option("--timeout", type=float, help="Time limit of single run in seconds")
+@click.option(
+    "--max-steps",
+    type=click.IntRange(min=0),
+    help="Limit of loop iterations and function calls of single run",
+)
+@click.option(
+    "--report",
+    type=click.File("w", encoding="utf-8"),
+    default="-",
+    help="Report file (default: stdout)",
+)
+@click.option(
+    "--format",
+    "report_format",
+    type=click.Choice(["json", "csv"]),
+    default="json",
+    help="Format of report (default: 'json')",
+)
+@click.option(
+    "--range-symbol",
+    default="...",
+    help="Set range symbol in for loop (default: '...')",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["tree", "closure", "vm"]),
+    default="tree",
+    help="Set engine used to run instructions (default: 'tree')",
+)
+@click.argument("socket_path", metavar="SOCKET", type=click.Path(exists=True))
+@click.argument("submissions", nargs=-1, required=True, type=click.Path(exists=True))
+def submit(
+    socket_path,
+    submissions,
+    inputs,
+    timeout,
+    max_steps,
+    report,
+    report_format,
+    range_symbol,
+    engine,
+):
+    """Run submissions with every input on server started with `pdc serve`."""
+    from pseudo.batch import Result, find_submissions, read_inputs, write_report
+    from pseudo.client import Client
+
+    inputs = read_inputs(inputs) or [("", "")]
+    results = []
+    with Client(socket_path) as client:
+        for file in find_submissions(submissions):
+            with codecs.open(file, encoding="utf-8") as fp:
+                source = fp.read()
+            for name, text in inputs:
+                response = client.run(source, text, engine, timeout, max_steps, range_symbol)
+                results.append(
+                    Result(
+                        file,
+                        name,
+                        response["status"],
+                        response.get("exit_code"),
+                        response.get("stdout", response.get("error", "")),
+                        response.get("time", 0.0),
+                    )
+                )
+    write_report(results, report, report_format)
+
+
+@pdc.command()
+@click.option(
+    "--engine",
+    type=click.Choice(["tree", "closure", "vm"]),
+    default="tree",
+    help="Set engine used to run programs (default: 'tree')",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Number of timed runs, the best one is reported (default: 3)",
+)
+@click.option(
+    "--generated-lines",
+    type=click.IntRange(min=0),
+    help="Size of generated program, 0 skips it (default: 10000)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w", encoding="utf-8"),
+    help="Save results as json",
+)
+@click.option(
+    "--baseline",
+    type=click.File("r", encoding="utf-8"),
+    help="Compare with results saved with --output, exit code is 1 on regression",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.1,
+    help="Allowed slowdown against baseline as fraction (default: 0.1)",
+)
+@click.option(
+    "--min-delta",
+    type=float,
+    help="Allowed slowdown against baseline in seconds (default: 0.002)",
+)
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+def bench(paths, engine, repeat, generated_lines, output, baseline, threshold, min_delta):
+    """Time compilation and run of programs (default: benchmarks/programs)."""
+    from pseudo.bench import (
+        GENERATED_LINES,
+        MIN_DELTA,
+        load_programs,
+        run_benchmarks,
+        baseline_differences,
+        compare,
+        format_results,
+    )
+
+    if generated_lines is None:
+        generated_lines = GENERATED_LINES
+    if min_delta is None:
+        min_delta = MIN_DELTA
+    if baseline is not None:
+        baseline = json.load(baseline)
+        if baseline.get("engine") != engine:
+            raise click.UsageError(
+                f"Baseline was measured with {baseline.get('engine')} engine, not {engine}"
+            )
+
+    if not paths and os.path.isdir(BENCHMARKS_DIR):
+        paths = [BENCHMARKS_DIR]
+    results = run_benchmarks(load_programs(paths, generated_lines), engine, repeat)
+    if baseline is not None:
+        for field, old, new in baseline_differences(results, baseline):
+            click.echo(f"⚠️  Baseline {field} differs: {old} -> {new}", err=True)
+    click.echo(format_results(results, baseline))
 
-    instructions = compile(text_input, range_symbol)
-    r = RunTime()
-    r.run(instructions)
+    if output is not None:
+        json.dump(results, output, indent=2)
+        output.write("\n")
+    if baseline is not None:
+        regressions = compare(results, baseline, threshold, min_delta)
+        for name, metric, old, new in regressions:
+            click.echo(f"⚠️  Regression: {name} {metric} {old:.4f}s -> {new:.4f}s", err=True)
+        if regressions:
+            sys.exit(1)
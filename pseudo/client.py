@@ -0,0 +1,76 @@
+"""
+This module contains client of grading server started with `pdc serve` (see
+`pseudo.server`). It uses only standard library, so it is cheap to import.
+
+Usage::
+    >>> with Client("/tmp/pdc.sock") as client:
+    ...     for text in inputs:
+    ...         result = client.run(source, stdin=text, timeout=2)
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import json
+import socket
+
+
+class Client:
+    """
+    Connection to grading server. Requests are sent one by one over single connection.
+
+    Attributes:
+        - path: str, Path of Unix socket of server.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rwb")
+
+    def run(
+        self,
+        source: str,
+        stdin: str = "",
+        engine: str = "tree",
+        timeout: float = None,
+        max_steps: int = None,
+        range_symbol: str = "...",
+    ) -> dict:
+        """
+        Run program on server and return response with keys `status`, `exit_code`,
+        `stdout` and `time`.
+
+        Args:
+            - source: str, Pseudocode.
+            - stdin: str, Input read by `czytaj`, one value per line.
+            - engine: str, One of `tree`, `closure` or `vm`.
+            - timeout: float, Time limit of run in seconds.
+            - max_steps: int, Maximal number of loop iterations and calls.
+            - range_symbol: str, Range symbol in for loop.
+        """
+        request = {
+            "source": source,
+            "stdin": stdin,
+            "engine": engine,
+            "timeout": timeout,
+            "max_steps": max_steps,
+            "range_symbol": range_symbol,
+        }
+        self.file.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Server closed connection")
+        return json.loads(line)
+
+    def close(self):
+        """Close connection."""
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
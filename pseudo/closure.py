@@ -0,0 +1,407 @@
+"""
+This module contains closure compiler. It turns list of instructions returned by
+`pseudo.compile` into tree of pre-bound python functions, so node types and operators are
+resolved once at compile time instead of on every evaluation.
+
+Usage::
+    >>> from pseudo import compile
+    >>> from pseudo.closure import compile_closure
+    >>> instructions = compile_closure(compile("pisz 2+2"))
+    >>> RunTime().run(instructions)
+    4
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from sys import exit
+
+from pseudo.exceptions import RunTimeError
+from pseudo.type import Statement
+from pseudo.type.base import ASTNode, Value, EOL
+from pseudo.type.conditional import Condition
+from pseudo.type.function import (
+    Function,
+    FunctionDefinition,
+    Call,
+    TailCall,
+    Pending,
+    Return,
+)
+from pseudo.type.loop import Loop, ForRange, bind_iterator
+from pseudo.type.operation import Operation, OPERATIONS
+from pseudo.type.variable import Variable, Assignment, Increment
+
+
+class Closure(ASTNode):
+    """
+    Node wrapping compiled function. It can be evaluated by `pseudo.runtime.RunTime` like
+    any other node.
+
+    Attributes:
+        - eval: function, Compiled function taking runtime and scope id.
+        - line: str, Line in pseudocode.
+        - node: ASTNode, Compiled node, used by analysis passes.
+    """
+
+    def __init__(self, function, line: str = "", node: ASTNode = None):
+        self.eval = function
+        self.line = line
+        self.node = node
+
+    def __repr__(self):
+        return f"Closure({self.eval.__name__}, line={repr(self.line)})"
+
+
+def compile_closure(instructions: list) -> list:
+    """
+    Compile list of instructions to list of `Closure` nodes.
+
+    Args:
+        - instructions: list, Instructions returned by `pseudo.compile`.
+    """
+
+    return [
+        Closure(compile_node(i), getattr(i, "line", ""), i)
+        for i in instructions
+        if not isinstance(i, EOL)
+    ]
+
+
+def compile_node(node):
+    """
+    Compile single node to function taking runtime and scope id. Nodes without dedicated
+    compiler fall back to their `eval` method.
+
+    Args:
+        - node: ASTNode, Node to compile.
+    """
+
+    for node_type in type(node).__mro__:
+        compiler = COMPILERS.get(node_type)
+        if compiler is not None:
+            return compiler(node)
+    return node.eval
+
+
+def compile_block(instructions: list):
+    """
+    Compile list of instructions to single function evaluating them in order. Only blocks
+    containing `zwróć` check if function is returning after every instruction.
+    """
+
+    functions = tuple(
+        compile_node(i) for i in instructions if not isinstance(i, EOL)
+    )
+
+    if not returns(instructions):
+
+        def block(r, scope_id=None):
+            for function in functions:
+                function(r, scope_id)
+
+        return block
+
+    def returning_block(r, scope_id=None):
+        for function in functions:
+            function(r, scope_id)
+            if r.returning:
+                return
+
+    return returning_block
+
+
+def returns(instructions: list) -> bool:
+    """Checks if `zwróć` can be evaluated in given instructions."""
+
+    for i in instructions:
+        if isinstance(i, Return):
+            return True
+        if isinstance(i, Condition):
+            if returns(i.true) or (i.false is not None and returns(i.false)):
+                return True
+        elif isinstance(i, Loop) and returns(i.expressions):
+            return True
+    return False
+
+
+def _compile_value(node: Value):
+    value = node.value
+
+    def constant(r, scope_id=None):
+        return value
+
+    return constant
+
+
+def _compile_indices(node: Variable):
+    indices = tuple(compile_node(i) for i in node.indices)
+
+    def eval_indices(r, scope_id=None):
+        return tuple(i(r, scope_id) for i in indices)
+
+    return eval_indices
+
+
+def _compile_variable(node: Variable):
+    name = node.value
+
+    if not node.indices:
+
+        def variable(r, scope_id=None):
+            return r.get(name, scope_id)
+
+    else:
+        indices = _compile_indices(node)
+
+        def variable(r, scope_id=None):
+            return r.get_item(name, indices(r, scope_id), scope_id)
+
+    return variable
+
+
+def _compile_operation(node: Operation):
+    symbol = node.operator.value
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+    line = node.line
+
+    try:
+        function = OPERATIONS[symbol]
+    except KeyError:
+
+        def operation(r, scope_id=None):
+            r.throw(f"Unknown operator '{symbol}'", line)
+
+        return operation
+
+    def operation(r, scope_id=None):
+        try:
+            return function(left(r, scope_id), right(r, scope_id))
+        except TypeError:
+            r.throw(
+                f"Type error: cannot do '{repr(left(r, scope_id))} {symbol} {repr(right(r, scope_id))}'",
+                line,
+            )
+
+    return operation
+
+
+def _compile_statement(node: Statement):
+    if node.value == "pisz":
+        args = compile_node(node.args)
+
+        def statement(r, scope_id=None):
+            r.stdout(args(r, scope_id))
+
+    elif node.value == "czytaj":
+        key = node.args.value
+
+        def statement(r, scope_id=None):
+            r.stdin(key)
+
+    elif node.value == "koniec":
+
+        def statement(r, scope_id=None):
+            r.flush()
+            exit()
+
+    else:
+
+        def statement(r, scope_id=None):
+            pass
+
+    return statement
+
+
+def _compile_assignment(node: Assignment):
+    name = node.target.value
+    value = compile_node(node.value)
+    object_class = node.object_class
+    line = node.line
+
+    if node.target.indices:
+        indices = _compile_indices(node.target)
+
+        def assignment(r, scope_id=None):
+            try:
+                i = indices(r, scope_id)
+                r.store_item(name, i, value(r, scope_id), scope_id)
+            except RunTimeError as err:
+                r.throw(err, line)
+
+    else:
+
+        def assignment(r, scope_id=None):
+            try:
+                r.store(name, value(r, scope_id), object_class, scope_id)
+            except RunTimeError as err:
+                r.throw(err, line)
+
+    return assignment
+
+
+def _compile_increment(node: Increment):
+    key = node.key
+
+    def increment(r, scope_id=None):
+        if scope_id:
+            return r.frames[scope_id][key].incr()
+        r.var[key].incr()
+
+    return increment
+
+
+def _compile_condition(node: Condition):
+    condition = compile_node(node.condition)
+    true = compile_block(node.true)
+    false = compile_block(node.false) if node.false is not None else None
+
+    def conditional(r, scope_id=None):
+        b = condition(r, scope_id)
+        if b and b != "nil":
+            true(r, scope_id)
+        elif false is not None:
+            false(r, scope_id)
+
+    return conditional
+
+
+def _compile_loop(node: Loop):
+    condition = compile_node(node.condition)
+    body = compile_block(node.expressions)
+    iterator = node.iterator.value if node.iterator is not None else None
+
+    if returns(node.expressions):
+
+        def loop(r, scope_id=None):
+            limited = r.limited
+            while condition(r, scope_id):
+                body(r, scope_id)
+                if r.returning:
+                    break
+                if limited:
+                    r.step()
+            if iterator is not None:
+                r.delete(iterator, scope_id)
+
+    else:
+
+        def loop(r, scope_id=None):
+            limited = r.limited
+            while condition(r, scope_id):
+                body(r, scope_id)
+                if limited:
+                    r.step()
+            if iterator is not None:
+                r.delete(iterator, scope_id)
+
+    return loop
+
+
+def _compile_for_range(node: ForRange):
+    key = node.iterator.value
+    start = compile_node(node.start)
+    end = compile_node(node.end)
+    body = compile_block(node.expressions)
+    observed = node.observed
+    check_returning = returns(node.expressions)
+    line = node.line
+
+    def for_range(r, scope_id=None):
+        i = start(r, scope_id)
+        try:
+            o = bind_iterator(r, key, i, scope_id)
+        except RunTimeError as err:
+            r.throw(err, line)
+        last = end(r, scope_id)
+        if not isinstance(i, int) or not isinstance(last, int):
+            r.throw(f"Type error: cannot do '{repr(i)} <= {repr(last)}'", line)
+
+        limited = r.limited
+        while i <= last:
+            if observed:
+                o.value = i
+            body(r, scope_id)
+            if check_returning and r.returning:
+                break
+            i += 1
+            if limited:
+                r.step()
+        r.delete(key, scope_id)
+
+    return for_range
+
+
+def _compile_function_definition(node: FunctionDefinition):
+    function = Function(
+        node.function_name,
+        node.args,
+        compile_closure(node.instructions),
+        node.line,
+        node.void,
+    )
+    name = node.function_name
+
+    def function_definition(r, scope_id=None):
+        r.store(name, function)
+
+    return function_definition
+
+
+def _compile_call(node: Call):
+    name = node.function_name
+    args = [compile_node(a) for a in node.args]
+    line = node.line
+
+    def call(r, scope_id=None):
+        if name in r.var:
+            function = r.get(name)
+            if isinstance(function, Function):
+                return function.call(r, [a(r, scope_id) for a in args], line)
+
+        r.throw(f"Function {repr(name)} is not defined.", line)
+
+    return call
+
+
+def _compile_tail_call(node: TailCall):
+    name = node.function_name
+    args = [compile_node(a) for a in node.args]
+    line = node.line
+
+    def tail_call(r, scope_id=None):
+        if name in r.var:
+            function = r.get(name)
+            if isinstance(function, Function):
+                return Pending(function, [a(r, scope_id) for a in args], line)
+
+        r.throw(f"Function {repr(name)} is not defined.", line)
+
+    return tail_call
+
+
+def _compile_return(node: Return):
+    value = compile_node(node.return_value)
+
+    def return_call(r, scope_id=None):
+        r.return_value = value(r, scope_id)
+        r.returning = True
+
+    return return_call
+
+
+COMPILERS = {
+    Value: _compile_value,
+    Variable: _compile_variable,
+    Operation: _compile_operation,
+    Statement: _compile_statement,
+    Assignment: _compile_assignment,
+    Increment: _compile_increment,
+    Condition: _compile_condition,
+    Loop: _compile_loop,
+    ForRange: _compile_for_range,
+    FunctionDefinition: _compile_function_definition,
+    Call: _compile_call,
+    TailCall: _compile_tail_call,
+    Return: _compile_return,
+}
@@ -13,3 +13,26 @@ class Comment(Exception):
 
 class RunTimeError(Exception):
     """This exception is raised when runtime error occurs."""
+
+
+class LimitExceeded(BaseException):
+    """
+    This exception is raised when program exceeds its step budget or deadline. It does not
+    inherit from `Exception`, so it is not reported as interpreter crash and it stops the
+    program immediately, also inside function calls.
+
+    Attributes:
+        - limit: str, `steps` or `time`.
+        - steps: int, Number of steps done by program.
+        - elapsed: float, Time of run in seconds.
+    """
+
+    def __init__(self, limit: str, steps: int, elapsed: float):
+        if limit == "steps":
+            message = f"Step limit exceeded ({steps} steps)"
+        else:
+            message = f"Time limit exceeded ({elapsed:.2f}s)"
+        BaseException.__init__(self, message)
+        self.limit = limit
+        self.steps = steps
+        self.elapsed = elapsed
@@ -1,8 +1,9 @@
 """
-This module contains Lexer class using to tokenize stream.
+This module contains Lexer class used to parse tokens of the stream.
 """
 
-from pseudo.stream import Stream, EndOfFile
+from pseudo.stream import Stream, EndOfFile, END_OF_LINE
+from pseudo.tokenizer import NAME, NUMBER, STRING, OPERATOR, PUNCTUATION, COMMENT
 from pseudo.utils import append
 from pseudo.type.numbers import Int, is_digit, read_number
 from pseudo.type.string import String, read_string
@@ -92,24 +93,6 @@ class Lexer:
             self.i.throw(f"Cannot do '{arg.operator}' on nil")
         return args
 
-    def read(self, test, eol=True) -> str:
-        """
-        Read an element of code from the stream based on given test function.
-
-        Args:
-            test: Function used to determine if next char should be included
-                to expression.
-            eol: Optional variable, which switches `end of line` to be included
-                to expression.
-        """
-
-        expression = ""
-        while not self.i.eof() and test(self.i.peek()):
-            if eol and self.i.eol():
-                break
-            expression += self.i.next()
-        return expression
-
     def read_range(self) -> tuple:
         """Read range `a ,..., b`"""
         a = self.read_args()
@@ -118,14 +101,16 @@ class Lexer:
 
         if not isinstance(r, str) or r != self.range_symbol:
             self.i.throw(f"Expected {self.range_symbol}, but {r} was given")
-        self.i.next()
+        self.i.next_token()
         b = self.read_condition("dopóki")
         return (a, b)
 
     def read_keyword(self) -> str:
         """Read a keyword from the stream."""
-        keyword = self.read(lambda c: not self.is_keyword_end(c))
-        return keyword
+        token = self.i.token()
+        if token is None or token.kind != NAME:
+            return ""
+        return self.i.next_token().text
 
     def read_builtin(self, keyword: str, indent_level: int, prev: object) -> object:
         """Read builtin statement, expression from input stream i.e.: if, while etc"""
@@ -151,7 +136,7 @@ class Lexer:
         elif keyword == "procedura":
             return_value = read_function(self, indent_level, void=True)
         elif keyword == "koniec":
-            return_value = Statement(keyword)
+            return_value = Statement(keyword, line=self.i.get_current_line())
 
         if return_value:
             return return_value
@@ -160,13 +145,13 @@ class Lexer:
         arg = self.read_expression(arg)
 
         if keyword == "zwróć":
-            return_value = Return(arg)
+            return_value = Return(arg, self.i.get_current_line())
         elif keyword == "czytaj" and not isinstance(arg, Variable):
                 self.i.throw("Statement 'czytaj' requires variable as argument")
         elif isinstance(arg, Statement):
             self.i.throw(f"Statement '{keyword}' cannot take '{arg}' as argument")
 
-        return return_value or Statement(keyword, args=arg)
+        return return_value or Statement(keyword, args=arg, line=self.i.get_current_line())
 
     def read_condition(self, keyword, indent_level: int = 0) -> object:
         """Read condition of conditional expression."""
@@ -177,13 +162,26 @@ class Lexer:
         condition = self.read_expression(args[:-1])
         return condition
 
-    def read_args(self, bracket: bool = None, indent_level: int = 0) -> list:
-        """Read arguments from the stream."""
+    def read_args(
+        self, bracket: bool = None, indent_level: int = 0, split: bool = False
+    ) -> list:
+        """
+        Read arguments from the stream.
+
+        Args:
+            - bracket: bool, If true reading ends at `)`.
+            - indent_level: int, Number of indents prepended to instructions.
+            - split: bool, If true list of comma separated groups of arguments is returned.
+        """
+        groups = []
         args = []
-        while not self.i.eol():
+        while True:
+            token = self.i.token()
+            if token is None or token.kind == COMMENT:
+                break
             arg = self.read_next(indent_level=indent_level)
 
-            if arg == self.range_symbol:
+            if isinstance(arg, str) and arg == self.range_symbol:
                 self.i.col -= len(self.range_symbol)
                 break
             if not isinstance(arg, Value):
@@ -192,19 +190,38 @@ class Lexer:
             if isinstance(arg, Operator):
                 if len(args) == 0:
                     args.append(Int(0))
-            if arg == Value(","):
-                continue
-            if arg == Value(")"):
-                if bracket:
+            elif type(arg) is Value:  # Punctuation
+                if arg.value == ",":
+                    if split:
+                        groups.append(args)
+                        args = []
+                    continue
+                if arg.value == ")":
+                    if bracket:
+                        break
+                    self.i.throw(f"Invalid character '{arg}'")
+                if arg.value == "]":
                     break
-                self.i.throw(f"Invalid character '{arg}'")
-            if arg == Value("]"):
-                break
 
             args = append(args, arg)
+        if split:
+            if args or groups:
+                groups.append(args)
+            return groups
+        return args
+
+    def read_call_args(self) -> list:
+        """Read comma separated expressions passed to function call."""
+        args = []
+        for group in self.read_args(bracket=True, split=True):
+            if not group:
+                self.i.throw("Expected expression, but ',' was given")
+            args.append(self.read_expression(group))
         return args
 
     def read_expression(self, args: list, bracket: bool = None) -> object:
+        if not args:
+            self.i.throw("Expected expression")
         while len(args) > 1:
             prev = Operator("+")
             i = 0
@@ -234,47 +251,47 @@ class Lexer:
 
     def read_white_chars(self) -> None:
         """Read white chars from stream."""
-        self.read(lambda c: c == " " or c == "\t", eol=False)
+        token = self.i.token()
+        if token is not None:
+            self.i.col = token.col
+        elif self.i.col < self.i.length:
+            self.i.col = self.i.length
+
+    def read_statement(self, prev: object = None, indent_level: int = 0) -> object:
+        """
+        Read next statement like `read_next` and set `lineno` of returned statements to
+        number of line where they start.
+        """
+        lineno = self.i.line
+        x = self.read_next(prev=prev, indent_level=indent_level)
+        for node in x if isinstance(x, list) else [x]:
+            if not isinstance(node, EOL) and getattr(node, "lineno", 0) is None:
+                node.lineno = lineno
+        return x
 
     def read_next(self, prev: object = None, indent_level: int = 0) -> object:
         """Read next elements from the stream and guess the type."""
         i = self.indent_size
         if self.indent_size is None:
             i = 0
-        if self.i.col > i * indent_level:
-            self.read_white_chars()
-        c = self.i.peek()
-
-        if isinstance(c, EOL):
-            self.i.next_line()
-            return c
+        if self.i.col <= i * indent_level and (
+            self.i.peek() == " " or self.i.peek() == "\t"
+        ):
+            self.i.throw(f"Invalid character: '{self.i.peek()}'")
+        token = self.i.token()
 
-        if c == "#":
+        if token is None:
             self.i.next_line()
-            return EOL()
-
-        if c in {"(", ")", "]", ","}:
-            self.i.next()
-            if c == "(":
-                args = self.read_args(bracket=True)
-                return self.read_expression(args, bracket=True)
-            return Value(c)
-
-        if c == '"' or c == "'":
-            return read_string(self)
-
-        if is_operator(c):
-            return read_operator(self.i)
-
-        if is_digit(c):
-            return read_number(self)
+            return END_OF_LINE
 
-        elif c not in {" ", "\t", "["}:
-            col = self.i.col
-            keyword = self.read_keyword()
+        kind = token.kind
+        if kind == NAME:
+            col = token.col
+            keyword = token.text
+            self.i.next_token()
 
             # Builtin keyword
-            if self.is_keyword(keyword):
+            if keyword in self.keywords or keyword == self.range_symbol:
                 return self.read_builtin(keyword, indent_level, prev)
 
             # Operation
@@ -287,17 +304,19 @@ class Lexer:
 
             # Check and read indices
             indices = []
-            while self.i.peek() == "[":
-                self.i.next()
-                arg = self.read_args()
-                exp = self.read_expression(arg)
-                indices.append(exp)
-
-            # Check if it's a call (`a()`)
-            if self.i.peek() == "(":
-                self.i.next()
-                args = self.read_args(bracket=True)
-                return Call(keyword, args, self.i.get_current_line())
+            token = self.i.token()
+            if token is not None and token.kind == PUNCTUATION:
+                while self.i.peek() == "[":
+                    self.i.next_token()
+                    arg = self.read_args()
+                    exp = self.read_expression(arg)
+                    indices.append(exp)
+
+                # Check if it's a call (`a()`)
+                if self.i.peek() == "(":
+                    self.i.next_token()
+                    args = self.read_call_args()
+                    return Call(keyword, args, self.i.get_current_line())
 
             if col == i * indent_level:
                 operator = self.read_next()
@@ -317,44 +336,70 @@ class Lexer:
                     Variable(keyword, indices), args, line=self.i.get_current_line()
                 )
             return Variable(keyword, indices)
-        # if c == "":
-        #     raise EndOfFile
-        self.i.throw(f"Invalid character: '{c}'")
+
+        if kind == NUMBER:
+            return read_number(self)
+
+        if kind == OPERATOR:
+            return read_operator(self.i)
+
+        if kind == STRING:
+            return read_string(self)
+
+        if kind == COMMENT:
+            self.i.next_line()
+            return END_OF_LINE
+
+        if kind == PUNCTUATION and token.text != "[":
+            self.i.next_token()
+            if token.text == "(":
+                args = self.read_args(bracket=True)
+                return self.read_expression(args, bracket=True)
+            return Value(token.text)
+
+        self.i.throw(f"Invalid character: '{token.text}'")
 
     def read_indent_size(self):
         """Read indent size from stream."""
-        size = 0
-
-        if isinstance(self.i.peek(), EOL):
+        indent = self.read_indentation()
+        if not indent:
             return None
 
-        self.indent_char = self.i.peek()
-        while self.i.peek() == self.indent_char:
-            self.i.next()
-            size += 1
-        if size == 0:
-            return None
+        self.indent_char = indent[0]
+        size = len(indent) - len(indent.lstrip(self.indent_char))
+        self.i.col += size
         if size <= 1 and self.indent_char == " ":
             self.i.throw(f"Invalid indentation, should be at least 2, not {size}")
         self.indent_size = size
 
+    def read_indentation(self) -> str:
+        """Returns white chars between cursor and next token without moving cursor."""
+        token = self.i.token()
+        end = token.col if token is not None else self.i.length
+        return self.i.current[self.i.col : end]
+
     def read_indent(self, indent_level: int = 1) -> None:
         """Read indented expressions while valid indentation and returns list of them."""
         if self.indent_size is None:
             self.read_indent_size()
             return None
-        for i in range(self.indent_size * indent_level):
-            c = self.i.next()
-            if isinstance(c, EOL):
-                break
-            if c == "#":
-                raise Comment
-            if c != self.indent_char:
+        indent = self.read_indentation()
+        size = self.indent_size * indent_level
+        for i in range(size):
+            if i == len(indent):
+                token = self.i.token()
+                if token is None:  # Line with white chars only
+                    self.i.col = self.i.length
+                    return None
+                if token.kind == COMMENT:
+                    raise Comment
+            if i == len(indent) or indent[i] != self.indent_char:
                 if i % self.indent_size == 0:
                     self.i.col = 0
                     raise IndentationBlockEnd
                 self.i.throw(f"Inconsistent indentation size")
-        if self.i.peek() == " " or self.i.peek() == "\t":
+        self.i.col += size
+        if len(indent) > size:
             self.i.throw(f"Inconsistent indentation size")
 
     def read_indent_block(self, indent_level: int = 1) -> list:
@@ -369,12 +414,10 @@ class Lexer:
         empty_block = True
         line = self.i.line
 
-        while (
-            self.i.peek() == " "
-            or self.i.peek() == "\t"
-            or self.i.peek() == "#"
-            or isinstance(self.i.peek(), EOL)
-        ):
+        while True:
+            token = self.i.token()
+            if not (token is None or token.kind == COMMENT or token.col > self.i.col):
+                break
 
             # Read indentation
             try:
@@ -387,7 +430,7 @@ class Lexer:
 
             # Read instruction
             try:
-                e = self.read_next(indent_level=indent_level)
+                e = self.read_statement(indent_level=indent_level)
             except EndOfFile:
                 break
             if not isinstance(e, EOL):
@@ -0,0 +1,184 @@
+"""
+This module contains memoization of pure functions. Function is pure if its body does not
+read or write global variables, does not use arrays, `pisz`, `czytaj` or `koniec` and calls
+only pure functions. Results of such functions depend only on arguments, so they can be
+cached.
+
+Usage::
+    >>> r = RunTime(memoize=True)
+    >>> r.run(compile(text_input))
+    >>> r.memo.stats()
+    {'hits': 3, 'misses': 26, 'size': 26, 'hit_rate': 0.1}
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from collections import OrderedDict
+
+from pseudo.type import Statement
+from pseudo.type.base import Value, EOL
+from pseudo.type.conditional import Condition
+from pseudo.type.function import FunctionDefinition, Call, Return
+from pseudo.type.loop import Loop, ForRange
+from pseudo.type.operation import Operation, Operator
+from pseudo.type.variable import Variable, Assignment, Increment
+from pseudo.vm.resolver import resolve_globals
+
+
+MEMO_SIZE = 100000  # Maximal number of cached results
+
+
+class Memo:
+    """
+    Bounded LRU cache of results of pure functions.
+
+    Attributes:
+        - pure: set, Names of pure functions, None until program is analysed.
+        - size: int, Maximal number of cached results.
+        - cache: OrderedDict, Results by `(function name, arguments)`.
+        - hits: int, Number of calls answered from cache.
+        - misses: int, Number of calls which were evaluated.
+    """
+
+    def __init__(self, size: int = MEMO_SIZE, pure: set = None):
+        self.size = size
+        self.pure = pure
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, function, r, args: list, calling_line: str):
+        """Returns cached result of function or calls it and caches result."""
+        key = (function.name, tuple(args))
+        cache = self.cache
+        try:
+            value = cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable argument
+            return function.invoke(r, args, calling_line)
+        else:
+            self.hits += 1
+            cache.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = function.invoke(r, args, calling_line)
+        cache[key] = value
+        if len(cache) > self.size:
+            cache.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        """Returns statistics of cache."""
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.cache),
+            "hit_rate": self.hits / calls if calls else 0.0,
+        }
+
+
+def find_pure_functions(instructions: list) -> set:
+    """
+    Returns names of pure functions defined in program. Procedures and functions defined
+    more than once are never pure.
+
+    Args:
+        - instructions: list, Instructions returned by `pseudo.compile` or
+            `pseudo.closure.compile_closure`.
+    """
+
+    instructions = [getattr(i, "node", i) for i in instructions]
+    globals = set(resolve_globals(instructions).names)
+
+    definitions = {}
+    defined_twice = set()
+    for node in _nodes(instructions):
+        if isinstance(node, FunctionDefinition):
+            if node.function_name in definitions:
+                defined_twice.add(node.function_name)
+            definitions[node.function_name] = node
+
+    calls = {}
+    for name, definition in definitions.items():
+        if definition.void or name in defined_twice:
+            continue
+        called = _pure_body(definition, globals)
+        if called is not None:
+            calls[name] = called
+
+    # Function calling impure function is impure too
+    pure = set(calls)
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            if not calls[name] <= pure:
+                pure.discard(name)
+                changed = True
+    return pure
+
+
+def _nodes(instructions: list):
+    """Yields statements in given block and nested blocks, including function bodies."""
+    for node in instructions:
+        yield node
+        if isinstance(node, Condition):
+            yield from _nodes(node.true)
+            yield from _nodes(node.false or [])
+        elif isinstance(node, Loop):
+            yield from _nodes(node.expressions)
+        elif isinstance(node, FunctionDefinition):
+            yield from _nodes(node.instructions)
+
+
+def _pure_body(definition: FunctionDefinition, globals: set) -> set:
+    """
+    Returns names of functions called by function or None if its body has side effects
+    or reads global variables.
+    """
+
+    args = {a.value for a in definition.args}
+    calls = set()
+
+    def pure(node) -> bool:
+        if isinstance(node, (Statement, FunctionDefinition)):
+            return False
+        if isinstance(node, Assignment):
+            target = node.target
+            if target.indices or target.value in globals:
+                return False
+            return pure(node.value)
+        if isinstance(node, Variable):
+            if node.indices:
+                return False
+            return node.value in args or node.value not in globals
+        if isinstance(node, Call):
+            calls.add(node.function_name)
+            return all(pure(a) for a in node.args)
+        if isinstance(node, Operation):
+            return pure(node.left) and pure(node.right)
+        if isinstance(node, Condition):
+            return (
+                pure(node.condition)
+                and all(pure(i) for i in node.true)
+                and all(pure(i) for i in node.false or [])
+            )
+        if isinstance(node, ForRange):
+            return (
+                node.iterator.value not in globals
+                and pure(node.start)
+                and pure(node.end)
+                and all(pure(i) for i in node.expressions)
+            )
+        if isinstance(node, Loop):
+            return pure(node.condition) and all(pure(i) for i in node.expressions)
+        if isinstance(node, Return):
+            return pure(node.return_value)
+        return isinstance(node, (Value, Increment, Operator, EOL))
+
+    if all(pure(i) for i in definition.instructions):
+        return calls
+    return None
@@ -0,0 +1,129 @@
+"""
+This module contains optimisation pass over instructions returned by `pseudo.compile`.
+Operations on literals are folded into single value and conditions with constant
+condition are replaced with the branch which would be evaluated, so this work is not
+repeated on every evaluation (i.e. in every iteration of loop).
+
+Usage::
+    >>> optimize(compile("pisz 2 * 3 + 1"))
+    [Statement("pisz", args=Int(7)), EOL()]
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from pseudo.type import Statement
+from pseudo.type.base import Value
+from pseudo.type.bool import Bool
+from pseudo.type.conditional import Condition
+from pseudo.type.function import FunctionDefinition, Call, Return
+from pseudo.type.loop import Loop, ForRange
+from pseudo.type.numbers import Int
+from pseudo.type.operation import Operation, OPERATIONS
+from pseudo.type.string import String
+from pseudo.type.variable import Variable, Assignment
+
+
+LITERALS = (Int, String, Bool)
+
+
+def optimize(instructions: list) -> list:
+    """
+    Returns optimised list of instructions. Nested nodes are modified in place.
+
+    Args:
+        - instructions: list, Instructions returned by `pseudo.compile`.
+    """
+
+    return list(optimize_iter(instructions))
+
+
+def optimize_iter(instructions):
+    """
+    Yields optimised instructions, it is used with instructions streamed by
+    `pseudo.compile_iter`.
+
+    Args:
+        - instructions: iterable, Instructions to optimise.
+    """
+
+    for node in instructions:
+        node = fold_statement(node)
+        if isinstance(node, list):
+            yield from node
+        elif node is not None:
+            yield node
+
+
+def is_literal(node) -> bool:
+    """Checks if node is a constant value."""
+    return type(node) is Value or isinstance(node, LITERALS)
+
+
+def literal(value: object, line: str = ""):
+    """Returns node of constant value."""
+    if type(value) is int:
+        return Int(value, line)
+    if type(value) is str:
+        return String(value, line)
+    return Value(value, line)
+
+
+def fold(node):
+    """Returns expression with operations on literals replaced by their results."""
+
+    if isinstance(node, Operation):
+        node.left = fold(node.left)
+        node.right = fold(node.right)
+        if is_literal(node.left) and is_literal(node.right):
+            try:
+                value = OPERATIONS[node.operator.value](node.left.value, node.right.value)
+            except Exception:  # Error is reported when operation is evaluated
+                return node
+            return literal(value, node.line)
+    elif isinstance(node, Call):
+        node.args = [fold(a) for a in node.args]
+    elif isinstance(node, Variable):
+        node.indices = [fold(i) for i in node.indices]
+    return node
+
+
+def fold_statement(node):
+    """
+    Returns optimised statement, list of statements replacing it or None if statement
+    can be removed.
+    """
+
+    if isinstance(node, Assignment):
+        node.target = fold(node.target)
+        node.value = fold(node.value)
+    elif isinstance(node, Statement):
+        if node.args is not None:
+            node.args = fold(node.args)
+    elif isinstance(node, Return):
+        node.return_value = fold(node.return_value)
+    elif isinstance(node, Condition):
+        node.condition = fold(node.condition)
+        if is_literal(node.condition):
+            value = node.condition.value
+            if value and value != "nil":
+                return optimize(node.true)
+            return optimize(node.false) if node.false is not None else None
+        node.true = optimize(node.true)
+        if node.false is not None:
+            node.false = optimize(node.false)
+    elif isinstance(node, ForRange):
+        node.start = fold(node.start)
+        node.end = fold(node.end)
+        node.expressions = optimize(node.expressions)
+    elif isinstance(node, Loop):
+        node.condition = fold(node.condition)
+        if node.iterator is None and is_literal(node.condition):
+            value = node.condition.value
+            if not value or value == "nil":
+                return None
+        node.expressions = optimize(node.expressions)
+    elif isinstance(node, FunctionDefinition):
+        node.instructions = optimize(node.instructions)
+    else:
+        return fold(node)
+    return node
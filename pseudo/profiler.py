@@ -0,0 +1,131 @@
+"""
+This module contains profiler of pseudocode programs. `ProfilingRunTime` measures every
+instruction evaluated by the tree engine and aggregates execution counts and times by line
+of pseudocode (its number and text, so identical lines are counted separately). Plain
+`RunTime` is not instrumented, so profiling costs nothing when it is disabled.
+
+Usage::
+    >>> r = ProfilingRunTime()
+    >>> r.run(compile(text_input))
+    >>> print(r.profile.report())
+      count    total [s]     self [s]  line
+     100000        0.321        0.321  3: s := s + i
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import json
+from time import perf_counter
+
+from pseudo.runtime import RunTime
+
+
+COUNT, TOTAL, SELF, ACTIVE = range(4)
+
+
+class Profile:
+    """
+    Statistics of evaluated lines.
+
+    Attributes:
+        - lines: dict, Lists `[count, total, self, active]` by `(lineno, text)` of line of
+            pseudocode. `total` is time including nested instructions and calls, counted
+            once for recursive calls, `self` excludes them. `active` is number of
+            unfinished evaluations.
+        - children: list, Time of nested instructions of every unfinished evaluation.
+    """
+
+    def __init__(self):
+        self.lines = {}
+        self.children = [0.0]
+
+    def rows(self) -> list:
+        """Returns list of dicts with statistics of lines sorted by self time."""
+        rows = [
+            {
+                "line": line,
+                "lineno": lineno,
+                "count": stats[COUNT],
+                "total": stats[TOTAL],
+                "self": stats[SELF],
+            }
+            for (lineno, line), stats in self.lines.items()
+        ]
+        rows.sort(key=lambda row: row["self"], reverse=True)
+        return rows
+
+    def report(self, limit: int = 20) -> str:
+        """
+        Returns table of the hottest lines.
+
+        Args:
+            - limit: int, Maximal number of lines, None shows all of them.
+        """
+        rows = self.rows()[:limit]
+        table = [f"{'count':>7} {'total [s]':>12} {'self [s]':>12}  line"]
+        for row in rows:
+            line = row["line"].strip()
+            if row["lineno"] is not None:
+                line = f"{row['lineno']}: {line}"
+            table.append(f"{row['count']:>7} {row['total']:>12.6f} {row['self']:>12.6f}  {line}")
+        return "\n".join(table)
+
+    def write_json(self, fp):
+        """Write statistics of lines to file object as json."""
+        json.dump(self.rows(), fp, ensure_ascii=False, indent=2)
+        fp.write("\n")
+
+    def write_callgrind(self, fp, file: str):
+        """
+        Write statistics of lines to file object in callgrind format, which can be opened
+        i.e. with KCachegrind. Costs are self time in microseconds and execution count.
+
+        Args:
+            - fp: file, Output file object.
+            - file: str, Name of pseudocode file.
+        """
+        fp.write("# callgrind format\nversion: 1\ncreator: pseudo\n")
+        fp.write("positions: line\nevents: Microseconds Count\n\n")
+        fp.write(f"fl={file}\nfn=<module>\n")
+        for row in sorted(self.rows(), key=lambda row: row["lineno"] or 0):
+            fp.write(f"{row['lineno'] or 0} {round(row['self'] * 1e6)} {row['count']}\n")
+
+
+class ProfilingRunTime(RunTime):
+    """
+    Runtime which records statistics of every evaluated instruction in `profile`. Only the
+    tree engine evaluates nested instructions with `RunTime.eval`.
+
+    Attributes:
+        - profile: Profile, Collected statistics.
+    """
+
+    def __init__(self, *args, profile: Profile = None, **kwargs):
+        RunTime.__init__(self, *args, **kwargs)
+        self.profile = profile if profile is not None else Profile()
+
+    def eval(self, instruction, scope_id: int = None):
+        line = getattr(instruction, "line", "")
+        if not line:  # EOL
+            return RunTime.eval(self, instruction, scope_id)
+
+        profile = self.profile
+        key = (getattr(instruction, "lineno", None), line)
+        stats = profile.lines.get(key)
+        if stats is None:
+            stats = profile.lines[key] = [0, 0.0, 0.0, 0]
+        stats[COUNT] += 1
+        stats[ACTIVE] += 1
+        children = profile.children
+        children.append(0.0)
+        start = perf_counter()
+        try:
+            RunTime.eval(self, instruction, scope_id)
+        finally:
+            elapsed = perf_counter() - start
+            stats[ACTIVE] -= 1
+            stats[SELF] += elapsed - children.pop()
+            if not stats[ACTIVE]:
+                stats[TOTAL] += elapsed
+            children[-1] += elapsed
+
@@ -2,16 +2,13 @@
 
 __author__ = "Patryk Niedźwiedziński"
 
-import datetime
+import gc
 import os
-import traceback
-from uuid import uuid4
+import sys
 from sys import exit
+from time import perf_counter
 
-from pseudo.exceptions import RunTimeError
-from pseudo.type.numbers import Int
-from pseudo.type.string import String
-from pseudo.type.exceptions import ReturnCall
+from pseudo.exceptions import RunTimeError, LimitExceeded
 
 
 class MemoryObject:
@@ -44,6 +41,205 @@ class MemoryObject:
         r.throw(f"Variable {self.key} is not callable", self.line)
 
 
+class Array(MemoryObject):
+    """
+    This class is a representation of array in runtime memory. Elements with small
+    non-negative int indices are kept in dense list, which grows on demand. Other indices
+    (negative, strings or far beyond the end of list) fall back to dict. Every dimension of
+    multi-dimensional array is a separate `Array` stored in `rows`, so `T[1]` and `T[1][2]`
+    are independent elements.
+
+    Attributes:
+        - value: object, Value of variable without indices (`T`).
+        - items: list, Dense elements, unset element is "nil".
+        - sparse: dict, Elements which do not fit in `items`.
+        - rows: dict, Nested arrays for next dimension.
+    """
+
+    def __init__(self, key: str, value: object = "nil"):
+        MemoryObject.__init__(self, key, value)
+        self.items = []
+        self.sparse = {}
+        self.rows = {}
+
+    @classmethod
+    def of(cls, o: MemoryObject, key: str):
+        """Returns array stored in memory object, converting scalar if needed."""
+        if isinstance(o, Array):
+            return o
+        if o is None:
+            return cls(key)
+        if o.const:
+            raise RunTimeError(f"Variable {key} cannot be used as array")
+        return cls(key, o.value)
+
+    def get_item(self, indices: tuple) -> object:
+        """Returns element under given indices or "nil"."""
+        a = self
+        for i in indices[:-1]:
+            a = a.rows.get(i)
+            if a is None:
+                return "nil"
+        i = indices[-1]
+        if type(i) is int and 0 <= i < len(a.items):
+            return a.items[i]
+        return a.sparse.get(i, "nil")
+
+    def set_item(self, indices: tuple, value: object):
+        """Sets element under given indices."""
+        a = self
+        for i in indices[:-1]:
+            row = a.rows.get(i)
+            if row is None:
+                row = a.rows[i] = Array(self.key)
+            a = row
+        i = indices[-1]
+        items = a.items
+        if type(i) is int and i >= 0:
+            n = len(items)
+            if i < n:
+                items[i] = value
+                return
+            if i < 2 * n + 16:
+                items.extend(["nil"] * (i - n + 1))
+                if a.sparse:
+                    for k in range(n, i):
+                        if k in a.sparse:
+                            items[k] = a.sparse.pop(k)
+                    a.sparse.pop(i, None)
+                items[i] = value
+                return
+        a.sparse[i] = value
+
+
+def split_key(key: str) -> tuple:
+    """
+    Split legacy key of array element into name and indices, i.e. `T[1][a]` into
+    `("T", (1, "a"))`.
+    """
+
+    name, _, postfix = key.partition("[")
+    indices = []
+    for i in postfix[:-1].split("]["):
+        try:
+            indices.append(int(i))
+        except ValueError:
+            indices.append(i)
+    return name, tuple(indices)
+
+
+MAX_DEPTH = 1000  # Maximal depth of pseudocode calls
+FRAME_SIZE = 30  # Approximate number of python frames used by single pseudocode call
+PREALLOCATED_FRAMES = 32
+OUTPUT_BUFFER_SIZE = 8192  # Number of characters written by `pisz` kept before flushing
+CLOCK_INTERVAL = 256  # Number of steps between checks of deadline
+
+
+def parse_input(value: str) -> object:
+    """Returns int if value is a decimal number (with optional sign), otherwise string."""
+    number = value.strip()
+    if number.isdecimal() or (number[:1] in ("-", "+") and number[1:].isdecimal()):
+        return int(number)
+    return value
+
+
+class InputBuffer:
+    """
+    Standard input read up front, used by `czytaj` in non-interactive mode. Every `czytaj`
+    consumes one line, lines are cut from the buffer only when they are read.
+
+    Attributes:
+        - data: str, bytes or mmap, Whole input.
+        - pos: int, Position of the next line in `data`.
+
+    Usage::
+        >>> r = RunTime(input_source=InputBuffer.open("input.txt"))
+        >>> r = RunTime(input_source="1\\n2\\n")
+    """
+
+    def __init__(self, data):
+        if hasattr(data, "read"):
+            data = data.read()
+        self.data = data
+        self.newline = "\n" if isinstance(data, str) else b"\n"
+        self.pos = 0
+
+    @classmethod
+    def open(cls, path: str):
+        """Returns buffer of memory-mapped file."""
+        import mmap
+
+        with open(path, "rb") as fp:
+            try:
+                return cls(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:  # Empty file cannot be mapped
+                return cls(b"")
+
+    def readline(self) -> str:
+        """Returns next line without line break. Raises RunTimeError at the end of input."""
+        data = self.data
+        pos = self.pos
+        if pos >= len(data):
+            raise RunTimeError("No more input to read")
+        end = data.find(self.newline, pos)
+        if end == -1:
+            end = len(data)
+        self.pos = end + 1
+        line = data[pos:end]
+        if not isinstance(line, str):
+            line = line.decode("utf-8")
+        return line[:-1] if line.endswith("\r") else line
+
+    def read(self) -> object:
+        """Returns next line parsed with `parse_input`."""
+        return parse_input(self.readline())
+
+
+class GCPolicy:
+    """
+    Garbage collector settings applied while program is running. Previous settings are
+    restored when program ends.
+
+    Attributes:
+        - threshold: tuple, Thresholds passed to `gc.set_threshold`, None keeps current ones.
+        - freeze: bool, If true objects created before the run (imports, compiled program)
+            are moved to permanent generation (`gc.freeze`, python 3.7+), so collections
+            during the run do not traverse them. Objects are moved back only if nothing
+            was frozen before the run, so freeze of the caller is kept.
+        - disable: bool, If true garbage collector is disabled during the run.
+
+    Usage::
+        >>> r = RunTime(gc_policy=GCPolicy(threshold=(100000, 50, 50), freeze=True))
+    """
+
+    def __init__(self, threshold: tuple = None, freeze: bool = False, disable: bool = False):
+        self.threshold = threshold
+        self.freeze = freeze
+        self.disable = disable
+        self.active = False
+
+    def __enter__(self):
+        self.active = True
+        self.previous = (gc.get_threshold(), gc.isenabled())
+        self.unfreeze = self.freeze and hasattr(gc, "freeze") and gc.get_freeze_count() == 0
+        if self.threshold is not None:
+            gc.set_threshold(*self.threshold)
+        if self.freeze and hasattr(gc, "freeze"):
+            gc.freeze()
+        if self.disable:
+            gc.disable()
+        return self
+
+    def __exit__(self, *args):
+        threshold, enabled = self.previous
+        gc.set_threshold(*threshold)
+        if self.unfreeze:
+            gc.unfreeze()
+        if enabled:
+            gc.enable()
+        self.active = False
+
+
 class RunTime:
     """
     This class is a representation of computer resources like memory or processor. It is used
@@ -51,17 +247,41 @@ class RunTime:
 
     Attributes:
         - var: dict, In this object all variables will be stored.
+        - frames: list, Stack of call frames, frame under index `depth` holds local
+            variables of currently called function. Index 0 is unused, global variables
+            are stored in `var`.
+        - depth: int, Depth of current call, 0 outside of functions.
+        - max_depth: int, Maximal depth of calls, deeper recursion stops the program with
+            error.
+        - gc_policy: GCPolicy, Garbage collector settings used while running program.
+        - returning: bool, Set by `zwróć`. Blocks stop evaluating instructions while it is
+            set, until the function call returns.
+        - return_value: object, Value passed to `zwróć`.
+        - memo: pseudo.memoize.Memo, Cache of results of pure functions, None if
+            memoization is disabled.
+        - sink: file, Object with `write` method receiving output of `pisz`, None means
+            current `sys.stdout`.
+        - buffer: list, Output of `pisz` which was not written to sink yet.
+        - buffer_size: int, Number of buffered characters which causes flush, 0 disables
+            buffering.
+        - input_source: InputBuffer, Input read by `czytaj` without prompts, None means
+            interactive standard input.
+        - max_steps: int, Maximal number of steps (loop iterations and function calls),
+            None means no limit.
+        - timeout: float, Maximal time of run in seconds, None means no limit.
+        - limited: bool, True if any limit is set. Loops and calls call `step` only then.
+        - steps: int, Number of steps done since the run started.
+        - deadline: float, Value of `time.perf_counter` when the run has to stop.
 
 
     Variable names:
 
         Variable names consist of alphanumeric characters, starting with alphabetical char. Arrays
-        are stored as independent keys i.e.::
+        are stored as `Array` objects under their name. Elements can be also accessed with
+        legacy keys i.e.::
 
-            {
-                "T[1]": 1,
-                "T[2]": 2,
-            }
+            >>> r.get("T[1]")
+            1
 
     Usage::
         >>> instructions = [Statement("pisz", Int(42))]
@@ -70,62 +290,159 @@ class RunTime:
         42
     """
 
-    def __init__(self, var={}):
-        self.var = var
-        self.scopes = {}
-
-    def register_scope(self, function_name: str) -> str:
+    def __init__(
+        self,
+        var: dict = None,
+        gc_policy: GCPolicy = None,
+        max_depth: int = MAX_DEPTH,
+        memoize: bool = False,
+        sink=None,
+        buffer_size: int = OUTPUT_BUFFER_SIZE,
+        input_source=None,
+        max_steps: int = None,
+        timeout: float = None,
+    ):
+        self.var = var if var is not None else {}
+        self.frames = [None] + [{} for _ in range(PREALLOCATED_FRAMES)]
+        self.depth = 0
+        self.max_depth = max_depth
+        self.gc_policy = gc_policy
+        self.running = False
+        self.returning = False
+        self.return_value = None
+        self.memo = None
+        if memoize:
+            from pseudo.memoize import Memo  # Imported on demand, it depends on runtime
+
+            self.memo = Memo()
+        self.sink = sink
+        self.buffer = []
+        self.buffered = 0
+        self.buffer_size = buffer_size
+        if input_source is not None and not isinstance(input_source, InputBuffer):
+            input_source = InputBuffer(input_source)
+        self.input_source = input_source
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.limited = max_steps is not None or timeout is not None
+        self.deadline = None
+        self.reset_limits()
+
+    def reset_limits(self):
+        """Start counting steps and time of run from zero."""
+        self.steps = 0
+        self.started = perf_counter()
+        if self.timeout is not None:
+            self.deadline = self.started + self.timeout
+
+    def step(self):
         """
-        Create new scope and return its id.
+        Count a step of program. It is called at loop back-edges and function calls if
+        `limited` is set and raises `LimitExceeded` when program exceeds its limits. The
+        deadline is checked every `CLOCK_INTERVAL` steps.
+        """
+        if self.steps == self.max_steps:
+            raise LimitExceeded("steps", self.steps, perf_counter() - self.started)
+        self.steps += 1
+        if (
+            self.deadline is not None
+            and not self.steps % CLOCK_INTERVAL
+            and perf_counter() > self.deadline
+        ):
+            raise LimitExceeded("time", self.steps, perf_counter() - self.started)
+
+    def push_frame(self, names: list = (), values: list = ()) -> int:
+        """
+        Enter new call frame and return its depth, which is used as `scope_id` of
+        function's instructions. Frames are reused, so calling function does not allocate
+        new scope.
 
         Args:
-            - function_name: str, Prefix for scope id.
+            - names: list, Names of arguments, which are bound in new frame.
+            - values: list, Evaluated values of arguments.
         """
 
-        while True:
-            scope_id = f"{function_name}-{uuid4()}"
-            if scope_id not in self.scopes:
-                break
+        depth = self.depth + 1
+        if depth > self.max_depth:
+            raise RunTimeError(f"Maximum recursion depth exceeded ({self.max_depth})")
+        if depth == len(self.frames):
+            self.frames.append({})
+        frame = self.frames[depth]
+        for key, value in zip(names, values):
+            frame[key] = MemoryObject(key, value)
+        self.depth = depth
+        return depth
 
-        self.scopes[scope_id] = {}
+    def pop_frame(self):
+        """Leave current call frame and clear its variables."""
 
-        return scope_id
+        self.frames[self.depth].clear()
+        self.depth -= 1
 
-    def remove_scope(self, scope_id: str):
+    def save(
+        self, key: str, value: object, object_class=MemoryObject, scope_id: int = None
+    ):
         """
-        Remove scope from scope register.
+        This functions is used to save variable's value in memory
 
         Args:
-            - scope_id: str, Scope to remove.
+            - key: str, Unique key under which value will be stored. `T[1][10]` is also a key
+            - value: object, Value to store.
+            - object_class: class, Class of value.
+            - scope_id: int, Frame in which value should be saved, if None it will be saved to
+                global scope.
         """
 
-        del self.scopes[scope_id]
+        self.store(key, value.eval(self, scope_id), object_class, scope_id)
 
-    def save(
-        self, key: str, value: object, object_class=MemoryObject, scope_id: str = None
+    def store(
+        self, key: str, value: object, object_class=MemoryObject, scope_id: int = None
     ):
         """
-        This functions is used to save variable's value in memory
+        This function is used to save already evaluated value in memory.
 
         Args:
-            - key: str, Unique key under which value will be stored. `T[1][10]` is also a key
-            - value: object, Value to store.
+            - key: str, Unique key under which value will be stored.
+            - value: object, Evaluated value to store.
             - object_class: class, Class of value.
-            - scope_id: str, Scope in which value should be saved, if None it will be saved to
+            - scope_id: int, Frame in which value should be saved, if None it will be saved to
                 global scope.
         """
 
         if key not in self.var:
-            if scope_id:
-                self.scopes[scope_id][key] = object_class(
-                    key, value.eval(self, scope_id)
-                )
+            if "[" in key:
+                name, indices = split_key(key)
+                self.store_item(name, indices, value, scope_id)
+            elif scope_id:
+                self.frames[scope_id][key] = object_class(key, value)
             else:
-                self.var[key] = object_class(key, value.eval(self))
+                self.var[key] = object_class(key, value)
         else:
-            self.var[key].setter(value.eval(self), self)
+            self.var[key].setter(value, self)
 
-    def get(self, key: str, scope_id: str = None):
+    def store_item(self, key: str, indices: tuple, value: object, scope_id: int = None):
+        """
+        This function is used to save element of array.
+
+        Args:
+            - key: str, Name of array.
+            - indices: tuple, Evaluated indices of element.
+            - value: object, Evaluated value to store.
+            - scope_id: int, Frame in which array should be created if it does not exist.
+        """
+
+        if key in self.var:
+            memory = self.var
+        elif scope_id:
+            memory = self.frames[scope_id]
+        else:
+            memory = self.var
+        o = memory.get(key)
+        if not isinstance(o, Array):
+            o = memory[key] = Array.of(o, key)
+        o.set_item(indices, value)
+
+    def get(self, key: str, scope_id: int = None):
         """
         This function returns value of stored variable.
         
@@ -133,41 +450,78 @@ class RunTime:
             - key: str, Key under which value is stored.
         """
 
-        if scope_id and key in self.scopes[scope_id]:
-            return self.scopes[scope_id][key].getter()
+        if scope_id and key in self.frames[scope_id]:
+            return self.frames[scope_id][key].getter()
         if key in self.var:
             return self.var[key].getter()
+        if "[" in key:
+            name, indices = split_key(key)
+            return self.get_item(name, indices, scope_id)
+        return "nil"
+
+    def get_item(self, key: str, indices: tuple, scope_id: int = None):
+        """
+        This function returns element of array.
+
+        Args:
+            - key: str, Name of array.
+            - indices: tuple, Evaluated indices of element.
+        """
+
+        if scope_id and key in self.frames[scope_id]:
+            o = self.frames[scope_id][key]
+        elif key in self.var:
+            o = self.var[key]
         else:
             return "nil"
+        if isinstance(o, Array):
+            return o.get_item(indices)
+        return "nil"
 
-    def delete(self, key: str, scope_id: str = None):
+    def delete(self, key: str, scope_id: int = None):
         """This function removes variable from memory."""
-        if scope_id and key in self.scopes[scope_id]:
-            del self.scopes[scope_id][key]
+        if scope_id and key in self.frames[scope_id]:
+            del self.frames[scope_id][key]
         else:
             del self.var[key]
 
     def stdin(self, key: str):
         """This function reads value from standard input and stores it in given variable."""
-        value = input(f"{key}: ")
+        self.store(key, self.read(key))
 
-        try:  # value is a string by default
-            value = Int(value)
-        except ValueError:
-            value = String(value)
-
-        self.save(key, value)
+    def read(self, key: str) -> object:
+        """
+        This function reads and returns value from standard input. Value is an int if it is
+        a number, otherwise it is a string.
+        """
+        if self.input_source is not None:
+            return self.input_source.read()
+        self.flush()  # Prompt has to be preceded by everything written before
+        return parse_input(input(f"{key}: "))
 
     def stdout(self, value: object):
-        """This function writes value to standard output."""
-        if value == "\\n":
-            print("")
-        else:
-            print(value, end="")
+        """
+        This function writes value to standard output. Output is buffered, it is written
+        when buffer is full, before reading input and when program ends.
+        """
+        text = "\n" if value == "\\n" else str(value)
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """This function writes buffered output to sink."""
+        if self.buffer:
+            sink = self.sink if self.sink is not None else sys.stdout
+            sink.write("".join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
 
     @staticmethod
     def save_crash(error_message: str):
         """Save crash message to file and return path to it."""
+        import datetime
 
         now = datetime.datetime.now().strftime("%H-%M-%S-%d-%m-%Y")
 
@@ -181,7 +535,7 @@ class RunTime:
 
         return f"{os.getcwd()}/crash/{now}.log"
 
-    def eval(self, instruction, scope_id: str = None):
+    def eval(self, instruction, scope_id: int = None):
         """Evaluate instruction."""
         try:
             if scope_id:
@@ -190,27 +544,68 @@ class RunTime:
                 instruction.eval(self)
         except RunTimeError as err:
             self.throw(err, instruction.line)
-        except ReturnCall as r:
-            raise r
 
-    def run(self, instructions: list, scope_id: str = None):
+    def run(self, instructions: list, scope_id: int = None):
         """Run pseudocode instructions"""
+        if not self.running:
+            return self.start(instructions, scope_id)
         try:
             for i in instructions:
                 self.eval(i, scope_id)
-        except ReturnCall as r:
-            raise r
+                if self.returning:
+                    return
+        except RecursionError:
+            if self.depth:
+                raise  # Error is reported when stack is unwound
+            self.throw("Maximum recursion depth exceeded")
         except Exception:
-            path = self.save_crash(traceback.format_exc())
-            print("⚠️  Error: \n\tRuntime error has occurred!\n")
-            print(
-                "Wow! You encountered a bug! Please tell me how did you do that on https://github.com/pniedzwiedzinski/pseudo/issues\n"
-            )
-            print(f"Error message was copied to {path}")
-            exit(1)
+            self.crash()
+
+    def start(self, instructions: list, scope_id: int = None):
+        """
+        Run instructions as a program. Python recursion limit is raised to fit `max_depth`
+        calls and garbage collector policy is applied until the program ends.
+        """
+        if self.memo is not None and self.memo.pure is None:
+            from pseudo.memoize import find_pure_functions
+
+            instructions = list(instructions)  # Whole program is analysed before run
+            self.memo.pure = find_pure_functions(instructions)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, self.max_depth * FRAME_SIZE + 1000))
+        if self.limited:
+            self.reset_limits()
+        self.running = True
+        try:
+            if self.gc_policy is not None and not self.gc_policy.active:
+                with self.gc_policy:
+                    self.run(instructions, scope_id)
+            else:
+                self.run(instructions, scope_id)
+        finally:
+            self.running = False
+            sys.setrecursionlimit(limit)
+            self.flush()
+        if self.returning and not self.depth:
+            self.returning = False
+            self.throw("'zwróć' used outside of function")
+
+    def crash(self):
+        """This function saves traceback of unexpected exception and stops the execution."""
+        import traceback  # Imported on crash only, it is not needed in normal run
+
+        self.flush()
+        path = self.save_crash(traceback.format_exc())
+        print("⚠️  Error: \n\tRuntime error has occurred!\n")
+        print(
+            "Wow! You encountered a bug! Please tell me how did you do that on https://github.com/pniedzwiedzinski/pseudo/issues\n"
+        )
+        print(f"Error message was copied to {path}")
+        exit(1)
 
     def throw(self, error_message: str, line_causing_error: str = ""):
         """This function is used to tell user that a runtime error has occurred."""
+        self.flush()
 
         print(f"\n⚠️  Error on line :")
         print(f"\t'{line_causing_error}'")
@@ -0,0 +1,178 @@
+"""
+This module contains grading daemon started with `pdc serve`. It listens on Unix domain
+socket and runs submitted programs in the already warm interpreter, so clients do not pay
+for python start-up and imports on every run. Compiled programs are kept in memory, so the
+same source sent with many inputs is compiled once.
+
+Protocol: every request and response is a single line of json. Request is an object with
+keys `source` (required), `stdin`, `engine`, `range_symbol`, `timeout` and `max_steps`.
+Response has keys `status`, `exit_code`, `stdout` and `time` like `pseudo.batch.Result`.
+Invalid request gets response with status `bad-request` and `error` message. Many requests
+can be sent over one connection, see `pseudo.client.Client`. Every connection is handled in
+a forked process (if `os.fork` is available), so one client does not block others, and
+connection is closed when client is idle for `IDLE_TIMEOUT` seconds. Socket is accessible
+only by the user who started the server.
+
+Usage::
+    $ pdc serve /tmp/pdc.sock
+    >>> with Client("/tmp/pdc.sock") as client:
+    ...     client.run("czytaj a\\npisz a * 2", stdin="21\\n")
+    {'status': 'ok', 'exit_code': 0, 'stdout': '42', 'time': 0.0001}
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+from pseudo.batch import compile_source, run_one, _alarm
+from pseudo.cache import CompileCache
+
+
+MEMORY_CACHE_SIZE = 256  # Number of compiled programs kept in memory
+ENGINES = ("tree", "closure", "vm")
+IDLE_TIMEOUT = 60  # Seconds after which idle connection is closed
+
+
+class BadRequest(Exception):
+    """This exception is raised when request is not valid."""
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """
+    Handler of single connection, it answers requests until client disconnects or is idle
+    for `timeout` seconds.
+    """
+
+    timeout = IDLE_TIMEOUT
+
+    def handle(self):
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    response = self.server.run(json.loads(line))
+                except (ValueError, BadRequest) as err:  # json.JSONDecodeError is ValueError
+                    response = {"status": "bad-request", "error": str(err)}
+                data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                self.wfile.write(data + b"\n")
+                self.wfile.flush()
+        except socket.timeout:
+            pass
+
+
+class GradingServer(socketserver.UnixStreamServer):
+    """
+    Server running pseudocode programs. Requests are handled one by one in the main thread,
+    so time limits can be enforced with signals. Clients wait for each other, see
+    `ForkingGradingServer`.
+
+    Attributes:
+        - compiled: OrderedDict, Compiled programs by cache key, least recently used first.
+        - cache: pseudo.cache.CompileCache, On-disk cache of compiled programs or None.
+    """
+
+    def __init__(self, path: str, cache: CompileCache = None):
+        """
+        Args:
+            - path: str, Path of Unix socket. Stale socket left by previous server is
+                removed.
+            - cache: pseudo.cache.CompileCache, On-disk cache of compiled programs.
+        """
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+        self.compiled = OrderedDict()
+        self.cache = cache
+        socketserver.UnixStreamServer.__init__(self, path, Handler)
+
+    def server_bind(self):
+        umask = os.umask(0o177)  # Socket is created with 0600 permissions
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+
+    def compile(self, source: str, range_symbol: str) -> tuple:
+        """Returns `(instructions, output)` of `pseudo.batch.compile_source`, cached."""
+        key = CompileCache.key(source, range_symbol)
+        try:
+            self.compiled.move_to_end(key)
+            return self.compiled[key]
+        except KeyError:
+            pass
+        compiled = self.compiled[key] = compile_source(source, range_symbol, self.cache)
+        if len(self.compiled) > MEMORY_CACHE_SIZE:
+            self.compiled.popitem(last=False)
+        return compiled
+
+    def run(self, request: dict) -> dict:
+        """Returns response to request, raises BadRequest if request is not valid."""
+        if not isinstance(request, dict) or not isinstance(request.get("source"), str):
+            raise BadRequest("Request has to be an object with 'source' string")
+        engine = request.get("engine", "tree")
+        if engine not in ENGINES:
+            raise BadRequest(f"Unknown engine {repr(engine)}")
+        timeout = request.get("timeout")
+        max_steps = request.get("max_steps")
+        if timeout is not None and not isinstance(timeout, (int, float)):
+            raise BadRequest("'timeout' has to be a number")
+        if max_steps is not None and not isinstance(max_steps, int):
+            raise BadRequest("'max_steps' has to be an int")
+
+        start = time.perf_counter()
+        instructions, output = self.compile(request["source"], request.get("range_symbol", "..."))
+        if instructions is None:
+            return {
+                "status": "compile-error",
+                "exit_code": 1,
+                "stdout": output,
+                "time": time.perf_counter() - start,
+            }
+        status, exit_code, stdout, elapsed = run_one(
+            instructions, str(request.get("stdin", "")), engine, timeout, max_steps
+        )
+        return {"status": status, "exit_code": exit_code, "stdout": stdout, "time": elapsed}
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class ForkingGradingServer(socketserver.ForkingMixIn, GradingServer):
+    """Server handling every connection in a forked process, so connections run in parallel."""
+
+
+def _terminate(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path: str, fork: bool = True, cache: CompileCache = None):
+    """
+    Run grading server until it is interrupted or terminated.
+
+    Args:
+        - path: str, Path of Unix socket.
+        - fork: bool, If true every connection is handled in separate process. It is
+            ignored where `os.fork` is not available.
+        - cache: pseudo.cache.CompileCache, On-disk cache of compiled programs.
+    """
+    if hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.signal(signal.SIGTERM, _terminate)
+    fork = fork and hasattr(os, "fork")
+    server = (ForkingGradingServer if fork else GradingServer)(path, cache)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
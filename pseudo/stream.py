@@ -2,95 +2,220 @@
 This module contains class of stream object used to iterate over input.
 """
 
-from typing import Union
+from typing import IO, Iterator, Optional, Union
 from sys import exit
 
+from pseudo.tokenizer import Token, tokenize_line
 from pseudo.type import EOL
 
 __author__ = "Patryk Niedźwiedziński"
 
 
+# Shared instance returned at the end of line, so peeking does not allocate new objects.
+END_OF_LINE = EOL()
+
+
 class Stream:
     """
     Stream is an object used to iterate over input. It is a little bit similar to queue.
+    Input can be a string or a file object, lines of file are read lazily. Every line is
+    tokenized once (see `pseudo.tokenizer`) when cursor moves to it.
 
     Attributes:
-        - input: List of lines of code.
+        - lines: List of lines of code which were read and not released.
+        - token_lines: List of tokens of lines in `lines`, None if line was not
+            tokenized yet.
+        - offset: Number of released lines before the first line in `lines`.
+        - source: Iterator of lines which were not read yet, None if all lines were read.
+        - current: Current line, it is updated whenever `line` changes.
+        - length: Length of current line.
+        - tokens: Tokens of current line.
+        - pos: Position of next token in `tokens`, it is updated whenever `col` changes.
         - line: Number of current line. Counting from 1
         - col: Number of current column. Counting from 1
     """
 
-    def __init__(self, input: str):
+    def __init__(self, input: Union[str, IO]):
         """
         Split input string to list of lines and initialize object.
 
         args:
-            - input - string with pseudocode
+            - input - string with pseudocode or file object to read it from
         """
-        self.input = input.split("\n")
-        self.input.append([""])
+        if isinstance(input, str):
+            self.lines = input.split("\n")
+            self.lines.append("")
+            self.source = None
+        else:
+            self.lines = []
+            self.source = read_lines(input)
+        self.token_lines = [None] * len(self.lines)
+        self.offset = 0
+        self._col = 0
         self.line = 1
         self.col = 0
 
+    @property
+    def line(self) -> int:
+        return self._line
+
+    @line.setter
+    def line(self, line: int):
+        self._line = line
+        current = self.get_line(line)
+        if current is None:
+            current = ""
+        self.current = current
+        self.length = len(current)
+        self.col = self._col
+
+    @property
+    def col(self) -> int:
+        return self._col
+
+    @col.setter
+    def col(self, col: int):
+        self._col = col
+        tokens = self.get_tokens(self._line)
+        pos = 0
+        while pos < len(tokens) and tokens[pos].col < col:
+            pos += 1
+        if pos and tokens[pos - 1].col + len(tokens[pos - 1].text) > col:
+            # Cursor is inside token, the rest of it is read as new token
+            pos -= 1
+            tokens = tokens[:pos] + tokenize_line(self.current, self.line, col)
+        self.tokens = tokens
+        self.pos = pos
+
+    def get_line(self, line: int) -> Optional[str]:
+        """
+        Returns line with given number or None if it does not exist or it was released.
+
+        args:
+            - line: Number of line. Counting from 1
+        """
+        i = line - 1 - self.offset
+        while i >= len(self.lines) and self.source is not None:
+            try:
+                self.lines.append(next(self.source))
+                self.token_lines.append(None)
+            except StopIteration:
+                self.source = None
+        if 0 <= i < len(self.lines):
+            return self.lines[i]
+        return None
+
+    def get_tokens(self, line: int) -> list:
+        """
+        Returns tokens of line, empty list if it does not exist or it was released.
+
+        args:
+            - line: Number of line. Counting from 1
+        """
+        i = line - 1 - self.offset
+        if not 0 <= i < len(self.lines):
+            return []
+        tokens = self.token_lines[i]
+        if tokens is None:
+            tokens = self.token_lines[i] = tokenize_line(self.lines[i], line)
+        return tokens
+
+    def release(self):
+        """Forget lines before current line, they will not be read again."""
+        size = self.line - 1 - self.offset
+        if size > 0:
+            del self.lines[:size]
+            del self.token_lines[:size]
+            self.offset += size
+
     def get_current_line(self):
         """Returns current line"""
-        return self.input[self.line - 1]
+        return self.current
 
     def next_line(self):
         """Move cursor to next line."""
+        # Tokens of the new line are looked up once, from the first column
+        self._col = 0
         self.line += 1
-        if self.line > len(self.input):
+        if self.get_line(self.line) is None:
             raise EndOfFile
-        self.col = 0
 
     def next(self) -> str:
         """Move cursor to next column and return char from this postion."""
+        col = self.col
         self.col += 1
-        try:
-            return self.input[self.line - 1][
-                self.col - 1
-            ]  # `-1` because list index starts at zero
-        except IndexError:
-            return EOL()
+        if -self.length <= col < self.length:
+            return self.current[col]
+        return END_OF_LINE
+
+    def token(self) -> Optional[Token]:
+        """
+        Returns next token, skipping white chars, without moving cursor. If there are no
+        more tokens in current line it returns None.
+        """
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def next_token(self) -> Optional[Token]:
+        """Move cursor after next token and return it, None if there are no tokens."""
+        pos = self.pos
+        if pos < len(self.tokens):
+            token = self.tokens[pos]
+            self.pos = pos + 1
+            self._col = token.col + len(token.text)
+            return token
+        if self._col < self.length:
+            self._col = self.length
+        return None
 
     def peek(self, size: int = 0) -> Union[str, EOL]:
         """
         Returns next char without moving cursor. If next char does not exists
-        it returns EOL instance.
+        it returns shared `END_OF_LINE` instance.
 
         args:
             - size: Size of shift, default `0`.
         """
-        try:
-            return self.input[self.line - 1][self.col + size]
-        except IndexError:
-            return EOL()
+        col = self.col + size
+        if -self.length <= col < self.length:
+            return self.current[col]
+        return END_OF_LINE
 
     def eol(self) -> bool:
         """Returns true if next char is end of line."""
-        if isinstance(self.peek(), EOL):
-            return True
-        return False
+        return self.col >= self.length
 
     def eof(self) -> bool:
         """Returns true if next line is end of file and next char is end of line."""
         if not self.eol():
             return False
-        if self.line == len(self.input) - 1:
-            return True
-        return False
+        return self.get_line(self.line + 1) is not None and self.get_line(self.line + 2) is None
 
     def throw(self, error: str):
         """Used to display error messages with line number. It stops the execution."""
         print(f"\n⚠️  Error on line {self.line}:")
         if "EOL" in error:
-            print(f"\t'{self.input[self.line-2]}'")
+            print(f"\t'{self.get_line(self.line - 1) or ''}'")
         else:
-            print(f"\t'{self.input[self.line-1]}'")
+            print(f"\t'{self.get_line(self.line) or ''}'")
         print(f"{error}")
         exit(1)
 
 
+def read_lines(fp: IO) -> Iterator[str]:
+    """
+    Yields lines of file without line breaks. Lines are split the same way as
+    `str.split("\\n")` does, followed by an empty line like in `Stream.__init__`.
+    """
+    last = "\n"
+    for last in fp:
+        yield last[:-1] if last.endswith("\n") else last
+    if last.endswith("\n"):
+        yield ""
+    yield ""
+
+
 class EndOfFile(Exception):
     """Exception indicating that parsing ends."""
 
@@ -0,0 +1,205 @@
+"""
+This module contains harness for property based testing of pseudocode functions. Program
+is compiled once, its functions are called directly with python values and results are
+compared with python oracle, without going through standard input and output.
+
+Usage::
+    >>> program = Program('''funkcja kwadrat(x)
+    ...     zwróć x * x
+    ... ''')
+    >>> program.call("kwadrat", 3)
+    9
+    >>> check(program, "kwadrat", lambda x: x * x, integers(), cases=10000)
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import random
+import string
+
+from pseudo import compile
+from pseudo.runtime import RunTime, MemoryObject, Array
+from pseudo.closure import compile_closure
+from pseudo.type.function import Function, FunctionDefinition, Pending
+
+
+class PseudoError(Exception):
+    """
+    This exception is raised when pseudocode error occurs during a call.
+
+    Attributes:
+        - message: str, Error message.
+        - line: str, Line in pseudocode.
+    """
+
+    def __init__(self, message, line: str = ""):
+        Exception.__init__(self, f"{message} (line: {repr(line)})")
+        self.message = message
+        self.line = line
+
+
+class HarnessRunTime(RunTime):
+    """
+    Runtime which raises errors instead of stopping the execution and collects output in
+    list instead of printing it.
+
+    Attributes:
+        - output: list, Values written by `pisz`.
+    """
+
+    def __init__(self, var: dict = None):
+        RunTime.__init__(self, var)
+        self.output = []
+
+    def stdout(self, value: object):
+        self.output.append("\n" if value == "\\n" else str(value))
+
+    def throw(self, error_message: str, line_causing_error: str = ""):
+        raise PseudoError(str(error_message), line_causing_error)
+
+    def crash(self):
+        raise  # Error is reported to caller of harness
+
+
+class Program:
+    """
+    Compiled program which functions can be called from python. Only function definitions
+    are evaluated, so statements outside of functions (i.e. `czytaj`) are not run.
+
+    Attributes:
+        - r: HarnessRunTime, Runtime reused by all calls.
+        - functions: dict, Defined functions by name.
+    """
+
+    def __init__(self, text_input: str, range_symbol: str = "...", engine: str = "tree"):
+        """
+        Args:
+            - text_input: str, Pseudocode.
+            - range_symbol: str, Range symbol in for loop.
+            - engine: str, `tree` or `closure`.
+        """
+        instructions = [
+            i
+            for i in compile(text_input, range_symbol)
+            if isinstance(i, FunctionDefinition)
+        ]
+        if engine == "closure":
+            instructions = compile_closure(instructions)
+
+        self.r = HarnessRunTime()
+        self.r.run(instructions)
+        self.functions = {
+            key: o.value for key, o in self.r.var.items() if isinstance(o.value, Function)
+        }
+        self.reset()
+
+    def reset(self):
+        """Restore state of runtime from before the first call."""
+        r = self.r
+        r.var = {key: MemoryObject(key, f) for key, f in self.functions.items()}
+        r.output.clear()
+
+    @property
+    def output(self) -> str:
+        """Returns output written since last reset."""
+        return "".join(self.r.output)
+
+    def call(self, name: str, *args):
+        """
+        Call function with python values as arguments. Lists are passed as arrays indexed
+        from 1. Returns value returned by function or None if it returns nothing.
+
+        Args:
+            - name: str, Name of function.
+            - args: Arguments of function.
+        """
+        try:
+            function = self.functions[name]
+        except KeyError:
+            raise PseudoError(f"Function {repr(name)} is not defined.") from None
+        if len(function.args) != len(args):
+            raise PseudoError(
+                f"Function {repr(name)} takes {len(function.args)} arguments, but {len(args)} were given.",
+                function.line,
+            )
+
+        r = self.r
+        scope_id = r.push_frame()
+        frame = r.frames[scope_id]
+        for param, value in zip(function.args, args):
+            frame[param.value] = to_memory(param.value, value)
+        try:
+            return_value = function.execute(r, scope_id)
+        finally:
+            r.pop_frame()
+        if type(return_value) is Pending:
+            return_value = return_value.function.call(r, return_value.args, return_value.line)
+        return None if return_value == "nil" else return_value
+
+
+def to_memory(key: str, value: object) -> MemoryObject:
+    """Returns memory object storing python value. Lists are converted to arrays."""
+    if not isinstance(value, list):
+        return MemoryObject(key, value)
+    array = Array(key)
+    for i, item in enumerate(value, 1):
+        if isinstance(item, list):
+            for j, element in enumerate(item, 1):
+                array.set_item((i, j), element)
+        else:
+            array.set_item((i,), item)
+    return array
+
+
+def check(
+    program: Program,
+    name: str,
+    oracle,
+    *generators,
+    cases: int = 1000,
+    seed: int = None,
+) -> int:
+    """
+    Call function with generated arguments and compare results with oracle. State of
+    runtime is reset before every case. Raises `AssertionError` with the first failing
+    case, otherwise returns number of checked cases.
+
+    Args:
+        - program: Program, Compiled program.
+        - name: str, Name of tested function.
+        - oracle: function, Python function returning expected result.
+        - generators: Functions taking `random.Random` and returning single argument.
+        - cases: int, Number of cases.
+        - seed: int, Seed of random generator.
+    """
+    rand = random.Random(seed)
+    for _ in range(cases):
+        args = tuple(generate(rand) for generate in generators)
+        program.reset()
+        expected = oracle(*args)
+        try:
+            result = program.call(name, *args)
+        except PseudoError as err:
+            raise AssertionError(f"{name}{args} raised error: {err}") from None
+        if result != expected:
+            raise AssertionError(f"{name}{args} returned {result!r}, expected {expected!r}")
+    return cases
+
+
+def integers(low: int = -1000, high: int = 1000):
+    """Returns generator of ints from given range."""
+    return lambda rand: rand.randint(low, high)
+
+
+def strings(alphabet: str = string.ascii_letters, max_size: int = 10):
+    """Returns generator of strings with given chars."""
+    return lambda rand: "".join(
+        rand.choice(alphabet) for _ in range(rand.randint(0, max_size))
+    )
+
+
+def arrays(element=None, min_size: int = 0, max_size: int = 10):
+    """Returns generator of lists, which are passed to pseudocode as arrays."""
+    if element is None:
+        element = integers()
+    return lambda rand: [element(rand) for _ in range(rand.randint(min_size, max_size))]
@@ -0,0 +1,55 @@
+"""
+This module contains tokenizer of pseudocode. Every line is split into tokens with
+single pass of one regex, `pseudo.stream.Stream` does it once for every line it reads
+and the lexer reads whole tokens from the stream instead of single chars.
+
+Usage::
+    >>> tokenize_line("x := T[1]+2", 1)
+    [Token(kind='name', text='x', line=1, col=0), Token(kind='operator', text=':=', ...
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+import re
+from collections import namedtuple
+
+
+Token = namedtuple("Token", ["kind", "text", "line", "col"])
+
+# Kinds of tokens
+NAME = "name"
+NUMBER = "number"
+STRING = "string"
+OPERATOR = "operator"
+PUNCTUATION = "punctuation"
+COMMENT = "comment"
+INVALID = "invalid"
+
+TOKEN = re.compile(
+    r"""[\ \t]*(?:
+    (?P<comment>\#.*)
+    |(?P<number>[0-9]+)
+    |(?P<string>["'][^"']*["']?)
+    |(?P<operator>:=|<-|[!<>]=|[+\-*:<>=!])
+    |(?P<punctuation>[()\[\],])
+    |(?P<name>[^+\-*:<>=!\ \t()\[\]{},]+)
+    |(?P<invalid>[^\ \t])
+    )""",
+    re.VERBOSE,
+)
+
+
+def tokenize_line(text: str, line: int, col: int = 0) -> list:
+    """
+    Returns list of tokens in line of pseudocode. White chars before every token are
+    matched together with it, so they do not produce tokens.
+
+    Args:
+        - text: str, Line without line break.
+        - line: int, Number of line. Counting from 1
+        - col: int, Column where tokenizing starts.
+    """
+    return [
+        Token(m.lastgroup, m.group(m.lastindex), line, m.start(m.lastindex))
+        for m in TOKEN.finditer(text, col)
+    ]
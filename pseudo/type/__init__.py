@@ -18,11 +18,16 @@ class Statement:
     Attributes:
         - value: Statement name.
         - args: Arguments of statement.
+        - line: Line in pseudocode.
+        - lineno: int, Number of the line, set by lexer.
     """
 
-    def __init__(self, value, args=None):
+    lineno = None
+
+    def __init__(self, value, args=None, line=""):
         self.value = value
         self.args = args
+        self.line = line
 
     def eval(self, r, scope_id=None):
         if self.value == "pisz":
@@ -30,6 +35,7 @@ class Statement:
         elif self.value == "czytaj":
             r.stdin(self.args.value)
         elif self.value == "koniec":
+            r.flush()
             exit()
 
     def __eq__(self, other):
@@ -8,8 +8,13 @@ class ASTNode:
     When pseudocode is being compiled interpreter builds Abstract Syntax Tree. It's a graph
     representing actual code. Every node has `eval` method which is called to get result of
     code.
+
+    Attributes:
+        - lineno: int, Number of line where statement starts, set by lexer for statements.
     """
 
+    lineno = None
+
     def eval(self, r, scope_id=None):
         """
         Args:
@@ -13,36 +13,6 @@ class Bool(Value):
             return "prawda"
         return "fałsz"
 
-    @staticmethod
-    def eval_operation(
-        operator: str, left: Value, right: Value, r, scope_id: str = None
-    ):
-        """
-        Eval bool operation.
-
-        Args:
-            - operator: str, bool operator
-            - left: Value
-            - right: Value
-        """
-
-        return_value = None
-
-        if operator == "=":
-            return_value = int(left.eval(r, scope_id) == right.eval(r, scope_id))
-        elif operator == "!=":
-            return_value = int(left.eval(r, scope_id) != right.eval(r, scope_id))
-        elif operator == ">":
-            return_value = int(left.eval(r, scope_id) > right.eval(r, scope_id))
-        elif operator == "<":
-            return_value = int(left.eval(r, scope_id) < right.eval(r, scope_id))
-        elif operator == "<=":
-            return_value = int(left.eval(r, scope_id) <= right.eval(r, scope_id))
-        elif operator == ">=":
-            return_value = int(left.eval(r, scope_id) >= right.eval(r, scope_id))
-
-        return return_value
-
     def __repr__(self):
         return f"Bool({self.value})"
 
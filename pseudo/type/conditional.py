@@ -3,7 +3,7 @@
 __author__ = "Patryk Niedźwiedziński"
 
 
-from pseudo.stream import EndOfFile
+from pseudo.exceptions import IndentationBlockEnd
 from pseudo.type.base import ASTNode
 
 
@@ -53,6 +53,7 @@ def read_if(lexer, indent_level: int = 0) -> Condition:
         - lexer: Lexer object used to apply lexing rules.
         - indent_level: int, Indicates level of indentation passed to children.
     """
+    from pseudo.stream import EndOfFile  # Stream is not needed to run cached programs
 
     condition = lexer.read_condition("jeżeli", indent_level=indent_level)
     line = lexer.i.get_current_line()
@@ -71,7 +72,7 @@ def read_if(lexer, indent_level: int = 0) -> Condition:
             false = lexer.read_indent_block(indent_level=indent_level + 1)
         else:
             lexer.i.col, lexer.i.line = c, l
-    except EndOfFile:
+    except (EndOfFile, IndentationBlockEnd):
         lexer.i.col, lexer.i.line = c, l
     return Condition(condition, true, false=false, line=line)
 
@@ -5,7 +5,8 @@ Functions are a way to use the same fragment of code multiple times.
 
 from pseudo.type.base import ASTNode, Value
 from pseudo.type.variable import Assignment
-from pseudo.type.exceptions import ReturnCall
+from pseudo.type.conditional import Condition
+from pseudo.type.loop import Loop
 
 
 class Function(Value):
@@ -34,33 +35,72 @@ class Function(Value):
         self.line = line
         self.void = void
 
-    def call(self, r, args: list, scope_id: str, calling_line: str):
+    def call(self, r, args: list, calling_line: str):
         """
-        Call function.
+        Call function and return value. If memoization is enabled in runtime, results of
+        pure functions are cached.
 
         Args:
             - r: pseudo.runtime.RunTime, Runtime in which function will be called.
-            - args: list, Arguments passed in function call.
-            - scope_id, str, Scope in which function's instructions will be evaluated.
+            - args: list, Evaluated arguments passed in function call.
             - calling_ling: str, Line in pseudocode.
         """
-        if len(self.args) != len(args):
-            r.throw(
-                f"Function {repr(self.name)} takes {len(self.args)} arguments, but {len(args)} were given.",
-                calling_line,
-            )
-        for key, value in zip(self.args, args):
-            r.save(key.value, value, scope_id=scope_id)
-        try:
-            r.run(self.instructions, scope_id)
-        except ReturnCall as ret:
+        memo = r.memo
+        if memo is not None and self.name in memo.pure:
+            return memo.call(self, r, args, calling_line)
+        return self.invoke(r, args, calling_line)
+
+    def invoke(self, r, args: list, calling_line: str):
+        """
+        Call function in new frame and return value. Tail calls returned by the function
+        (see `TailCall`) are executed in a loop after its frame is left, so they do not
+        grow the stack.
+
+        Args:
+            - r: pseudo.runtime.RunTime, Runtime in which function will be called.
+            - args: list, Evaluated arguments passed in function call.
+            - calling_ling: str, Line in pseudocode.
+        """
+        function = self
+        while True:
+            if r.limited:
+                r.step()
+            if len(function.args) != len(args):
+                r.throw(
+                    f"Function {repr(function.name)} takes {len(function.args)} arguments, but {len(args)} were given.",
+                    calling_line,
+                )
+            scope_id = r.push_frame([key.value for key in function.args], args)
+            try:
+                return_value = function.execute(r, scope_id)
+            finally:
+                r.pop_frame()
+            if type(return_value) is not Pending:
+                return "nil" if return_value is None else return_value
+            function, args, calling_line = return_value
+
+    def execute(self, r, scope_id: str):
+        """
+        Evaluate function's instructions in scope with already bound arguments and return
+        value.
+
+        Args:
+            - r: pseudo.runtime.RunTime, Runtime in which function will be called.
+            - scope_id, int, Frame in which function's instructions will be evaluated.
+        """
+        r.run(self.instructions, scope_id)
+        if r.returning:
+            r.returning = False
             if self.void:
                 r.throw(f"Procedure {repr(self.name)} can not return value.", self.line)
-            return ret.return_value
+            return r.return_value
 
     def eval(self, r, scope_id=None):
         return self
 
+    def __repr__(self):
+        return f"Function({repr(self.name)}, {repr(self.args)})"
+
 
 def read_function(lexer, indent_level: int = 0, void: bool = False):
     """
@@ -89,10 +129,34 @@ def read_function(lexer, indent_level: int = 0, void: bool = False):
     lexer.i.next_line()
 
     instructions = lexer.read_indent_block(indent_level + 1)
+    if not void:
+        mark_tail_calls(instructions)
 
     return FunctionDefinition(name, args, instructions, line, void)
 
 
+def mark_tail_calls(instructions: list):
+    """
+    Replace calls returned with `zwróć f(x)` by `TailCall` nodes in function's body,
+    including nested blocks.
+
+    Args:
+        - instructions: list, Instructions of function.
+    """
+
+    for i in instructions:
+        if isinstance(i, Return):
+            call = i.return_value
+            if type(call) is Call:
+                i.return_value = TailCall(call.function_name, call.args, call.line)
+        elif isinstance(i, Condition):
+            mark_tail_calls(i.true)
+            if i.false is not None:
+                mark_tail_calls(i.false)
+        elif isinstance(i, Loop):
+            mark_tail_calls(i.expressions)
+
+
 class FunctionDefinition(ASTNode):
     """
     Representation of function definition in AST.
@@ -153,10 +217,8 @@ class Call(Value):
         if function_exists:
             function = r.get(self.function_name)
             if isinstance(function, Function):
-                scope_id = r.register_scope(self.function_name)
-                return_value = function.call(r, self.args, scope_id, self.line)
-                r.remove_scope(scope_id)
-                return return_value or "nil"
+                args = [a.eval(r, scope_id) for a in self.args]
+                return function.call(r, args, self.line)
 
         r.throw(f"Function {repr(self.function_name)} is not defined.", self.line)
 
@@ -164,16 +226,63 @@ class Call(Value):
         return f"Call({repr(self.function_name)}, {repr(self.args)})"
 
 
+class TailCall(Call):
+    """
+    Representation of function call in tail position (`zwróć f(x)`). Instead of calling
+    the function it returns `Pending` call, which is executed by `Function.call` after
+    frame of current function is left.
+    """
+
+    def eval(self, r, scope_id=None):
+        if self.function_name in r.var:
+            function = r.get(self.function_name)
+            if isinstance(function, Function):
+                args = [a.eval(r, scope_id) for a in self.args]
+                return Pending(function, args, self.line)
+
+        r.throw(f"Function {repr(self.function_name)} is not defined.", self.line)
+
+    def __repr__(self):
+        return f"TailCall({repr(self.function_name)}, {repr(self.args)})"
+
+
+class Pending:
+    """
+    Function call to execute after current function returns.
+
+    Attributes:
+        - function: Function, Function to call.
+        - args: list, Evaluated arguments.
+        - line: str, Line in pseudocode.
+    """
+
+    __slots__ = ("function", "args", "line")
+
+    def __init__(self, function: Function, args: list, line: str = ""):
+        self.function = function
+        self.args = args
+        self.line = line
+
+    def __iter__(self):
+        return iter((self.function, self.args, self.line))
+
+
 class Return(ASTNode):
     """
     Representation of `return` call in AST.
 
     Attributes:
         - return_value: `pseudo.type.base.Value`, Value to return.
+        - line: str, Line in pseudocode.
     """
 
-    def __init__(self, return_value):
+    def __init__(self, return_value, line: str = ""):
         self.return_value = return_value
+        self.line = line
 
-    def eval(self, r, scope_id):
-        raise ReturnCall(self.return_value.eval(r, scope_id))
+    def eval(self, r, scope_id=None):
+        r.return_value = self.return_value.eval(r, scope_id)
+        r.returning = True
+
+    def __repr__(self):
+        return f"Return({repr(self.return_value)})"
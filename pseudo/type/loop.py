@@ -5,8 +5,8 @@ __author__ = "Patryk Niedźwiedziński"
 from pseudo.exceptions import RunTimeError
 from pseudo.runtime import MemoryObject
 from pseudo.type.base import Value, ASTNode
-from pseudo.type.variable import Variable, Assignment, Increment
-from pseudo.type.operation import Operation, Operator, read_operator
+from pseudo.type.variable import Variable
+from pseudo.type.operation import read_operator
 
 
 class Iterator(MemoryObject):
@@ -24,6 +24,25 @@ class Iterator(MemoryObject):
         self.value += 1
 
 
+def bind_iterator(r, key: str, value: int, scope_id: int = None) -> Iterator:
+    """
+    Store new iterator of for loop and returns it. Value of variable with the same name is
+    replaced, iterator of outer loop cannot be changed.
+
+    Args:
+        - r: RunTime, Runtime in which loop is run.
+        - key: str, Name of iterator.
+        - value: int, First value of iterator.
+        - scope_id: int, Frame of loop, iterator is global if variable is global.
+    """
+    memory = r.var if key in r.var or not scope_id else r.frames[scope_id]
+    o = memory.get(key)
+    if isinstance(o, Iterator):
+        o.setter(value, r)
+    o = memory[key] = Iterator(key, value)
+    return o
+
+
 class Loop(ASTNode):
     """
     Node for representing looped actions.
@@ -40,10 +59,15 @@ class Loop(ASTNode):
         self.line = line
 
     def eval(self, r, scope_id=None):
+        limited = r.limited
         while self.condition.eval(r, scope_id):
             r.run(self.expressions, scope_id)
+            if r.returning:
+                break
+            if limited:
+                r.step()
         if self.iterator is not None:
-            r.delete(self.iterator.value)
+            r.delete(self.iterator.value, scope_id)
 
     def __eq__(self, other):
         try:
@@ -55,7 +79,78 @@ class Loop(ASTNode):
         return f"Loop({self.condition}, {self.expressions})"
 
 
-def read_for(lexer, indent_level: int = 0) -> Loop:
+class ForRange(Loop):
+    """
+    Node for representing counted for loop. Bounds are evaluated once and the counter is
+    kept in python int, it is written to the iterator only if loop body can read it. The
+    iterator replaces variable with the same name (see `bind_iterator`).
+
+    Attributes:
+        - iterator: Variable, Iterator of loop.
+        - start: Expression evaluated to first value of iterator.
+        - end: Expression evaluated to last value of iterator.
+        - expressions: List of expressions to execute in every iteration.
+        - observed: bool, Defines if body can read the iterator.
+    """
+
+    def __init__(self, iterator, start, end, expressions, line=""):
+        self.iterator = iterator
+        self.start = start
+        self.end = end
+        self.expressions = expressions
+        self.observed = observes(expressions, iterator.value)
+        self.line = line
+
+    def eval(self, r, scope_id=None):
+        key = self.iterator.value
+        i = self.start.eval(r, scope_id)
+        o = bind_iterator(r, key, i, scope_id)
+        end = self.end.eval(r, scope_id)
+        if not isinstance(i, int) or not isinstance(end, int):
+            r.throw(f"Type error: cannot do '{repr(i)} <= {repr(end)}'", self.line)
+
+        observed = self.observed
+        expressions = self.expressions
+        limited = r.limited
+        while i <= end:
+            if observed:
+                o.value = i
+            r.run(expressions, scope_id)
+            if r.returning:
+                break
+            i += 1
+            if limited:
+                r.step()
+        r.delete(key, scope_id)
+
+    def __repr__(self):
+        return f"ForRange({self.iterator}, {self.start}, {self.end}, {self.expressions})"
+
+
+def observes(node, key: str) -> bool:
+    """
+    Checks if variable can be read in given node or list of nodes. Every function call is
+    assumed to read it, because function can read global variables.
+
+    Args:
+        - node: ASTNode or list, Checked instructions.
+        - key: str, Name of variable.
+    """
+
+    from pseudo.type.function import Call  # pseudo.type.function imports this module
+
+    if isinstance(node, list):
+        return any(observes(n, key) for n in node)
+    if isinstance(node, Variable) and node.value == key:
+        return True
+    if isinstance(node, Call):
+        return True
+    if isinstance(node, type) or not hasattr(node, "__dict__"):
+        return False
+    return any(observes(v, key) for v in vars(node).values())
+
+
+def read_for(lexer, indent_level: int = 0) -> ForRange:
     """
     This function reads and returns for loop statement. The for loop needs couple things:
         
@@ -85,17 +180,8 @@ def read_for(lexer, indent_level: int = 0) -> Loop:
 
     # Read instructions
     instructions = lexer.read_indent_block(indent_level + 1)
-    instructions.append(Increment(iterator.value))
-
-    return [
-        Assignment(iterator, start_value, Iterator, line=line),
-        Loop(
-            Operation(Operator("<="), iterator, end_value, line=""),
-            instructions,
-            iterator,
-            line,
-        ),
-    ]
+
+    return ForRange(iterator, start_value, end_value, instructions, line)
 
 
 def read_while(lexer, indent_level: int = 0) -> Loop:
@@ -2,6 +2,7 @@
 
 __author__ = "Patryk Niedźwiedziński"
 
+from pseudo.tokenizer import NUMBER
 from pseudo.type.base import Value
 
 
@@ -29,10 +30,7 @@ def is_digit(c) -> bool:
 
 def read_number(lexer) -> Int:
     """Read a number from the stream."""
-    number = lexer.read(is_digit)
-    try:
-        int(number)
-    except ValueError:
+    token = lexer.i.token()
+    if token is None or token.kind != NUMBER:
         return None
-    return Int(number)
-
+    return Int(lexer.i.next_token().text)
@@ -3,8 +3,9 @@
 __author__ = "Patryk Niedźwiedziński"
 
 
+import operator
+
 from pseudo.type.base import Value, ASTNode
-from pseudo.type.bool import Bool
 
 
 GROUP_1 = {"*", "div", "mod"}
@@ -13,6 +14,23 @@ GROUP_2 = {"-", "+"}
 OPERATORS = {"+", "-", "*", ":", "<", ">", "=", "!"}
 OPERATOR_KEYWORDS = {"div", "mod"}
 
+# Python callables implementing pseudocode operators. Comparisons return `int` like the
+# rest of pseudocode bools.
+OPERATIONS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "div": operator.floordiv,
+    "mod": operator.mod,
+    "=": lambda a, b: int(a == b),
+    "!=": lambda a, b: int(a != b),
+    ">": lambda a, b: int(a > b),
+    "<": lambda a, b: int(a < b),
+    "<=": lambda a, b: int(a <= b),
+    ">=": lambda a, b: int(a >= b),
+}
+
 
 class Operator(ASTNode):
     """Opartor class for representing mathematical operator."""
@@ -22,25 +40,11 @@ class Operator(ASTNode):
 
     def eval(self, left: Value, right: Value, r, scope_id: str = None, line=""):
         try:
-            return_value = None
-
-            if self.value == "+":
-                return_value = left.eval(r, scope_id) + right.eval(r, scope_id)
-            elif self.value == "-":
-                return_value = left.eval(r, scope_id) - right.eval(r, scope_id)
-            elif self.value == "*":
-                return_value = left.eval(r, scope_id) * right.eval(r, scope_id)
-            elif self.value == "/":
-                return_value = left.eval(r, scope_id) / right.eval(r, scope_id)
-            elif self.value == "div":
-                return_value = left.eval(r, scope_id) // right.eval(r, scope_id)
-            elif self.value == "mod":
-                return_value = left.eval(r, scope_id) % right.eval(r, scope_id)
-
-            # Then operation is boolean
-            return return_value or Bool.eval_operation(
-                self.value, left, right, r, scope_id
-            )
+            operation = OPERATIONS[self.value]
+        except KeyError:
+            r.throw(f"Unknown operator '{self.value}'", line)
+        try:
+            return operation(left.eval(r, scope_id), right.eval(r, scope_id))
         except TypeError:
             r.throw(
                 f"Type error: cannot do '{repr(left.eval(r, scope_id))} {self.value} {repr(right.eval(r, scope_id))}'",
@@ -94,20 +98,11 @@ def read_operator(stream):
     Args:
         - stream: Input stream
     """
-    c = stream.next()
-    is_assignment = (c == ":" and stream.peek() == "=") or (
-        c == "<" and stream.peek() == "-"
-    )
-
-    if is_assignment:  # :=, <-
-        stream.next()
+    token = stream.next_token()
+    operator = token.text if token is not None else ""
+    if operator == ":=" or operator == "<-":
         return ":="
-
-    is_comparison = stream.peek() == "=" and (c == "!" or c in "<>")
-    if is_comparison:  # !=, <= , >=
-        return Operator(c + stream.next())
-
-    return Operator(c)
+    return Operator(operator)
 
 
 class Operation(Value):
@@ -14,10 +14,8 @@ class String(Value):
 
 def read_string(lexer) -> String:
     """Read a string from the stream."""
-    lexer.i.next()
-    string = lexer.read(lambda c: c != '"' and c != "'")
-
-    if lexer.i.next() != '"' and lexer.i.next() != "'":
+    token = lexer.i.next_token()
+    text = token.text if token is not None else ""
+    if len(text) < 2 or text[-1] not in "\"'":
         lexer.i.throw(f"Could not parse string")
-    return String(string)
-
+    return String(text[1:-1])
@@ -20,9 +20,16 @@ class Variable(Value):
         self.indices = indices
 
     def eval(self, r, scope_id=None):
-        return r.get(self.key(r, scope_id), scope_id)
+        if self.indices:
+            return r.get_item(self.value, self.eval_indices(r, scope_id), scope_id)
+        return r.get(self.value, scope_id)
+
+    def eval_indices(self, r, scope_id=None) -> tuple:
+        """Returns tuple of evaluated indices."""
+        return tuple(i.eval(r, scope_id) for i in self.indices)
 
     def key(self, r, scope_id):
+        """Returns legacy key of variable, i.e. `T[1][2]`."""
         postfix = ""
         for i in self.indices:
             postfix += f"[{str(i.eval(r, scope_id))}]"
@@ -56,7 +63,7 @@ class Increment(ASTNode):
 
     def eval(self, r, scope_id=None):
         if scope_id:
-            return r.scopes[scope_id][self.key].incr()
+            return r.frames[scope_id][self.key].incr()
         r.var[self.key].incr()
 
 
@@ -78,8 +85,14 @@ class Assignment(ASTNode):
         self.line = line
 
     def eval(self, r, scope_id=None):
+        if self.target.indices:
+            indices = self.target.eval_indices(r, scope_id)
+            r.store_item(
+                self.target.value, indices, self.value.eval(r, scope_id), scope_id
+            )
+            return
         r.save(
-            self.target.key(r, scope_id),
+            self.target.value,
             self.value,
             object_class=self.object_class,
             scope_id=scope_id,
@@ -0,0 +1,16 @@
+"""
+Bytecode compiler and stack based virtual machine for pseudocode. Instead of walking AST,
+program is flattened to array of instructions and executed in single dispatch loop.
+
+Usage::
+    >>> from pseudo import compile
+    >>> from pseudo.vm import compile_bytecode, VirtualMachine
+    >>> code = compile_bytecode(compile("pisz 2+2"))
+    >>> VirtualMachine().run(code)
+    4
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from pseudo.vm.compiler import Code, compile_bytecode
+from pseudo.vm.machine import VirtualMachine
@@ -0,0 +1,381 @@
+"""
+This module contains bytecode compiler. It flattens AST returned by `pseudo.compile` into
+array of `(opcode, arg)` instructions executed by `pseudo.vm.machine.VirtualMachine`.
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from pseudo.runtime import MemoryObject
+from pseudo.type import Statement
+from pseudo.type.base import Value, EOL
+from pseudo.type.conditional import Condition
+from pseudo.type.function import Function, FunctionDefinition, Call, TailCall, Return
+from pseudo.type.loop import Loop, ForRange
+from pseudo.type.operation import Operation, OPERATIONS
+from pseudo.type.variable import Variable, Assignment, Increment
+from pseudo.vm.opcodes import (
+    NAMES,
+    LOAD_CONST,
+    LOAD_VAR,
+    LOAD_INDEXED,
+    STORE_VAR,
+    STORE_INDEXED,
+    BINARY_OP,
+    JUMP,
+    JUMP_IF_FALSE,
+    POP,
+    PRINT,
+    READ,
+    INCR,
+    DELETE,
+    MAKE_FUNCTION,
+    CALL,
+    RET,
+    THROW,
+    EXIT,
+    HALT,
+    LOAD_FAST,
+    STORE_FAST,
+    LOAD_GLOBAL,
+    STORE_GLOBAL,
+    INCR_FAST,
+    INCR_GLOBAL,
+    DELETE_FAST,
+    DELETE_GLOBAL,
+    INPUT,
+    LOAD_ITEM_FAST,
+    STORE_ITEM_FAST,
+    LOAD_ITEM_GLOBAL,
+    STORE_ITEM_GLOBAL,
+    TAIL_CALL,
+    LOAD_DYNAMIC,
+    STORE_DYNAMIC,
+    INCR_DYNAMIC,
+    DELETE_DYNAMIC,
+    LOAD_ITEM_DYNAMIC,
+    STORE_ITEM_DYNAMIC,
+    STORE_ITERATOR,
+    STORE_ITERATOR_FAST,
+    STORE_ITERATOR_GLOBAL,
+    STORE_ITERATOR_DYNAMIC,
+)
+from pseudo.vm.resolver import SymbolTable, resolve_globals, resolve_locals, end_key
+
+
+class Code:
+    """
+    Compiled block of instructions, either whole program or function body.
+
+    Attributes:
+        - name: str, Name of function or `<module>`.
+        - instructions: list, List of `(opcode, arg)` tuples.
+        - lines: list, Line in pseudocode for every instruction.
+        - globals: SymbolTable, Slots of global variables, None if variables are not
+            resolved.
+        - locals: SymbolTable, Slots of local variables of function.
+    """
+
+    def __init__(
+        self,
+        name: str = "<module>",
+        globals: SymbolTable = None,
+        locals: SymbolTable = None,
+    ):
+        self.name = name
+        self.instructions = []
+        self.lines = []
+        self.globals = globals
+        self.locals = locals
+
+    def emit(self, opcode: int, arg: object = None, line: str = "") -> int:
+        """Append instruction and return its position."""
+        self.instructions.append((opcode, arg))
+        self.lines.append(line)
+        return len(self.instructions) - 1
+
+    def patch(self, position: int, arg: object):
+        """Replace argument of instruction at given position, i.e. target of jump."""
+        self.instructions[position] = (self.instructions[position][0], arg)
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __repr__(self):
+        return f"Code({repr(self.name)}, {len(self)} instructions)"
+
+    def __str__(self):
+        return "\n".join(
+            f"{i:>4} {NAMES[opcode]:<14} {'' if arg is None else repr(arg)}"
+            for i, (opcode, arg) in enumerate(self.instructions)
+        )
+
+
+def compile_bytecode(instructions: list, resolve: bool = False) -> Code:
+    """
+    Compile list of instructions to `Code` object.
+
+    Args:
+        - instructions: list, Instructions returned by `pseudo.compile`.
+        - resolve: bool, If true non-indexed variables are stored in slots
+            (see `pseudo.vm.resolver`) instead of `pseudo.runtime.RunTime` memory.
+    """
+
+    code = Code(globals=resolve_globals(instructions) if resolve else None)
+    compile_block(code, instructions)
+    code.emit(HALT)
+    return code
+
+
+def compile_block(code: Code, instructions: list):
+    """Compile list of statements into code."""
+    for i in instructions:
+        compile_statement(code, i)
+
+
+def compile_statement(code: Code, node):
+    """Compile node which leaves the stack unchanged."""
+    if isinstance(node, EOL):
+        return
+    for node_type in type(node).__mro__:
+        compiler = STATEMENTS.get(node_type)
+        if compiler is not None:
+            return compiler(code, node)
+
+    # Expression used as statement, its value is discarded
+    compile_expression(code, node)
+    code.emit(POP, line=getattr(node, "line", ""))
+
+
+def compile_expression(code: Code, node):
+    """Compile node which pushes its value to the stack."""
+    for node_type in type(node).__mro__:
+        compiler = EXPRESSIONS.get(node_type)
+        if compiler is not None:
+            return compiler(code, node)
+    code.emit(THROW, f"Cannot evaluate {repr(node)}", getattr(node, "line", ""))
+
+
+FAST, GLOBAL, DYNAMIC = range(3)  # Kinds of slots
+
+_LOAD = {FAST: LOAD_FAST, GLOBAL: LOAD_GLOBAL, DYNAMIC: LOAD_DYNAMIC}
+_STORE = {FAST: STORE_FAST, GLOBAL: STORE_GLOBAL, DYNAMIC: STORE_DYNAMIC}
+_INCR = {FAST: INCR_FAST, GLOBAL: INCR_GLOBAL, DYNAMIC: INCR_DYNAMIC}
+_DELETE = {FAST: DELETE_FAST, GLOBAL: DELETE_GLOBAL, DYNAMIC: DELETE_DYNAMIC}
+_LOAD_ITEM = {FAST: LOAD_ITEM_FAST, GLOBAL: LOAD_ITEM_GLOBAL, DYNAMIC: LOAD_ITEM_DYNAMIC}
+_STORE_ITEM = {FAST: STORE_ITEM_FAST, GLOBAL: STORE_ITEM_GLOBAL, DYNAMIC: STORE_ITEM_DYNAMIC}
+_STORE_ITERATOR = {
+    FAST: STORE_ITERATOR_FAST,
+    GLOBAL: STORE_ITERATOR_GLOBAL,
+    DYNAMIC: STORE_ITERATOR_DYNAMIC,
+}
+
+
+def _slot(code: Code, name: str):
+    """
+    Returns `(kind, slot)` of variable or None if variables are not resolved. Slot of
+    dynamic variable is pair of local and global slot.
+    """
+    if code.globals is None:
+        return None
+    if code.locals is not None and name in code.locals:
+        if name in code.locals.dynamic:
+            return DYNAMIC, (code.locals.add(name), code.globals.add(name))
+        return FAST, code.locals.add(name)
+    return GLOBAL, code.globals.add(name)
+
+
+def _emit_load(code: Code, name: str, line: str = ""):
+    slot = _slot(code, name)
+    if slot is None:
+        code.emit(LOAD_VAR, name, line)
+    else:
+        code.emit(_LOAD[slot[0]], slot[1], line)
+
+
+def _emit_store(code: Code, name: str, object_class, line: str = ""):
+    slot = _slot(code, name)
+    if slot is None:
+        code.emit(STORE_VAR, (name, object_class), line)
+    else:
+        code.emit(_STORE[slot[0]], (slot[1], object_class), line)
+
+
+def _emit_store_iterator(code: Code, name: str, line: str = ""):
+    slot = _slot(code, name)
+    if slot is None:
+        code.emit(STORE_ITERATOR, name, line)
+    else:
+        code.emit(_STORE_ITERATOR[slot[0]], slot[1], line)
+
+
+def _emit_increment(code: Code, name: str, line: str = ""):
+    slot = _slot(code, name)
+    if slot is None:
+        code.emit(INCR, name, line)
+    else:
+        code.emit(_INCR[slot[0]], slot[1], line)
+
+
+def _emit_delete(code: Code, name: str, line: str = ""):
+    slot = _slot(code, name)
+    if slot is None:
+        code.emit(DELETE, name, line)
+    else:
+        code.emit(_DELETE[slot[0]], slot[1], line)
+
+
+def _compile_value(code: Code, node: Value):
+    code.emit(LOAD_CONST, node.value, node.line)
+
+
+def _compile_variable(code: Code, node: Variable):
+    if not node.indices:
+        _emit_load(code, node.value)
+        return
+    for i in node.indices:
+        compile_expression(code, i)
+    slot = _slot(code, node.value)
+    if slot is None:
+        code.emit(LOAD_INDEXED, (node.value, len(node.indices)))
+    else:
+        code.emit(_LOAD_ITEM[slot[0]], (slot[1], len(node.indices)))
+
+
+def _compile_operation(code: Code, node: Operation):
+    symbol = node.operator.value
+    if symbol not in OPERATIONS:
+        code.emit(THROW, f"Unknown operator '{symbol}'", node.line)
+        return
+    compile_expression(code, node.left)
+    compile_expression(code, node.right)
+    code.emit(BINARY_OP, (OPERATIONS[symbol], symbol), node.line)
+
+
+def _compile_call(code: Code, node: Call):
+    _emit_load(code, node.function_name, node.line)
+    for a in node.args:
+        compile_expression(code, a)
+    code.emit(CALL, (node.function_name, len(node.args)), node.line)
+
+
+def _compile_statement(code: Code, node: Statement):
+    if node.value == "pisz":
+        compile_expression(code, node.args)
+        code.emit(PRINT)
+    elif node.value == "czytaj":
+        if code.globals is None:
+            code.emit(READ, node.args.value)
+        else:
+            code.emit(INPUT, node.args.value)
+            code.emit(STORE_GLOBAL, (code.globals.add(node.args.value), MemoryObject))
+    elif node.value == "koniec":
+        code.emit(EXIT)
+
+
+def _compile_assignment(code: Code, node: Assignment):
+    target = node.target
+    for i in target.indices:
+        compile_expression(code, i)
+    compile_expression(code, node.value)
+    if target.indices:
+        slot = _slot(code, target.value)
+        if slot is None:
+            code.emit(STORE_INDEXED, (target.value, len(target.indices)), node.line)
+        else:
+            code.emit(_STORE_ITEM[slot[0]], (slot[1], len(target.indices)), node.line)
+    else:
+        _emit_store(code, target.value, node.object_class, node.line)
+
+
+def _compile_increment(code: Code, node: Increment):
+    _emit_increment(code, node.key, node.line)
+
+
+def _compile_condition(code: Code, node: Condition):
+    compile_expression(code, node.condition)
+    jump_to_false = code.emit(JUMP_IF_FALSE, line=node.line)
+    compile_block(code, node.true)
+    if node.false is None:
+        code.patch(jump_to_false, len(code))
+        return
+    jump_to_end = code.emit(JUMP)
+    code.patch(jump_to_false, len(code))
+    compile_block(code, node.false)
+    code.patch(jump_to_end, len(code))
+
+
+def _compile_loop(code: Code, node: Loop):
+    start = len(code)
+    compile_expression(code, node.condition)
+    jump_to_end = code.emit(JUMP_IF_FALSE, line=node.line)
+    compile_block(code, node.expressions)
+    code.emit(JUMP, start, node.line)
+    code.patch(jump_to_end, len(code))
+    if node.iterator is not None:
+        _emit_delete(code, node.iterator.value, node.line)
+
+
+def _compile_for_range(code: Code, node: ForRange):
+    key = node.iterator.value
+    compile_expression(code, node.start)
+    _emit_store_iterator(code, key, node.line)
+    compile_expression(code, node.end)
+    _emit_store(code, end_key(node), MemoryObject, node.line)
+
+    start = len(code)
+    _emit_load(code, key)
+    _emit_load(code, end_key(node))
+    code.emit(BINARY_OP, (OPERATIONS["<="], "<="), node.line)
+    jump_to_end = code.emit(JUMP_IF_FALSE, line=node.line)
+    compile_block(code, node.expressions)
+    _emit_increment(code, key, node.line)
+    code.emit(JUMP, start, node.line)
+    code.patch(jump_to_end, len(code))
+    _emit_delete(code, key, node.line)
+    _emit_delete(code, end_key(node), node.line)
+
+
+def _compile_function_definition(code: Code, node: FunctionDefinition):
+    body = Code(
+        node.function_name,
+        code.globals,
+        resolve_locals(node, code.globals) if code.globals is not None else None,
+    )
+    compile_block(body, node.instructions)
+    body.emit(LOAD_CONST, None)
+    body.emit(RET, False)
+
+    function = Function(node.function_name, node.args, body, node.line, node.void)
+    code.emit(MAKE_FUNCTION, function, node.line)
+    _emit_store(code, node.function_name, MemoryObject, node.line)
+
+
+def _compile_return(code: Code, node: Return):
+    call = node.return_value
+    if isinstance(call, TailCall):
+        _emit_load(code, call.function_name, call.line)
+        for a in call.args:
+            compile_expression(code, a)
+        code.emit(TAIL_CALL, (call.function_name, len(call.args)), call.line)
+        return
+    compile_expression(code, call)
+    code.emit(RET, True, getattr(node, "line", ""))
+
+
+EXPRESSIONS = {
+    Value: _compile_value,
+    Variable: _compile_variable,
+    Operation: _compile_operation,
+    Call: _compile_call,
+}
+
+STATEMENTS = {
+    Statement: _compile_statement,
+    Assignment: _compile_assignment,
+    Increment: _compile_increment,
+    Condition: _compile_condition,
+    Loop: _compile_loop,
+    ForRange: _compile_for_range,
+    FunctionDefinition: _compile_function_definition,
+    Return: _compile_return,
+}
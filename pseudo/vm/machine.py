@@ -0,0 +1,355 @@
+"""
+This module contains stack based virtual machine executing `pseudo.vm.compiler.Code`.
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from sys import exit
+
+from pseudo.exceptions import RunTimeError
+from pseudo.runtime import RunTime, MemoryObject, Array, split_key
+from pseudo.type.function import Function
+from pseudo.type.loop import Iterator, bind_iterator
+from pseudo.vm.compiler import Code
+from pseudo.vm.opcodes import (
+    LOAD_CONST,
+    LOAD_VAR,
+    LOAD_INDEXED,
+    STORE_VAR,
+    STORE_INDEXED,
+    BINARY_OP,
+    JUMP,
+    JUMP_IF_FALSE,
+    POP,
+    PRINT,
+    READ,
+    INCR,
+    DELETE,
+    MAKE_FUNCTION,
+    CALL,
+    TAIL_CALL,
+    RET,
+    THROW,
+    EXIT,
+    HALT,
+    LOAD_FAST,
+    STORE_FAST,
+    LOAD_GLOBAL,
+    STORE_GLOBAL,
+    INCR_FAST,
+    INCR_GLOBAL,
+    DELETE_FAST,
+    DELETE_GLOBAL,
+    INPUT,
+    LOAD_ITEM_FAST,
+    STORE_ITEM_FAST,
+    LOAD_ITEM_GLOBAL,
+    STORE_ITEM_GLOBAL,
+    LOAD_DYNAMIC,
+    STORE_DYNAMIC,
+    INCR_DYNAMIC,
+    DELETE_DYNAMIC,
+    LOAD_ITEM_DYNAMIC,
+    STORE_ITEM_DYNAMIC,
+    STORE_ITERATOR,
+    STORE_ITERATOR_FAST,
+    STORE_ITERATOR_GLOBAL,
+    STORE_ITERATOR_DYNAMIC,
+)
+
+
+def _store(slots: list, slot: int, key: str, value: object, object_class, r):
+    o = slots[slot]
+    if o is None:
+        slots[slot] = object_class(key, value)
+    else:
+        o.setter(value, r)
+
+
+def _store_iterator(slots: list, slot: int, key: str, value: int, r):
+    o = slots[slot]
+    if isinstance(o, Iterator):
+        o.setter(value, r)
+    slots[slot] = Iterator(key, value)
+
+
+class VirtualMachine:
+    """
+    Virtual machine executing flat array of instructions in single dispatch loop. Memory,
+    input and output are provided by `pseudo.runtime.RunTime`.
+
+    Attributes:
+        - r: RunTime, Runtime in which code is executed.
+        - globals: list, Slots of global variables if code was compiled with
+            `resolve=True`. Every slot contains `pseudo.runtime.MemoryObject` or None.
+        - names: list, Names of global slots.
+
+    Usage::
+        >>> code = compile_bytecode(compile("pisz 2+2"))
+        >>> VirtualMachine().run(code)
+        4
+    """
+
+    def __init__(self, r: RunTime = None):
+        self.r = r if r is not None else RunTime()
+        self.globals = []
+        self.names = []
+
+    def get(self, key: str):
+        """Returns value of global variable, from slot or runtime memory."""
+        name, indices = split_key(key) if "[" in key else (key, None)
+        if name not in self.names:
+            return self.r.get(key)
+        o = self.globals[self.names.index(name)]
+        if indices is None:
+            return "nil" if o is None else o.value
+        return o.get_item(indices) if isinstance(o, Array) else "nil"
+
+    def run(self, code: Code):
+        """Execute code until `HALT` instruction."""
+        r = self.r
+        if r.gc_policy is not None and not r.gc_policy.active:
+            with r.gc_policy:
+                return self.run(code)
+        limited = r.limited
+        if limited:
+            r.reset_limits()
+        if code.globals is not None:
+            self.names = code.globals.names
+            self.globals = [None] * len(self.names)
+        names = self.names
+        globals = self.globals
+        fast = None
+        local_names = None
+        stack = []
+        frames = []
+        function = None
+        scope_id = None
+        instructions = code.instructions
+        pc = 0
+
+        try:
+            while True:
+                opcode, arg = instructions[pc]
+                pc += 1
+
+                if opcode == LOAD_FAST:
+                    o = fast[arg]
+                    stack.append("nil" if o is None else o.value)
+                elif opcode == LOAD_GLOBAL:
+                    o = globals[arg]
+                    stack.append("nil" if o is None else o.value)
+                elif opcode == LOAD_VAR:
+                    stack.append(r.get(arg, scope_id))
+                elif opcode == LOAD_CONST:
+                    stack.append(arg)
+                elif opcode == BINARY_OP:
+                    right = stack.pop()
+                    left = stack[-1]
+                    try:
+                        stack[-1] = arg[0](left, right)
+                    except TypeError:
+                        r.throw(
+                            f"Type error: cannot do '{repr(left)} {arg[1]} {repr(right)}'",
+                            code.lines[pc - 1],
+                        )
+                elif opcode == JUMP_IF_FALSE:
+                    b = stack.pop()
+                    if not b or b == "nil":
+                        pc = arg
+                elif opcode == JUMP:
+                    if limited and arg < pc:  # Back-edge of loop
+                        r.step()
+                    pc = arg
+                elif opcode == STORE_FAST:
+                    o = fast[arg[0]]
+                    if o is None or o.const:
+                        _store(fast, arg[0], local_names[arg[0]], stack.pop(), arg[1], r)
+                    else:
+                        o.value = stack.pop()
+                elif opcode == STORE_GLOBAL:
+                    o = globals[arg[0]]
+                    if o is None or o.const:
+                        _store(globals, arg[0], names[arg[0]], stack.pop(), arg[1], r)
+                    else:
+                        o.value = stack.pop()
+                elif opcode == STORE_VAR:
+                    r.store(arg[0], stack.pop(), arg[1], scope_id)
+                elif opcode == INCR_FAST:
+                    fast[arg].incr()
+                elif opcode == INCR_GLOBAL:
+                    globals[arg].incr()
+                elif opcode == INCR:
+                    if arg in r.var or not scope_id:  # Iterator is global like in store
+                        r.var[arg].incr()
+                    else:
+                        r.frames[scope_id][arg].incr()
+                elif opcode == LOAD_ITEM_FAST or opcode == LOAD_ITEM_GLOBAL:
+                    slot, n = arg
+                    o = (fast if opcode == LOAD_ITEM_FAST else globals)[slot]
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    if isinstance(o, Array):
+                        stack.append(o.get_item(indices))
+                    else:
+                        stack.append("nil")
+                elif opcode == STORE_ITEM_FAST or opcode == STORE_ITEM_GLOBAL:
+                    slot, n = arg
+                    slots = fast if opcode == STORE_ITEM_FAST else globals
+                    o = slots[slot]
+                    value = stack.pop()
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    if not isinstance(o, Array):
+                        key = (local_names if slots is fast else names)[slot]
+                        o = slots[slot] = Array.of(o, key)
+                    o.set_item(indices, value)
+                elif opcode == LOAD_INDEXED:
+                    name, n = arg
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    stack.append(r.get_item(name, indices, scope_id))
+                elif opcode == STORE_INDEXED:
+                    value = stack.pop()
+                    name, n = arg
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    r.store_item(name, indices, value, scope_id)
+                elif opcode == CALL or opcode == TAIL_CALL:
+                    if limited:
+                        r.step()
+                    name, n = arg
+                    callee = stack[-n - 1]
+                    if not isinstance(callee, Function):
+                        r.throw(
+                            f"Function {repr(name)} is not defined.", code.lines[pc - 1]
+                        )
+                    if len(callee.args) != n:
+                        r.throw(
+                            f"Function {repr(name)} takes {len(callee.args)} arguments, but {n} were given.",
+                            code.lines[pc - 1],
+                        )
+                    if opcode == TAIL_CALL:
+                        if scope_id is not None:
+                            r.pop_frame()  # Frame of callee takes its place
+                    elif len(frames) >= r.max_depth:
+                        r.throw(
+                            f"Maximum recursion depth exceeded ({r.max_depth})",
+                            code.lines[pc - 1],
+                        )
+                    else:
+                        frames.append((code, pc, scope_id, function, fast))
+                    values = stack[len(stack) - n :]
+                    del stack[len(stack) - n - 1 :]
+                    function = callee
+                    code = callee.instructions
+                    instructions = code.instructions
+                    pc = 0
+                    if code.locals is not None:
+                        local_names = code.locals.names
+                        fast = [None] * len(local_names)
+                        for i, value in enumerate(values):
+                            fast[i] = MemoryObject(local_names[i], value)
+                    else:
+                        scope_id = r.push_frame([key.value for key in callee.args], values)
+                elif opcode == RET:
+                    if not frames:
+                        r.throw("'zwróć' used outside of function", code.lines[pc - 1])
+                    if arg and function.void:
+                        r.throw(
+                            f"Procedure {repr(function.name)} can not return value.",
+                            function.line,
+                        )
+                    if stack[-1] is None:
+                        stack[-1] = "nil"
+                    if scope_id is not None:
+                        r.pop_frame()
+                    code, pc, scope_id, function, fast = frames.pop()
+                    instructions = code.instructions
+                    if fast is not None:
+                        local_names = code.locals.names
+                elif opcode == PRINT:
+                    r.stdout(stack.pop())
+                elif opcode == POP:
+                    stack.pop()
+                elif opcode == READ:
+                    r.stdin(arg)
+                elif opcode == INPUT:
+                    stack.append(r.read(arg))
+                elif opcode == DELETE_FAST:
+                    fast[arg] = None
+                elif opcode == DELETE_GLOBAL:
+                    globals[arg] = None
+                elif opcode == DELETE:
+                    r.delete(arg, scope_id)
+                elif opcode == MAKE_FUNCTION:
+                    stack.append(arg)
+                elif opcode == THROW:
+                    r.throw(arg, code.lines[pc - 1])
+                elif opcode == EXIT:
+                    r.flush()
+                    exit()
+                elif opcode == HALT:
+                    break
+                # Dynamic variables behave like variables in `RunTime`: value is stored
+                # to global slot if it is set, local slot is read first.
+                elif opcode == LOAD_DYNAMIC:
+                    o = fast[arg[0]]
+                    if o is None:
+                        o = globals[arg[1]]
+                    stack.append("nil" if o is None else o.value)
+                elif opcode == STORE_DYNAMIC:
+                    (local, slot), object_class = arg
+                    if globals[slot] is not None:
+                        _store(globals, slot, names[slot], stack.pop(), object_class, r)
+                    else:
+                        _store(fast, local, local_names[local], stack.pop(), object_class, r)
+                elif opcode == INCR_DYNAMIC:
+                    o = globals[arg[1]]
+                    (fast[arg[0]] if o is None else o).incr()
+                elif opcode == DELETE_DYNAMIC:
+                    if fast[arg[0]] is not None:
+                        fast[arg[0]] = None
+                    else:
+                        globals[arg[1]] = None
+                elif opcode == LOAD_ITEM_DYNAMIC:
+                    (local, slot), n = arg
+                    o = fast[local]
+                    if o is None:
+                        o = globals[slot]
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    stack.append(o.get_item(indices) if isinstance(o, Array) else "nil")
+                elif opcode == STORE_ITEM_DYNAMIC:
+                    (local, slot), n = arg
+                    if globals[slot] is not None:
+                        slots, key = globals, names[slot]
+                    else:
+                        slots, key, slot = fast, local_names[local], local
+                    o = slots[slot]
+                    value = stack.pop()
+                    indices = tuple(stack[-n:])
+                    del stack[-n:]
+                    if not isinstance(o, Array):
+                        o = slots[slot] = Array.of(o, key)
+                    o.set_item(indices, value)
+                elif opcode == STORE_ITERATOR_FAST:
+                    _store_iterator(fast, arg, local_names[arg], stack.pop(), r)
+                elif opcode == STORE_ITERATOR_GLOBAL:
+                    _store_iterator(globals, arg, names[arg], stack.pop(), r)
+                elif opcode == STORE_ITERATOR_DYNAMIC:
+                    local, slot = arg
+                    if globals[slot] is not None:
+                        _store_iterator(globals, slot, names[slot], stack.pop(), r)
+                    else:
+                        _store_iterator(fast, local, local_names[local], stack.pop(), r)
+                elif opcode == STORE_ITERATOR:
+                    bind_iterator(r, arg, stack.pop(), scope_id)
+        except RunTimeError as err:
+            r.throw(err, code.lines[pc - 1])
+        except SystemExit:
+            raise
+        except Exception:
+            r.crash()
+        finally:
+            r.flush()
@@ -0,0 +1,57 @@
+"""This module contains opcodes of pseudocode virtual machine."""
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+LOAD_CONST = 0  # arg: value
+LOAD_VAR = 1  # arg: key
+LOAD_INDEXED = 2  # arg: (name, number of indices)
+STORE_VAR = 3  # arg: (key, object_class)
+STORE_INDEXED = 4  # arg: (name, number of indices)
+BINARY_OP = 5  # arg: (function, symbol)
+JUMP = 6  # arg: target
+JUMP_IF_FALSE = 7  # arg: target
+POP = 8
+PRINT = 9
+READ = 10  # arg: key
+INCR = 11  # arg: key
+DELETE = 12  # arg: key
+MAKE_FUNCTION = 13  # arg: pseudo.type.function.Function
+CALL = 14  # arg: (name, number of arguments), function is below arguments on stack
+RET = 15  # arg: bool, True if value was returned explicitly with `zwróć`
+THROW = 16  # arg: error message
+EXIT = 17
+HALT = 18
+LOAD_FAST = 19  # arg: local slot
+STORE_FAST = 20  # arg: (local slot, object_class)
+LOAD_GLOBAL = 21  # arg: global slot
+STORE_GLOBAL = 22  # arg: (global slot, object_class)
+INCR_FAST = 23  # arg: local slot
+INCR_GLOBAL = 24  # arg: global slot
+DELETE_FAST = 25  # arg: local slot
+DELETE_GLOBAL = 26  # arg: global slot
+INPUT = 27  # arg: key
+LOAD_ITEM_FAST = 28  # arg: (local slot, number of indices)
+STORE_ITEM_FAST = 29  # arg: (local slot, number of indices)
+LOAD_ITEM_GLOBAL = 30  # arg: (global slot, number of indices)
+STORE_ITEM_GLOBAL = 31  # arg: (global slot, number of indices)
+TAIL_CALL = 32  # arg: (name, number of arguments), like CALL but replaces current frame
+# Dynamic variables have local and global slot, see `pseudo.vm.resolver`
+LOAD_DYNAMIC = 33  # arg: (local slot, global slot)
+STORE_DYNAMIC = 34  # arg: ((local slot, global slot), object_class)
+INCR_DYNAMIC = 35  # arg: (local slot, global slot)
+DELETE_DYNAMIC = 36  # arg: (local slot, global slot)
+LOAD_ITEM_DYNAMIC = 37  # arg: ((local slot, global slot), number of indices)
+STORE_ITEM_DYNAMIC = 38  # arg: ((local slot, global slot), number of indices)
+# Iterator of for loop replaces variable with the same name, see `pseudo.type.loop`
+STORE_ITERATOR = 39  # arg: key
+STORE_ITERATOR_FAST = 40  # arg: local slot
+STORE_ITERATOR_GLOBAL = 41  # arg: global slot
+STORE_ITERATOR_DYNAMIC = 42  # arg: (local slot, global slot)
+
+
+NAMES = {
+    value: name
+    for name, value in dict(globals()).items()
+    if name.isupper() and isinstance(value, int)
+}
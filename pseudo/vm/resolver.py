@@ -0,0 +1,135 @@
+"""
+This module contains resolver pass, which assigns fixed slot index to every variable.
+Slots are resolved per scope: one table for globals and one for locals of every function.
+Array `T` takes one slot holding `pseudo.runtime.Array`. Counted for loop stores its end
+value in hidden variable (see `end_key`), so it is evaluated only once.
+
+Names assigned at top level of the program (also inside loops and conditions), functions
+and variables read with `czytaj` are global. Inside function, arguments, assigned names and
+iterators are local, all remaining names refer to globals. Tree engine stores assigned
+value to global variable if it exists at the time of assignment, so local names which are
+also global are dynamic: they have both slots and the VM chooses one of them at runtime
+like `pseudo.runtime.RunTime` does.
+"""
+
+__author__ = "Patryk Niedźwiedziński"
+
+from pseudo.type import Statement
+from pseudo.type.conditional import Condition
+from pseudo.type.function import FunctionDefinition
+from pseudo.type.loop import Loop, ForRange
+from pseudo.type.variable import Assignment
+
+
+class SymbolTable:
+    """
+    Mapping of variable names to slot indices.
+
+    Attributes:
+        - names: list, Names of variables, index in list is index of slot.
+        - dynamic: set, Names of local variables, which are also global.
+    """
+
+    def __init__(self, names: list = None):
+        self.names = []
+        self.slots = {}
+        self.dynamic = set()
+        for name in names or []:
+            self.add(name)
+
+    def add(self, name: str) -> int:
+        """Return slot of variable, new slot is created if needed."""
+        try:
+            return self.slots[name]
+        except KeyError:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+            return self.slots[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.slots
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"SymbolTable({repr(self.names)})"
+
+
+def _blocks(node) -> list:
+    """Returns nested blocks of instructions, which are evaluated in the same scope."""
+    if isinstance(node, Condition):
+        return [node.true, node.false or []]
+    if isinstance(node, Loop):
+        return [node.expressions]
+    return []
+
+
+def end_key(node: ForRange) -> str:
+    """Returns name of hidden variable holding end value of for loop."""
+    return f"{node.iterator.value}:end"  # ':' is not allowed in names of variables
+
+
+def _walk(instructions: list):
+    """Yields nodes in given block and nested blocks, except bodies of functions."""
+    for node in instructions:
+        yield node
+        for block in _blocks(node):
+            yield from _walk(block)
+
+
+def _functions(instructions: list):
+    """Yields all function definitions, including nested ones."""
+    for node in _walk(instructions):
+        if isinstance(node, FunctionDefinition):
+            yield node
+            yield from _functions(node.instructions)
+
+
+def resolve_globals(instructions: list) -> SymbolTable:
+    """
+    Returns table of global variables assigned in program.
+
+    Args:
+        - instructions: list, Instructions returned by `pseudo.compile`.
+    """
+
+    table = SymbolTable()
+    for node in _walk(instructions):
+        if isinstance(node, Assignment):
+            table.add(node.target.value)
+        elif isinstance(node, ForRange):
+            table.add(node.iterator.value)
+            table.add(end_key(node))
+        elif isinstance(node, Statement) and node.value == "czytaj":
+            table.add(node.args.value)
+    for function in _functions(instructions):
+        table.add(function.function_name)
+        for node in _walk(function.instructions):
+            if isinstance(node, Statement) and node.value == "czytaj":
+                table.add(node.args.value)
+    return table
+
+
+def resolve_locals(function: FunctionDefinition, globals: SymbolTable) -> SymbolTable:
+    """
+    Returns table of local variables of function. Arguments always take first slots.
+
+    Args:
+        - function: FunctionDefinition, Function to resolve.
+        - globals: SymbolTable, Table returned by `resolve_globals`.
+    """
+
+    table = SymbolTable([a.value for a in function.args])
+    for node in _walk(function.instructions):
+        if isinstance(node, Assignment):
+            name = node.target.value
+        elif isinstance(node, ForRange):
+            name = node.iterator.value
+            table.add(end_key(node))  # Hidden variable is never global
+        else:
+            continue
+        table.add(name)
+        if name in globals:
+            table.dynamic.add(name)
+    return table
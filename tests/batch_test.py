@@ -0,0 +1,124 @@
+"""This module contains tests for `pseudo.batch`"""
+
+import gc
+import io
+import json
+import os
+import time
+import types
+
+import pytest
+
+from pseudo import batch, compile
+from pseudo.batch import Result, run_batch, run_forked, read_inputs, write_report
+from pseudo.type.loop import Loop
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.timeout(10)
+def test_run_batch(tmp_path, test):
+    ok = write(tmp_path / "ok.pdc", "czytaj a\npisz a * 2\n")
+    error = write(tmp_path / "error.pdc", "pisz 1\npisz 1 + \"a\"\n")
+    loop = write(tmp_path / "loop.pdc", "dopóki prawda wykonuj\n    a := 1\n")
+    inputs = [("1", "2\n"), ("2", "21\n")]
+
+    results = run_batch([ok, error, loop], inputs, timeout=0.3, workers=2)
+
+    test([r.status for r in results], ["ok", "ok", "error", "error", "timeout", "timeout"])
+    test(results[0].stdout, "4")
+    test(results[1].stdout, "42")
+    test(results[2].exit_code, 1)
+    test(results[2].input, "1")
+
+
+def stuck_run_one(instructions, text_input, engine, timeout, max_steps=None):
+    """`run_one` which never ends in loops, as if single operation took too long."""
+    if any(isinstance(instruction, Loop) for instruction in instructions):
+        time.sleep(60)
+    return "ok", 0, "", 0.0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="workers must inherit patched module")
+@pytest.mark.timeout(10)
+def test_run_batch_without_timer(tmp_path, test, monkeypatch):
+    ok = write(tmp_path / "ok.pdc", "pisz 1\n")
+    loop = write(tmp_path / "loop.pdc", "dopóki prawda wykonuj\n    a := 1\n")
+    monkeypatch.setattr(batch, "signal", types.SimpleNamespace())  # No setitimer
+    monkeypatch.setattr(batch, "run_one", stuck_run_one)
+
+    results = run_batch([loop, ok, loop], timeout=0.3, workers=2)
+
+    test([r.status for r in results], ["timeout", "ok", "timeout"])
+
+
+@pytest.mark.timeout(10)
+def test_step_limit(tmp_path, test):
+    loop = write(tmp_path / "loop.pdc", "dopóki prawda wykonuj\n    a := 1\n")
+
+    results = run_batch([loop], max_steps=1000, workers=1)
+
+    test((results[0].status, results[0].exit_code), ("step-limit", None))
+
+
+@pytest.mark.timeout(10)
+def test_compile_error(tmp_path, test):
+    broken = write(tmp_path / "broken.pdc", "pisz )\n")
+
+    results = run_batch([broken])
+
+    test(len(results), 1)
+    test(results[0].status, "compile-error")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available")
+@pytest.mark.timeout(10)
+def test_run_forked(test):
+    instructions = compile(
+        "czytaj a\njeżeli a = 0 to\n    dopóki prawda wykonuj\n        a := 1\npisz 42 div a\n"
+    )
+    inputs = [(str(i), f"{i}\n") for i in range(-1, 4)]
+
+    results = run_forked(instructions, inputs, "a.pdc", timeout=0.3, workers=2)
+
+    test([r.input for r in results], ["-1", "0", "1", "2", "3"])
+    test([r.status for r in results], ["ok", "timeout", "ok", "ok", "ok"])
+    test([r.stdout for r in results], ["-42", "", "42", "21", "14"])
+
+    results = run_forked(instructions, [("0", "0")], max_steps=100, engine="vm")
+    test((results[0].status, results[0].exit_code), ("step-limit", None))
+
+    if hasattr(gc, "freeze"):  # Objects frozen by the caller stay frozen
+        gc.freeze()
+        try:
+            run_forked(instructions, [("1", "1")])
+            test(gc.get_freeze_count() > 0, True)
+        finally:
+            gc.unfreeze()
+
+
+@pytest.mark.timeout(2)
+def test_report(tmp_path, test):
+    (tmp_path / "inputs").mkdir()
+    write(tmp_path / "inputs" / "b.txt", "2")
+    write(tmp_path / "inputs" / "a.txt", "1")
+    inputs = read_inputs([str(tmp_path / "inputs")])
+    test([text for _, text in inputs], ["1", "2"])
+
+    results = [Result("a.pdc", "1", "ok", 0, "4", 0.5)]
+    fp = io.StringIO()
+    write_report(results, fp, "json")
+    test(json.loads(fp.getvalue())[0]["stdout"], "4")
+
+    fp = io.StringIO()
+    write_report(results, fp, "csv")
+    test(
+        fp.getvalue().splitlines(),
+        ["file,input,status,exit_code,stdout,time", "a.pdc,1,ok,0,4,0.5"],
+    )
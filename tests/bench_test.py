@@ -0,0 +1,79 @@
+"""This module contains tests for `pseudo.bench`"""
+
+import pytest
+
+from pseudo import compile
+from pseudo.bench import (
+    measure,
+    compare,
+    baseline_differences,
+    generated_source,
+    load_programs,
+)
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+@pytest.mark.timeout(10)
+def test_measure(test):
+    stats = measure("s := 0\ndla i:=1,...,10 wykonuj\n    s := s + i\npisz s", repeat=1)
+
+    test((stats["lines"], stats["ops"]), (4, 13))
+    for key in ["compile", "run", "run_ops_per_sec", "compile_peak_memory", "run_peak_memory"]:
+        if not stats[key] > 0:
+            raise AssertionError(key)
+
+
+@pytest.mark.timeout(5)
+def test_generated_source(test):
+    source = generated_source(200)
+
+    test(source.count("\n"), 200)
+    test(len(compile(source)) > 0, True)
+
+
+@pytest.mark.timeout(2)
+def test_load_programs(test, tmp_path):
+    (tmp_path / "a.pdc").write_text("pisz 1")
+    (tmp_path / "b.txt").write_text("")
+
+    test(load_programs([str(tmp_path)], generated_lines=0), [("a", "pisz 1")])
+    test([n for n, _ in load_programs([str(tmp_path)], 10)], ["a", "generated_10"])
+
+
+@pytest.mark.timeout(2)
+def test_compare(test):
+    def results(**times):
+        return {"benchmarks": {name: {"compile": c, "run": r} for name, (c, r) in times.items()}}
+
+    baseline = results(a=(1.0, 1.0), b=(1.0, 1.0))
+    new = results(a=(1.05, 2.0), b=(0.5, 1.0), c=(9.0, 9.0))
+
+    test(compare(new, baseline, threshold=0.1), [("a", "run", 1.0, 2.0)])
+    test(compare(new, baseline, threshold=1.5), [])
+    test(compare(new, baseline, threshold=0.1, min_delta=1.0), [])
+
+    fast = results(a=(0.001, 0.001))
+    test(compare(results(a=(0.001, 0.002)), fast, threshold=0.1), [])
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm"])
+@pytest.mark.timeout(10)
+def test_measure_engines(test, engine):
+    source = "s := 0\ndla i:=1,...,10 wykonuj\n    s := s + i\npisz s"
+    stats = measure(source, engine, repeat=1)
+
+    test(stats["ops"], 13)
+    test(stats["lower"] > 0, engine != "tree")
+
+
+@pytest.mark.timeout(2)
+def test_baseline_differences(test):
+    baseline = {"engine": "tree", "python": "3.8.0", "benchmarks": {}}
+
+    test(baseline_differences(dict(baseline), baseline), [])
+    test(
+        baseline_differences({"engine": "vm", "python": "3.8.0"}, baseline),
+        [("engine", "tree", "vm")],
+    )
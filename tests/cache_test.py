@@ -0,0 +1,85 @@
+"""This module contains tests for `pseudo.cache`"""
+
+import os
+
+import pytest
+
+from pseudo import compile
+from pseudo import cache as cache_module
+from pseudo.cache import CompileCache
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+@pytest.mark.timeout(2)
+def test_compile(tmp_path, test):
+    cache = CompileCache(str(tmp_path))
+    instructions = cache.compile("dla i:=1,...,3 wykonuj\n    pisz i")
+
+    test(len(os.listdir(str(tmp_path))), 1)
+    test(cache.compile("dla i:=1,...,3 wykonuj\n    pisz i"), instructions)
+    test(instructions, compile("dla i:=1,...,3 wykonuj\n    pisz i"))
+
+
+@pytest.mark.timeout(2)
+def test_key(test):
+    if CompileCache.key("pisz 1") == CompileCache.key("pisz 1", range_symbol=".."):
+        raise AssertionError
+    test(CompileCache.key("pisz 1"), CompileCache.key("pisz 1"))
+
+
+@pytest.mark.timeout(2)
+def test_format(monkeypatch):
+    key = CompileCache.key("pisz 1")
+    monkeypatch.setattr(cache_module, "CACHE_FORMAT", cache_module.CACHE_FORMAT + 1)
+    if CompileCache.key("pisz 1") == key:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_default_directory(monkeypatch, tmp_path, test):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    test(CompileCache().directory, os.path.join(str(tmp_path), "pseudo"))
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="owner of files is not known")
+@pytest.mark.timeout(2)
+def test_foreign_entry(monkeypatch, tmp_path, test):
+    cache = CompileCache(str(tmp_path))
+    cache.compile("pisz 1")
+    test(cache.get(cache.key("pisz 1")), compile("pisz 1"))
+
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(str(tmp_path)).st_uid + 1)
+    test(cache.get(cache.key("pisz 1")), None)
+
+
+@pytest.mark.timeout(2)
+def test_broken_entry(tmp_path, test):
+    cache = CompileCache(str(tmp_path))
+    with open(cache.path(cache.key("pisz 1")), "wb") as fp:
+        fp.write(b"broken")
+
+    test(cache.compile("pisz 1"), compile("pisz 1"))
+
+
+@pytest.mark.timeout(2)
+def test_evict(tmp_path, test):
+    cache = CompileCache(str(tmp_path))
+    cache.compile("pisz 1")
+    size = os.path.getsize(cache.path(cache.key("pisz 1")))
+    cache.max_size = 2 * size
+    os.utime(cache.path(cache.key("pisz 1")), (0, 0))
+
+    cache.compile("pisz 2")
+    cache.compile("pisz 3")
+
+    test(
+        sorted(os.listdir(str(tmp_path))),
+        sorted(
+            [
+                os.path.basename(cache.path(cache.key("pisz 2"))),
+                os.path.basename(cache.path(cache.key("pisz 3"))),
+            ]
+        ),
+    )
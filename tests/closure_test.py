@@ -0,0 +1,174 @@
+"""This module contains tests for `pseudo.closure`"""
+
+import pytest
+
+from pseudo import compile
+from pseudo.closure import Closure, compile_closure
+from pseudo.runtime import RunTime
+from pseudo.type.function import TailCall
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+script = """
+a := 1
+jeżeli a=1 to
+    T[a] := a
+    pisz a
+wpp
+    pisz 0
+
+dopóki a < 2 wykonuj
+    T[a] := a
+    a:=a+1
+pisz "2"
+
+dla i:=3,...,5 wykonuj
+    dla x:=3,...,5 wykonuj
+        T[x] <- x
+        pisz x
+
+funkcja f(b)
+    zwróć b*2
+
+pisz f(4)
+pisz 1-1
+pisz 7 div 2 + 7 mod 2
+"""
+
+
+@pytest.mark.timeout(2)
+def test_compile_closure(test):
+    instructions = compile_closure(compile("pisz 4"))
+
+    test(len(instructions), 1)
+    if not isinstance(instructions[0], Closure):
+        raise AssertionError
+    test(instructions[0].line, "pisz 4")
+
+
+@pytest.mark.timeout(2)
+def test_same_output(test, capsys):
+    RunTime().run(compile(script))
+    expected = capsys.readouterr().out
+
+    RunTime().run(compile_closure(compile(script)))
+    test(capsys.readouterr().out, expected)
+    test(expected, "12345345345804")
+
+
+@pytest.mark.timeout(2)
+def test_unsettable_iterator():
+    instructions = compile_closure(
+        compile(
+            """dla i:=1,...,5 wykonuj
+    i := i+1
+"""
+        )
+    )
+
+    try:
+        RunTime().run(instructions)
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_type_error():
+    try:
+        RunTime().run(compile_closure(compile('pisz 1 - "a"')))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_return(test, capsys):
+    instructions = compile(
+        """funkcja znajdz(x)
+    dla i:=1,...,10 wykonuj
+        j := 0
+        dopóki j < 10 wykonuj
+            jeżeli i * j = x to
+                zwróć i
+            j := j + 1
+    zwróć 0
+
+pisz znajdz(12)
+pisz znajdz(11)
+pisz znajdz(12)
+"""
+    )
+
+    RunTime().run(instructions)
+    test(capsys.readouterr().out, "202")
+
+    r = RunTime()
+    r.run(compile_closure(instructions))
+    test(capsys.readouterr().out, "202")
+    test(r.returning, False)
+
+    try:
+        RunTime().run(compile_closure(compile("zwróć 1\npisz 2")))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+tail_script = """funkcja suma(n, acc)
+    jeżeli n = 0 to
+        zwróć acc
+    zwróć suma(n - 1, acc + n)
+
+funkcja parzysta(n)
+    jeżeli n = 0 to
+        zwróć 1
+    zwróć nieparzysta(n - 1)
+
+funkcja nieparzysta(n)
+    jeżeli n = 0 to
+        zwróć 0
+    zwróć parzysta(n - 1)
+
+pisz suma(3000, 0)
+pisz parzysta(3001)
+"""
+
+
+@pytest.mark.timeout(5)
+def test_tail_call(test, capsys):
+    instructions = compile(tail_script)
+    if not isinstance(instructions[0].instructions[1].return_value, TailCall):
+        raise AssertionError
+
+    RunTime(max_depth=10).run(instructions)
+    test(capsys.readouterr().out, "45015000")
+
+    RunTime(max_depth=10).run(compile_closure(instructions))
+    test(capsys.readouterr().out, "45015000")
+
+
+@pytest.mark.timeout(2)
+def test_procedure_tail_call():
+    instructions = compile(
+        """funkcja a()
+    zwróć 1
+
+procedura b()
+    zwróć a()
+
+b()
+"""
+    )
+
+    try:
+        RunTime().run(compile_closure(instructions))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
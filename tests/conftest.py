@@ -1,3 +1,5 @@
+import os
+
 import pytest
 import pseudo
 from pseudo.runtime import RunTime
@@ -26,3 +28,9 @@ def test():
 
     return _test
 
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_home(tmp_path_factory):
+    """Compile cache of `pdc` started by tests is kept out of user's cache."""
+    os.environ["XDG_CACHE_HOME"] = str(tmp_path_factory.mktemp("cache"))
@@ -8,6 +8,7 @@ from pseudo.type.loop import Loop
 from pseudo.type import Int, Statement, Bool
 from pseudo.type.variable import Variable, Assignment
 from pseudo.stream import Stream, EOL, EndOfFile
+from pseudo.runtime import MemoryObject
 
 __author__ = "Patryk Niedźwiedziński"
 
@@ -237,3 +238,43 @@ def test_table_init(lexer):
     else:
         raise AssertionError
 
+
+@pytest.mark.timeout(2)
+def test_nested_if_block_end(test):
+    instructions = pseudo.compile(
+        """dla j:=1,...,3 wykonuj
+    jeżeli j > 1 to
+        pisz j
+pisz 4"""
+    )
+
+    test(instructions[-2], Statement("pisz", Int(4)))
+
+
+@pytest.mark.timeout(2)
+def test_read_call_args(lexer, runtime, test):
+    """Checks Lexer.read_call_args"""
+    lexer.i = Stream("f(n-1, (2+2)*2, 3)")
+    lexer.i.col = 2
+    runtime.var["n"] = MemoryObject("n", 5)
+    args = lexer.read_call_args()
+
+    test([a.eval(runtime) for a in args], [4, 8, 3])
+
+    lexer.i = Stream("f()")
+    lexer.i.col = 2
+    test(lexer.read_call_args(), [])
+
+
+@pytest.mark.timeout(2)
+def test_read_tokens(test):
+    """Checks inputs which are split by tokenizer."""
+    instructions = pseudo.compile("x := 'a' \npisz x # komentarz\npisz 1")
+
+    test(instructions[2], Statement("pisz", Variable("x")))
+    test(instructions[4], Statement("pisz", Int(1)))
+
+    with pytest.raises(SystemExit):
+        pseudo.compile("x := {1}")
+    with pytest.raises(SystemExit):
+        pseudo.compile("x := ")
@@ -0,0 +1,81 @@
+"""This module contains tests for `pseudo.memoize`"""
+
+import pytest
+from click.testing import CliRunner
+
+from pseudo import compile
+from pseudo.cli import pdc
+from pseudo.closure import compile_closure
+from pseudo.memoize import Memo, find_pure_functions
+from pseudo.runtime import RunTime
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+script = """x := 1
+
+funkcja fib(n)
+    jeżeli n < 2 to
+        zwróć n
+    zwróć fib(n - 1) + fib(n - 2)
+
+funkcja suma(n)
+    s := 0
+    dla i:=1,...,n wykonuj
+        s := s + fib(i)
+    zwróć s
+
+funkcja globalna(n)
+    zwróć n + x
+
+funkcja tablica(n)
+    T[1] := n
+    zwróć T[1]
+
+funkcja wypisz(n)
+    pisz n
+    zwróć n
+
+funkcja wola(n)
+    zwróć wypisz(n)
+
+pisz suma(60)
+"""
+
+
+@pytest.mark.timeout(2)
+def test_find_pure_functions(test):
+    test(find_pure_functions(compile(script)), {"fib", "suma"})
+    test(find_pure_functions(compile_closure(compile(script))), {"fib", "suma"})
+
+
+@pytest.mark.timeout(2)
+def test_memoize(test, capsys):
+    r = RunTime(memoize=True)
+    r.run(compile(script))
+
+    test(capsys.readouterr().out, "4052739537880")
+    test(r.memo.stats()["misses"], 62)
+
+
+@pytest.mark.timeout(2)
+def test_lru(test):
+    memo = Memo(size=2, pure={"fib"})
+    r = RunTime()
+    r.memo = memo
+    r.run(compile(script.replace("pisz suma(60)", "pisz fib(10)")))
+
+    test(len(memo.cache), 2)
+    test((memo.stats()["hits"], memo.stats()["misses"]), (13, 64))
+
+
+@pytest.mark.timeout(5)
+def test_vm_rejected(tmp_path, test):
+    path = tmp_path / "fib.pdc"
+    path.write_text(script, encoding="utf-8")
+    result = CliRunner().invoke(pdc, ["run", "--engine", "vm", "--memoize", str(path)])
+    test(result.exit_code, 2)
+    if "--memoize works only with tree and closure engines" not in result.output:
+        print(result.output)
+        raise AssertionError
@@ -0,0 +1,52 @@
+"""This module contains tests for `pseudo.optimizer`"""
+
+import pytest
+
+from pseudo import compile
+from pseudo.optimizer import optimize
+from pseudo.runtime import RunTime
+from pseudo.type import Int, String, Statement, EOL
+from pseudo.type.loop import Loop
+from pseudo.type.operation import Operation
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+@pytest.mark.timeout(2)
+def test_fold(test):
+    test(optimize(compile("pisz 2 * 3 + 1")), [Statement("pisz", Int(7)), EOL()])
+    test(optimize(compile('pisz "a" + "b"')), [Statement("pisz", String("ab")), EOL()])
+
+    instructions = optimize(compile("pisz 1 div 0"))
+    if not isinstance(instructions[0].args, Operation):
+        raise AssertionError
+
+    instructions = optimize(compile("pisz a + 2 * 3"))
+    test(instructions[0].args.right, Int(6))
+
+
+@pytest.mark.timeout(2)
+def test_dead_branches(test, capsys):
+    script = """a := 0
+jeżeli 1 = 2 to
+    pisz 1
+wpp
+    pisz 2
+jeżeli 2 > 1 to
+    pisz 3
+jeżeli fałsz to
+    pisz 4
+dopóki fałsz wykonuj
+    pisz 5
+dopóki a < 2 * 2 wykonuj
+    a := a + 10 div 5
+pisz a
+"""
+    instructions = optimize(compile(script))
+
+    test(len([i for i in instructions if not isinstance(i, EOL)]), 5)
+    test(len([i for i in instructions if isinstance(i, Loop)]), 1)
+
+    RunTime().run(instructions)
+    test(capsys.readouterr().out, "234")
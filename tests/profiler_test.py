@@ -0,0 +1,64 @@
+"""This module contains tests for `pseudo.profiler`"""
+
+import io
+import json
+
+import pytest
+
+from pseudo import compile
+from pseudo.profiler import ProfilingRunTime
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+script = """funkcja silnia(n)
+    jeżeli n < 2 to
+        zwróć 1
+    zwróć n * silnia(n - 1)
+
+dla i:=1,...,10 wykonuj
+    pisz silnia(5)
+"""
+
+duplicated_script = """a := 0
+dla i:=1,...,3 wykonuj
+    a := a + 1
+dla i:=1,...,5 wykonuj
+    a := a + 1
+"""
+
+
+@pytest.mark.timeout(2)
+def test_profile(test):
+    r = ProfilingRunTime(sink=io.StringIO())
+    r.run(compile(script))
+
+    rows = {row["lineno"]: row for row in r.profile.rows()}
+    test({n: row["count"] for n, row in rows.items()}, {1: 1, 2: 50, 3: 10, 4: 40, 6: 1, 7: 10})
+    for row in rows.values():
+        if not 0 <= row["self"] <= row["total"]:
+            raise AssertionError(row)
+    if not rows[6]["total"] >= rows[7]["total"] >= rows[4]["total"]:
+        raise AssertionError
+    if "7: pisz silnia(5)" not in r.profile.report():
+        raise AssertionError
+
+    fp = io.StringIO()
+    r.profile.write_json(fp)
+    test(len(json.loads(fp.getvalue())), 6)
+
+    fp = io.StringIO()
+    r.profile.write_callgrind(fp, "silnia.pdc")
+    lines = fp.getvalue().splitlines()
+    test(lines[-6].split()[0], "1")
+    test(lines[-1].split()[::2], ["7", "10"])
+
+
+@pytest.mark.timeout(2)
+def test_duplicated_lines(test):
+    r = ProfilingRunTime()
+    r.run(compile(duplicated_script))
+
+    rows = {row["lineno"]: row["count"] for row in r.profile.rows()}
+    test(rows, {1: 1, 2: 1, 3: 3, 4: 1, 5: 5})
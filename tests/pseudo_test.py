@@ -2,8 +2,11 @@ import os
 import codecs
 import subprocess
 import platform
+import sys
+import time
 
-from pseudo import compile, __version__
+from pseudo import compile, compile_iter, __version__
+from pseudo.__main__ import COMMANDS
 from pseudo.cli import pdc
 from pseudo.type import Int, Statement, EOL
 
@@ -14,6 +17,24 @@ def test_compile():
         raise AssertionError
 
 
+def test_compile_iter():
+    read = []
+
+    def lines():
+        for line in script.splitlines(keepends=True):
+            read.append(line)
+            yield line
+
+    instructions = compile_iter(lines())
+    if next(instructions) != EOL() or next(instructions).target.value != "a":
+        raise AssertionError
+    if len(read) > 3:  # Statement is yielded before the rest of file is read
+        print(read)
+        raise AssertionError
+    if [repr(i) for i in instructions] != [repr(i) for i in compile(script)[2:]]:
+        raise AssertionError
+
+
 script = """
 a := 1
 jeżeli a=1 to
@@ -61,3 +82,58 @@ def test_main():
         print(cmd)
         print(subprocess.run(cmd).returncode)
         raise AssertionError
+
+    cmd[1:] = ["pdc.py", "-"]
+    output = subprocess.run(
+        cmd, input=script, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    if output != "12345345345":
+        print(output)
+        raise AssertionError
+
+
+START_UP_BUDGET = 5  # `pdc FILE` may start at most 5x slower than bare python (now ~3.5x)
+SLOW_MODULES = ("click", "pseudo.cli", "pseudo.batch", "pseudo.vm", "traceback", "datetime")
+
+
+def test_commands():
+    if set(COMMANDS) != set(pdc.commands):
+        print(COMMANDS, list(pdc.commands))
+        raise AssertionError
+
+
+def _best_time(cmd: list, env: dict) -> float:
+    """Returns the shortest wall time of 5 runs, so busy machine does not fail the test."""
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_import_time(tmp_path):
+    path = tmp_path / "t1.pdc"
+    path.write_text("pisz 4\n", encoding="utf-8")
+    code = (
+        "import sys; from pseudo.__main__ import main; main([sys.argv[1]]); "
+        "print(*sorted(sys.modules), file=sys.stderr)"
+    )
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    cmd = [sys.executable, "-c", code, str(path)]
+    process = subprocess.run(
+        cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    )  # Compiled program is cached
+    if process.stdout != "4":
+        print(process.stdout, process.stderr)
+        raise AssertionError
+    slow = [name for name in SLOW_MODULES if name in process.stderr.split()]
+    if slow:
+        print(slow)
+        raise AssertionError
+
+    start_up = _best_time([sys.executable, "-c", "pass"], env)
+    run = _best_time(cmd, env)
+    if run > START_UP_BUDGET * start_up:
+        print(f"pdc took {run:.3f}s, python took {start_up:.3f}s")
+        raise AssertionError
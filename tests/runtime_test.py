@@ -1,11 +1,17 @@
 """This module contains tests for `pseudo.runtime`"""
 
+import gc
+import io
 import pytest
 
-from pseudo.runtime import MemoryObject
+from pseudo.runtime import MemoryObject, RunTime, GCPolicy, InputBuffer, parse_input
+from pseudo import compile
+from pseudo.exceptions import RunTimeError, LimitExceeded
+from pseudo.batch import execute
+from pseudo.closure import Closure
 from pseudo.type.numbers import Int
 from pseudo.type.variable import Variable
-from pseudo.type import Statement
+from pseudo.type import Statement, EOL
 
 
 def test_save(runtime, test):
@@ -13,7 +19,8 @@ def test_save(runtime, test):
     test(runtime.var["a"].getter(), 1)
 
     runtime.save("b[1][1]", Int(5))
-    test(runtime.var["b[1][1]"].getter(), 5)
+    test(runtime.var["b"].get_item((1, 1)), 5)
+    test(runtime.get("b[1][1]"), 5)
 
 
 def test_get(runtime, test):
@@ -26,6 +33,29 @@ def test_get(runtime, test):
     test(runtime.get("b[1]"), 3)
 
 
+def test_array(runtime, test):
+    runtime.store_item("T", (1,), 1)
+    runtime.store_item("T", (1, 2), 2)
+    runtime.store_item("T", (-1,), 3)
+    runtime.store_item("T", ("a",), 4)
+    runtime.store_item("T", (1000,), 5)
+
+    test(runtime.get_item("T", (1,)), 1)
+    test(runtime.get("T[1][2]"), 2)
+    test(runtime.get("T[-1]"), 3)
+    test(runtime.get("T[a]"), 4)
+    test(runtime.get_item("T", (1000,)), 5)
+    test(runtime.get_item("T", (2,)), "nil")
+    test(runtime.get("T"), "nil")
+    test(runtime.var["T"].items, ["nil", 1])
+
+    # Growing dense list takes elements from sparse dict
+    for i in range(2, 1001):
+        runtime.store_item("T", (i,), i)
+    test(runtime.var["T"].sparse, {-1: 3, "a": 4})
+    test(runtime.get_item("T", (1000,)), 1000)
+
+
 def test_stdout(runtime, test, capsys):
     runtime.run([Statement("pisz", Int(1))])
 
@@ -33,6 +63,83 @@ def test_stdout(runtime, test, capsys):
     test(captured.out, "1")
 
 
+def test_buffered_stdout(test, monkeypatch):
+    sink = io.StringIO()
+    r = RunTime(sink=sink, buffer_size=4)
+    r.running = True  # Run without flushing at the end
+
+    r.run(compile('pisz 12\npisz "\\n"'))
+    test(sink.getvalue(), "")
+    r.run(compile("pisz 3"))
+    test(sink.getvalue(), "12\n3")
+
+    monkeypatch.setattr("builtins.input", lambda _: sink.getvalue())
+    r.run(compile("pisz 4\nczytaj a"))
+    test(r.get("a"), "12\n34")
+
+    r.running = False
+    r.run(compile("pisz 5"))
+    test(sink.getvalue(), "12\n345")
+
+    try:
+        r.run(compile("pisz 6\nkoniec"))
+    except SystemExit:
+        pass
+    test(sink.getvalue(), "12\n3456")
+
+
+def test_parse_input(test):
+    test(
+        [parse_input(v) for v in ["12", "-3", "+4", " 5 ", "1.5", "-", "", "a1"]],
+        [12, -3, 4, 5, "1.5", "-", "", "a1"],
+    )
+
+
+def test_input_source(test, tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes("1\r\nżółw\n\n-2".encode("utf-8"))
+
+    for source in [path.read_text(encoding="utf-8"), path.read_bytes(), InputBuffer.open(path)]:
+        r = RunTime(input_source=source)
+        test([r.read("a") for _ in range(4)], [1, "żółw", "", -2])
+        try:
+            r.read("a")
+        except RunTimeError as err:
+            test(str(err), "No more input to read")
+        else:
+            raise AssertionError
+
+    path.write_bytes(b"")
+    r = RunTime(input_source=InputBuffer.open(path))
+    try:
+        r.run(compile("czytaj a"))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+@pytest.mark.timeout(5)
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm"])
+def test_limits(engine, test):
+    loop = compile("x := 0\ndopóki 1 wykonuj\n    x := x + 1\n")
+    calls = compile("funkcja f(n)\n    zwróć f(n + 1)\n\nf(0)\n")
+    counted = compile("dla i:=1,...,10 wykonuj\n    x := i\n")
+
+    errors = []
+    for instructions, max_steps, timeout in [(loop, 100, None), (calls, 100, None), (loop, None, 0.05)]:
+        try:
+            execute(instructions, engine, RunTime(max_steps=max_steps, timeout=timeout))
+        except LimitExceeded as err:
+            errors.append(err)
+    test([(e.limit, e.steps) for e in errors[:2]], [("steps", 100), ("steps", 100)])
+    test((errors[2].limit, errors[2].elapsed >= 0.05), ("time", True))
+
+    r = RunTime(max_steps=10)
+    execute(counted, engine, r)  # Iterations of loop use whole budget
+    test(r.steps, 10)
+
+
 def test_stdin(runtime, test, monkeypatch):
     monkeypatch.setattr("builtins.input", lambda _: "Oh, hi Mark")
 
@@ -54,3 +161,67 @@ def test_throw(runtime):
         pass
     else:
         raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_gc_policy(test):
+    threshold = gc.get_threshold()
+    policy = GCPolicy(threshold=(12345, 10, 10), freeze=True)
+    r = RunTime(gc_policy=policy)
+
+    def check(r, scope_id=None):
+        test(gc.get_threshold(), (12345, 10, 10))
+        test(policy.active, True)
+
+    r.run([Closure(check), EOL()])
+    test(gc.get_threshold(), threshold)
+    test(policy.active, False)
+
+
+@pytest.mark.skipif(not hasattr(gc, "freeze"), reason="gc.freeze requires python 3.7")
+@pytest.mark.timeout(2)
+def test_gc_policy_keeps_freeze(test):
+    gc.freeze()
+    try:
+        frozen = gc.get_freeze_count()
+        RunTime(gc_policy=GCPolicy(freeze=True)).run([EOL()])
+        test(gc.get_freeze_count() >= frozen > 0, True)
+    finally:
+        gc.unfreeze()
+
+
+@pytest.mark.timeout(2)
+def test_frames(runtime, test):
+    scope_id = runtime.push_frame(["a"], [1])
+    test(runtime.get("a", scope_id), 1)
+    test(runtime.push_frame(), scope_id + 1)
+
+    runtime.pop_frame()
+    runtime.pop_frame()
+    test(runtime.depth, 0)
+    test(runtime.frames[scope_id], {})
+
+
+@pytest.mark.timeout(5)
+def test_recursion(test, capsys):
+    script = """funkcja suma(n)
+    jeżeli n = 0 to
+        zwróć 0
+    zwróć n + suma(n-1)
+
+pisz suma(100)
+"""
+    r = RunTime()
+    r.run(compile(script))
+    test(capsys.readouterr().out, "5050")
+
+    r = RunTime(max_depth=50)
+    try:
+        r.run(compile(script))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+    if "Maximum recursion depth exceeded" not in capsys.readouterr().out:
+        raise AssertionError
+    test(r.depth, 0)
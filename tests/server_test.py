@@ -0,0 +1,59 @@
+"""This module contains tests for `pseudo.server` and `pseudo.client`"""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pseudo.client import Client
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "pdc.sock")
+    process = subprocess.Popen([sys.executable, "pdc.py", "serve", path])
+    for _ in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+    yield path
+    process.terminate()
+    process.wait(timeout=5)
+    if os.path.exists(path):
+        raise AssertionError("Socket was not removed")
+
+
+@pytest.mark.timeout(20)
+def test_serve(server, test):
+    with Client(server) as client:
+        results = [client.run("czytaj a\npisz a * 2\n", stdin=f"{i}\n") for i in range(3)]
+        test([(r["status"], r["stdout"]) for r in results], [("ok", "0"), ("ok", "2"), ("ok", "4")])
+
+        result = client.run("dopóki 1 wykonuj\n    a := 1\n", max_steps=100, engine="vm")
+        test((result["status"], result["exit_code"]), ("step-limit", None))
+
+        result = client.run("pisz 1\nkoniec\n", engine="closure")
+        test((result["status"], result["stdout"]), ("ok", "1"))
+
+        test(client.run("pisz )")["status"], "compile-error")
+        test(client.run("pisz 1", engine="fast")["status"], "bad-request")
+
+
+@pytest.mark.timeout(20)
+def test_concurrent_clients(server, test):
+    test(stat.S_IMODE(os.stat(server).st_mode), 0o600)
+    with Client(server) as idle, Client(server) as client:  # Idle client does not block
+        test(client.run("pisz 1")["stdout"], "1")
+        test(idle.run("pisz 2")["stdout"], "2")
@@ -1,5 +1,7 @@
 """This module contains unit tests for stream module."""
 
+import io
+
 import pytest
 import pseudo
 
@@ -81,3 +83,37 @@ def test_throw(stream):
         pass
     else:
         raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_shared_eol(stream):
+    """Checks that end of line does not allocate new objects"""
+    s = stream("1\n")
+    s.next()
+    if s.peek() is not s.next() or s.peek() is not pseudo.stream.END_OF_LINE:
+        raise AssertionError
+    s.line = 5
+    if s.peek() is not pseudo.stream.END_OF_LINE or not s.eol():
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_file_input(test):
+    """Checks that lines of file are read lazily the same way as string is split"""
+    for text in ["", "a", "a\n", "a\n\nb", "a\nb\n\n"]:
+        s = pseudo.stream.Stream(io.StringIO(text))
+        lines = []
+        while s.get_line(len(lines) + 1) is not None:
+            lines.append(s.get_line(len(lines) + 1))
+        test(lines, text.split("\n") + [""])
+
+
+@pytest.mark.timeout(2)
+def test_release(test):
+    """Checks Stream.release"""
+    s = pseudo.stream.Stream(io.StringIO("1\n2\n3"))
+    s.next_line()
+    s.next_line()
+    s.release()
+
+    test((s.lines, s.offset, s.get_line(1), s.peek()), (["3"], 2, None, "3"))
@@ -0,0 +1,79 @@
+"""This module contains tests for `pseudo.testing`"""
+
+import pytest
+
+from pseudo.testing import Program, PseudoError, check, integers, strings, arrays
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+source = """czytaj n
+
+funkcja maks(a, b)
+    jeżeli a > b to
+        zwróć a
+    zwróć b
+
+funkcja pierwszy(T)
+    zwróć T[1]
+
+procedura wypisz(x)
+    pisz x
+
+pisz maks(n, 1)
+"""
+
+
+@pytest.mark.timeout(2)
+def test_call(test):
+    program = Program(source)
+
+    test(program.call("maks", 3, 5), 5)
+    test(program.call("pierwszy", [7, 8]), 7)
+    test(program.call("pierwszy", []), None)
+    test(program.call("wypisz", "a"), None)
+    test(program.output, "a")
+    test(program.r.depth, 0)
+
+    program.reset()
+    test(program.output, "")
+
+
+@pytest.mark.timeout(2)
+def test_errors():
+    program = Program(source, engine="closure")
+
+    for args in [("nie_ma",), ("maks", 1), ("maks", 1, "a")]:
+        try:
+            program.call(*args)
+        except PseudoError:
+            pass
+        else:
+            raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_check(test):
+    program = Program(source)
+
+    test(check(program, "maks", max, integers(), integers(), cases=100, seed=1), 100)
+    test(
+        check(
+            program,
+            "pierwszy",
+            lambda T: T[0],
+            arrays(strings(), min_size=1),
+            cases=100,
+            seed=1,
+        ),
+        100,
+    )
+
+    try:
+        check(program, "maks", min, integers(), integers(), seed=1)
+    except AssertionError as err:
+        if "maks(" not in str(err):
+            raise AssertionError
+    else:
+        raise AssertionError
@@ -0,0 +1,38 @@
+"""This module contains unit tests for tokenizer module."""
+
+import pytest
+
+from pseudo.tokenizer import Token, tokenize_line
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+@pytest.mark.timeout(2)
+def test_tokenize_line(test):
+    tokens = tokenize_line("jeżeli T[1]<=3 to pisz 'a'  # b", 7)
+
+    test(
+        [(t.kind, t.text, t.col) for t in tokens],
+        [
+            ("name", "jeżeli", 0),
+            ("name", "T", 7),
+            ("punctuation", "[", 8),
+            ("number", "1", 9),
+            ("punctuation", "]", 10),
+            ("operator", "<=", 11),
+            ("number", "3", 13),
+            ("name", "to", 15),
+            ("name", "pisz", 18),
+            ("string", "'a'", 23),
+            ("comment", "# b", 28),
+        ],
+    )
+    test(tokens[0], Token("name", "jeżeli", 7, 0))
+
+
+@pytest.mark.timeout(2)
+def test_tokenize_line_rest(test):
+    test(tokenize_line("dla i:=1,...,n", 1, 5), tokenize_line("dla i:=1,...,n", 1)[2:])
+    test([t.text for t in tokenize_line("x<-a mod 2", 1)], ["x", "<-", "a", "mod", "2"])
+    test([t.kind for t in tokenize_line("{ \t", 1)], ["invalid"])
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from pseudo import compile
@@ -40,7 +42,7 @@ def test_read_function(lexer, test):
 
 
 @pytest.mark.timeout(2)
-def test_return(runtime, test, monkeypatch):
+def test_return(runtime, test):
     instructions = compile(
         """funkcja a(b)
     zwróć b
@@ -48,14 +50,9 @@ def test_return(runtime, test, monkeypatch):
 pisz a(2)"""
     )
 
-    T = []
-
-    def mock_print(x, *args, **kwargs):
-        T.append(x)
-
-    monkeypatch.setattr("builtins.print", mock_print)
+    runtime.sink = io.StringIO()
 
     runtime.run(instructions)
 
-    test(T, [2])
+    test(runtime.sink.getvalue(), "2")
 
@@ -1,5 +1,7 @@
 """This module contains test for `pseudo.type.loop`"""
 
+import io
+
 import pytest
 
 from pseudo import compile
@@ -10,7 +12,7 @@ from pseudo.type.numbers import Int
 from pseudo.type.bool import Bool
 from pseudo.type.variable import Assignment, Variable, Increment
 from pseudo.type.operation import Operation, Operator
-from pseudo.type.loop import Loop, read_for, read_while, Iterator
+from pseudo.type.loop import Loop, ForRange, read_for, read_while, Iterator
 
 pdc = """
 dla i:=1,...,5 wykonuj
@@ -34,31 +36,25 @@ def test_unsettable_iterator():
 
 
 @pytest.mark.timeout(2)
-def test_read_for(lexer, runtime, test, monkeypatch):
+def test_read_for(lexer, runtime, test):
     """Checks read_for"""
     lexer.i = Stream(
         """dla x:=1,...,5 wykonuj
     pisz x"""
     )
     lexer.i.col = 4
+    runtime.sink = io.StringIO()
 
-    T = []
-
-    def mock_print(x, *args, **kwargs):
-        T.append(x)
-
-    monkeypatch.setattr("builtins.print", mock_print)
-
-    runtime.run(read_for(lexer))
+    runtime.run([read_for(lexer)])
 
-    test(T, [1, 2, 3, 4, 5])
+    test(runtime.sink.getvalue(), "12345")
 
     # Test lack of indentation block
     lexer.i = Stream("dla 1 := 1,...,5 wykonuj")
     lexer.i.col = 4
 
     try:
-        runtime.run(read_for(lexer))
+        runtime.run([read_for(lexer)])
     except SystemExit:
         pass
     else:
@@ -73,7 +69,7 @@ def test_read_for(lexer, runtime, test, monkeypatch):
     lexer.i.col = 4
 
     try:
-        runtime.run(read_for(lexer))
+        runtime.run([read_for(lexer)])
     except SystemExit:
         pass
     else:
@@ -110,3 +106,67 @@ def test_read_while(lexer, test):
             line="dopóki prawda wykonuj",
         ),
     )
+
+
+for_range_pdc = """n := 3
+s := 0
+dla i:=1,...,n wykonuj
+    n := n + 1
+    pisz i
+dla j:=1,...,n wykonuj
+    s := s + 2
+pisz s
+pisz j
+"""
+
+
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm"])
+def test_for_range(engine, capsys, test):
+    from pseudo.batch import execute
+
+    execute(compile(for_range_pdc), engine)
+    test(capsys.readouterr().out, "12312nil")
+
+
+@pytest.mark.timeout(2)
+def test_for_range_observed(test):
+    loops = [
+        i for i in compile(for_range_pdc + "dla k:=1,...,2 wykonuj\n    f(1)\n")
+        if isinstance(i, ForRange)
+    ]
+
+    test([l.observed for l in loops], [True, False, True])
+
+
+assigned_iterator_pdc = """i := 100
+dla i:=1,...,3 wykonuj
+    pisz i
+pisz i
+i := 100
+funkcja f()
+    dla i:=1,...,2 wykonuj
+        pisz i
+    zwróć 0
+pisz f()
+pisz i
+"""
+
+
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm"])
+def test_for_range_assigned(engine, test):
+    # Loop binds new iterator also when variable with the same name already exists
+    from pseudo.batch import execute
+
+    r = RunTime(sink=io.StringIO())
+    execute(compile(assigned_iterator_pdc), engine, r)
+    r.flush()
+    test(r.sink.getvalue(), "123nil120nil")
+
+    try:
+        execute(compile("i := 100\n" + pdc), engine, RunTime(sink=io.StringIO()))
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
@@ -0,0 +1,221 @@
+"""This module contains tests for `pseudo.vm`"""
+
+import io
+
+import pytest
+
+from pseudo import compile
+from pseudo.batch import execute
+from pseudo.runtime import RunTime
+from pseudo.vm import Code, compile_bytecode, VirtualMachine
+from pseudo.vm.opcodes import LOAD_CONST, PRINT, HALT, JUMP_IF_FALSE, JUMP
+from pseudo.vm.resolver import resolve_globals, resolve_locals
+
+from tests.closure_test import script, tail_script
+
+
+__author__ = "Patryk Niedźwiedziński"
+
+
+@pytest.mark.timeout(2)
+def test_compile_bytecode(test):
+    code = compile_bytecode(compile("pisz 4"))
+
+    test(code.instructions, [(LOAD_CONST, 4), (PRINT, None), (HALT, None)])
+
+
+@pytest.mark.timeout(2)
+def test_jumps(test):
+    code = compile_bytecode(
+        compile(
+            """dopóki fałsz wykonuj
+    pisz 1
+"""
+        )
+    )
+
+    test(code.instructions[1], (JUMP_IF_FALSE, 5))
+    test(code.instructions[4], (JUMP, 0))
+
+
+@pytest.mark.timeout(2)
+def test_same_output(test, capsys):
+    RunTime().run(compile(script))
+    expected = capsys.readouterr().out
+
+    VirtualMachine().run(compile_bytecode(compile(script)))
+    test(capsys.readouterr().out, expected)
+
+
+@pytest.mark.timeout(2)
+def test_memory(test):
+    r = RunTime()
+    VirtualMachine(r).run(
+        compile_bytecode(
+            compile(
+                """a := 2
+T[a] := a * 3
+"""
+            )
+        )
+    )
+
+    test(r.get("a"), 2)
+    test(r.get("T[2]"), 6)
+
+
+@pytest.mark.timeout(2)
+def test_procedure_return():
+    code = compile_bytecode(
+        compile(
+            """procedura a()
+    zwróć 1
+
+a()
+"""
+        )
+    )
+
+    try:
+        VirtualMachine().run(code)
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_unsettable_iterator():
+    code = compile_bytecode(
+        compile(
+            """dla i:=1,...,5 wykonuj
+    i := i+1
+"""
+        )
+    )
+
+    try:
+        VirtualMachine().run(code)
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_assigned_iterator(test):
+    # Iterator replaces variable with the same name, also global one used in function
+    instructions = compile(
+        """i := 100
+dla i:=1,...,3 wykonuj
+    pisz i
+i := 100
+funkcja f()
+    dla i:=1,...,2 wykonuj
+        pisz i
+f()
+"""
+    )
+
+    for resolve in (False, True):
+        r = RunTime(sink=io.StringIO())
+        VirtualMachine(r).run(compile_bytecode(instructions, resolve))
+        r.flush()
+        test(r.sink.getvalue(), "12312")
+
+
+@pytest.mark.timeout(2)
+def test_resolve(test):
+    instructions = compile(
+        """x := 1
+procedura inc(d)
+    y := d
+    x := x + y
+
+inc(2)
+"""
+    )
+
+    globals = resolve_globals(instructions)
+    test(globals.names, ["x", "inc"])
+    locals = resolve_locals(instructions[2], globals)
+    test(locals.names, ["d", "y", "x"])
+    test(locals.dynamic, {"x"})
+
+
+shadowing_script = """funkcja f()
+    dla i:=1,...,3 wykonuj
+        jeżeli i = 2 to
+            zwróć i
+x := 0
+T[1] := 5
+funkcja g(a)
+    x := x + a
+    T[1] := T[1] + a
+    zwróć x
+pisz f()
+pisz f()
+dla i:=1,...,2 wykonuj
+    pisz i
+pisz g(2)
+pisz g(3)
+pisz x
+pisz T[1]
+"""
+
+
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("engine", ["tree", "closure", "vm"])
+def test_dynamic_scope(test, engine):
+    # Iterator of function is local while global one does not exist yet, but assignment
+    # changes global variable which already exists
+    r = RunTime(sink=io.StringIO())
+    execute(compile(shadowing_script), engine, r)
+    test(r.sink.getvalue(), "221225510")
+
+
+@pytest.mark.timeout(2)
+def test_slots(test, capsys):
+    r = RunTime()
+    vm = VirtualMachine(r)
+    vm.run(compile_bytecode(compile(script), resolve=True))
+
+    test(capsys.readouterr().out, "12345345345804")
+    test(vm.get("a"), 2)
+    test(vm.get("T[4]"), 4)
+    test(vm.get("i"), "nil")
+    if "a" in r.var:
+        raise AssertionError
+
+
+@pytest.mark.timeout(2)
+def test_local_array(test, capsys):
+    vm = VirtualMachine()
+    vm.run(
+        compile_bytecode(
+            compile(
+                """procedura a()
+    L[1] := 2
+    L[2][1] := L[1] + T[1]
+    pisz L[2][1]
+
+T[1] := 1
+a()
+"""
+            ),
+            resolve=True,
+        )
+    )
+
+    test(capsys.readouterr().out, "3")
+    test(vm.get("T[1]"), 1)
+    test(vm.get("L[1]"), "nil")
+
+
+@pytest.mark.timeout(5)
+def test_tail_call(test, capsys):
+    instructions = compile(tail_script)
+
+    for resolve in (False, True):
+        VirtualMachine(RunTime(max_depth=10)).run(compile_bytecode(instructions, resolve))
+        test(capsys.readouterr().out, "45015000")